@@ -0,0 +1,123 @@
+# coding=utf-8
+
+import os
+import re
+import sys
+import json
+import gzip
+import hashlib
+
+# Source assets for the web application
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web')
+
+# Build output, served from /static/dist/
+DIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'dist')
+
+# Assets that get a content-hashed filename (referenced from the HTML shell)
+FINGERPRINTED_ASSETS = ['app.css', 'app.js']
+
+# The HTML shell keeps a stable name so it can be revalidated
+HTML_SHELL = 'index.html'
+
+# The service worker must keep a stable URL, so it is versioned by content instead
+SERVICE_WORKER = 'sw.js'
+
+# Icons and manifest precached by the service worker alongside the app shell
+PRECACHED_STATIC_FILES = [
+    'favicon.svg',
+    'favicon-32x32.png',
+    'apple-180x180-touch-icon.png',
+    'android-chrome-192x192.png',
+    'android-chrome-512x512.png',
+    'site.webmanifest',
+]
+
+MANIFEST_FILENAME = 'manifest.json'
+HASH_LENGTH = 10
+
+# Fingerprinted files look like app.0123456789.css
+FINGERPRINT_PATTERN = re.compile(r'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[a-z0-9]+)(\.gz)?$' % HASH_LENGTH)
+
+def content_hash(data):
+    """Return a short hex digest identifying the content"""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+def fingerprinted_name(filename, digest):
+    """Insert the content hash before the file extension (app.css -> app.<hash>.css)"""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{digest}{ext}"
+
+def write_atomic(path, data):
+    """Write bytes to path via a temporary file so concurrent readers never see partial output"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def write_with_gzip(path, data):
+    """Write a file and its precompressed .gz sidecar"""
+    write_atomic(path, data)
+    # mtime=0 keeps the compressed output byte-identical across builds
+    write_atomic(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+
+def remove_stale_assets(keep):
+    """Delete fingerprinted files from previous builds"""
+    for filename in os.listdir(DIST_DIR):
+        if FINGERPRINT_PATTERN.match(filename) and filename not in keep:
+            try:
+                os.remove(os.path.join(DIST_DIR, filename))
+            except FileNotFoundError:
+                # Another worker may have cleaned it up already
+                pass
+
+def build(verbose=False):
+    """
+    Build the web application assets into static/dist.
+    Returns the manifest dict mapping logical asset names to built filenames.
+    """
+    os.makedirs(DIST_DIR, exist_ok=True)
+
+    manifest = {}
+    keep = set()
+    for filename in FINGERPRINTED_ASSETS:
+        with open(os.path.join(SOURCE_DIR, filename), 'rb') as f:
+            data = f.read()
+        built_name = fingerprinted_name(filename, content_hash(data))
+        built_path = os.path.join(DIST_DIR, built_name)
+        if not os.path.exists(built_path) or not os.path.exists(built_path + '.gz'):
+            write_with_gzip(built_path, data)
+        manifest[filename] = built_name
+        keep.update((built_name, built_name + '.gz'))
+        if verbose:
+            print(f"{filename} -> dist/{built_name} ({len(data)} bytes)")
+
+    # Point the HTML shell at the fingerprinted assets
+    with open(os.path.join(SOURCE_DIR, HTML_SHELL), 'r', encoding='utf-8') as f:
+        html = f.read()
+    for filename, built_name in manifest.items():
+        html = html.replace('{{' + filename + '}}', f"/static/dist/{built_name}")
+    html_data = html.encode('utf-8')
+    write_with_gzip(os.path.join(DIST_DIR, HTML_SHELL), html_data)
+    manifest[HTML_SHELL] = HTML_SHELL
+    if verbose:
+        print(f"{HTML_SHELL} -> dist/{HTML_SHELL}")
+
+    # Service worker precaching the shell, fingerprinted assets and icons
+    precache = ['/'] + [f"/static/dist/{manifest[filename]}" for filename in FINGERPRINTED_ASSETS]
+    precache += [f"/static/{filename}" for filename in PRECACHED_STATIC_FILES]
+    version = content_hash(html_data + json.dumps(precache).encode('utf-8'))
+    with open(os.path.join(SOURCE_DIR, SERVICE_WORKER), 'r', encoding='utf-8') as f:
+        service_worker = f.read()
+    service_worker = service_worker.replace('{{version}}', version)
+    service_worker = service_worker.replace('{{precache}}', json.dumps(precache, indent=4))
+    write_with_gzip(os.path.join(DIST_DIR, SERVICE_WORKER), service_worker.encode('utf-8'))
+    manifest[SERVICE_WORKER] = SERVICE_WORKER
+    if verbose:
+        print(f"{SERVICE_WORKER} -> dist/{SERVICE_WORKER} (version {version}, {len(precache)} precached URLs)")
+
+    write_atomic(os.path.join(DIST_DIR, MANIFEST_FILENAME), json.dumps(manifest, indent=2).encode('utf-8'))
+    remove_stale_assets(keep)
+    return manifest
+
+if __name__ == "__main__":
+    build(verbose='-q' not in sys.argv[1:])
@@ -0,0 +1,188 @@
+# coding=utf-8
+
+import io
+import os
+import sys
+import json
+
+try:
+    from PIL import Image
+except ImportError:  # Optional dependency; without it the original images are served
+    Image = None
+
+import build_assets
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+# Optimized variants are written here and served for the original /static/ URLs
+IMAGE_DIST_DIR = os.path.join(build_assets.DIST_DIR, 'img')
+IMAGE_MANIFEST_FILENAME = 'images.json'
+
+# Smaller copies of large images, by width (e.g. /static/og-image.png?w=600)
+DERIVATIVE_WIDTHS = {
+    'og-image.png': [600, 300],
+}
+
+# WebP variants are lossless unless lossy encoding at this quality is under half the size
+WEBP_QUALITY = 90
+LOSSY_WEBP_MAX_RATIO = 0.5
+
+def encode_png(image):
+    """Losslessly recompress an image as PNG (metadata such as EXIF is dropped)"""
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+def encode_webp(image):
+    """Encode an image as WebP, preferring lossless unless lossy is much smaller"""
+    lossless = io.BytesIO()
+    image.save(lossless, 'WEBP', lossless=True, quality=100, method=6)
+    lossy = io.BytesIO()
+    image.save(lossy, 'WEBP', quality=WEBP_QUALITY, method=6)
+    if len(lossy.getvalue()) < len(lossless.getvalue()) * LOSSY_WEBP_MAX_RATIO:
+        return lossy.getvalue()
+    return lossless.getvalue()
+
+def declared_size(filename):
+    """The WxH size in an icon's filename (e.g. favicon-32x32.png), or None"""
+    for part in os.path.splitext(filename)[0].replace('_', '-').split('-'):
+        width, _, height = part.partition('x')
+        if width.isdigit() and height.isdigit():
+            return int(width), int(height)
+    return None
+
+def write_variant(filename, suffix, ext, data, keep):
+    """Write a fingerprinted variant into the image dist directory; returns its path under /static/"""
+    stem = os.path.splitext(filename)[0] + suffix
+    built_name = build_assets.fingerprinted_name(stem + ext, build_assets.content_hash(data))
+    built_path = os.path.join(IMAGE_DIST_DIR, built_name)
+    if not os.path.exists(built_path):
+        build_assets.write_atomic(built_path, data)
+    keep.add(built_name)
+    return f"dist/img/{built_name}"
+
+def build_image(filename, source_data, keep):
+    """Build the optimized variants of one PNG; returns its manifest entry"""
+    image = Image.open(io.BytesIO(source_data))
+    image.load()
+    entry = {
+        "hash": build_assets.content_hash(source_data),
+        "type": "image/png",
+        "width": image.width,
+        "height": image.height,
+        "bytes": len(source_data),
+        "variants": [],
+        "warnings": []
+    }
+    declared = declared_size(filename)
+    if declared and declared != image.size:
+        entry["warnings"].append(f"named {declared[0]}x{declared[1]} but is {image.width}x{image.height}")
+
+    widths = [image.width] + [width for width in DERIVATIVE_WIDTHS.get(filename, []) if width < image.width]
+    for width in widths:
+        if width == image.width:
+            resized, suffix = image, ''
+        else:
+            height = round(image.height * width / image.width)
+            resized, suffix = image.resize((width, height), Image.LANCZOS), f".w{width}"
+
+        png = encode_png(resized)
+        # Full-size PNGs are only worth serving if recompression actually helped
+        if width != image.width or len(png) < len(source_data):
+            entry["variants"].append({
+                "file": write_variant(filename, suffix, '.png', png, keep),
+                "type": "image/png",
+                "width": resized.width,
+                "bytes": len(png)
+            })
+        webp = encode_webp(resized)
+        entry["variants"].append({
+            "file": write_variant(filename, suffix, '.webp', webp, keep),
+            "type": "image/webp",
+            "width": resized.width,
+            "bytes": len(webp)
+        })
+    return entry
+
+def load_manifest():
+    """Load the image manifest from the last build, or {} if there isn't one"""
+    try:
+        with open(os.path.join(IMAGE_DIST_DIR, IMAGE_MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def build(verbose=False):
+    """
+    Build optimized variants of every PNG in static/ into static/dist/img.
+    Images whose content hasn't changed since the last build are reused.
+    Returns the manifest mapping original filenames to their variants ({} without Pillow).
+    """
+    if Image is None:
+        return {}
+    os.makedirs(IMAGE_DIST_DIR, exist_ok=True)
+
+    previous = load_manifest()
+    manifest = {}
+    keep = {IMAGE_MANIFEST_FILENAME}
+    for filename in sorted(os.listdir(STATIC_DIR)):
+        if not filename.endswith('.png'):
+            continue
+        with open(os.path.join(STATIC_DIR, filename), 'rb') as f:
+            source_data = f.read()
+
+        entry = previous.get(filename)
+        reusable = entry and entry["hash"] == build_assets.content_hash(source_data) and all(
+            os.path.exists(os.path.join(STATIC_DIR, variant["file"])) for variant in entry["variants"]
+        )
+        if reusable:
+            keep.update(os.path.basename(variant["file"]) for variant in entry["variants"])
+        else:
+            entry = build_image(filename, source_data, keep)
+        manifest[filename] = entry
+        if verbose:
+            print(format_entry(filename, entry))
+
+    build_assets.write_atomic(
+        os.path.join(IMAGE_DIST_DIR, IMAGE_MANIFEST_FILENAME),
+        json.dumps(manifest, indent=2).encode('utf-8')
+    )
+    for filename in os.listdir(IMAGE_DIST_DIR):
+        if filename not in keep and not filename.endswith('.tmp'):
+            os.remove(os.path.join(IMAGE_DIST_DIR, filename))
+    return manifest
+
+def best_variant_bytes(entry, image_type, width):
+    """Smallest size the image is served at for a type and width (falling back to the original)"""
+    sizes = [variant["bytes"] for variant in entry["variants"] if variant["type"] == image_type and variant["width"] == width]
+    if width == entry["width"] and image_type == entry["type"]:
+        sizes.append(entry["bytes"])
+    return min(sizes) if sizes else None
+
+def format_entry(filename, entry):
+    """One report line: original size and the bytes saved by the PNG and WebP variants"""
+    original = entry["bytes"]
+    png = best_variant_bytes(entry, "image/png", entry["width"])
+    webp = best_variant_bytes(entry, "image/webp", entry["width"])
+    line = (f"{filename}: {original} bytes -> png {png} (saved {original - png}), "
+            f"webp {webp} (saved {original - webp}, {100 * (original - webp) / original:.0f}%)")
+    for variant in entry["variants"]:
+        if variant["width"] != entry["width"]:
+            line += f"\n    {variant['width']}w {variant['type']}: {variant['bytes']} bytes"
+    for warning in entry["warnings"]:
+        line += f"\n    warning: {warning}"
+    return line
+
+def format_report(manifest):
+    """Summarize the bytes saved across all images, for PNG-only and WebP-capable clients"""
+    original = sum(entry["bytes"] for entry in manifest.values())
+    png = sum(best_variant_bytes(entry, "image/png", entry["width"]) for entry in manifest.values())
+    webp = sum(best_variant_bytes(entry, "image/webp", entry["width"]) for entry in manifest.values())
+    return (f"{len(manifest)} images, {original} bytes: "
+            f"png {png} (saved {original - png}), webp {webp} (saved {original - webp})")
+
+if __name__ == "__main__":
+    if Image is None:
+        sys.exit("Pillow is required to build image variants")
+    manifest = build(verbose='-q' not in sys.argv[1:])
+    print(format_report(manifest))
@@ -0,0 +1,136 @@
+# coding=utf-8
+
+# Deploy-time cache warm-up. A new worker precomputes the results of the most popular words
+# (from recorded access logs or a word list) into its result caches before it reports ready,
+# so the first requests after a deploy don't all miss. The work runs on a bounded thread pool,
+# most popular words first, and stops taking new words when its time budget runs out.
+
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import result_store
+
+# Sources of words to warm (both optional; access log words come first)
+WARMUP_ACCESS_LOG = os.environ.get('ELEMENT_WORDS_WARMUP_ACCESS_LOG', '')
+WARMUP_WORD_LIST = os.environ.get('ELEMENT_WORDS_WARMUP_WORDS', '')
+
+# At most this many (word, option) entries, warmed by this many threads within the time budget
+WARMUP_TOP = int(os.environ.get('ELEMENT_WORDS_WARMUP_TOP', 500))
+WARMUP_WORKERS = int(os.environ.get('ELEMENT_WORDS_WARMUP_WORKERS', 4))
+WARMUP_BUDGET_SECONDS = float(os.environ.get('ELEMENT_WORDS_WARMUP_BUDGET_SECONDS', 30))
+
+class Warmup:
+    """Progress of a warm-up run, safe to read while it runs"""
+
+    def __init__(self, total):
+        self.total = total
+        self.warmed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self.finished = None
+        self.out_of_time = False
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self.finished is None
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def record(self, outcome):
+        """Count one entry as warmed (True), skipped (False) or failed (None)"""
+        with self._lock:
+            if outcome is None:
+                self.failed += 1
+            elif outcome:
+                self.warmed += 1
+            else:
+                self.skipped += 1
+
+    def summary(self):
+        done = self.warmed + self.skipped + self.failed
+        text = f"Warmed {self.warmed} of {self.total} entries in {self.elapsed:.2f}s"
+        if self.skipped or self.failed:
+            text += f" ({self.skipped} skipped, {self.failed} failed)"
+        if self.out_of_time:
+            text += f"; time budget ran out with {self.total - done} left"
+        return text
+
+    def as_dict(self):
+        return {
+            "status": "running" if self.running else "done",
+            "total": self.total,
+            "warmed": self.warmed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "out_of_time": self.out_of_time,
+            "duration_ms": round(self.elapsed * 1000, 2)
+        }
+
+def load_warmup_words(access_log=None, word_list=None, top=WARMUP_TOP):
+    """
+    The (word, reverse_symbols) entries to warm, most important first: the most requested in
+    the access log, then the word list in its order, without duplicates and at most top
+    """
+    pairs = []
+    if access_log:
+        pairs.extend(result_store.read_access_log(access_log, top))
+    if word_list:
+        pairs.extend(result_store.read_word_list(word_list))
+    pairs = list(dict.fromkeys(pairs))
+    return pairs[:top] if top else pairs
+
+def warm_up(pairs, warm, workers=WARMUP_WORKERS, budget=WARMUP_BUDGET_SECONDS, progress=None):
+    """
+    Call warm(word, reverse_symbols) for each entry, in order, on at most workers threads.
+    warm returns whether the entry was warmed (False if it isn't cacheable). No entry is started
+    once budget seconds (None for no limit) have passed. Returns the Warmup progress.
+    """
+    progress = progress or Warmup(len(pairs))
+    deadline = None if budget is None else progress.started + budget
+
+    def task(word, reverse_symbols):
+        try:
+            return bool(warm(word, reverse_symbols))
+        except Exception:
+            return None
+
+    # Only workers entries are in flight at a time, so none are left queued at the deadline;
+    # entries already started when it passes are allowed to finish
+    workers = max(1, workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        entries = iter(pairs)
+        running = set()
+        while True:
+            out_of_time = deadline is not None and time.perf_counter() >= deadline
+            while not out_of_time and len(running) < workers:
+                entry = next(entries, None)
+                if entry is None:
+                    break
+                running.add(executor.submit(task, *entry))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                progress.record(future.result())
+
+    progress.out_of_time = progress.warmed + progress.skipped + progress.failed < progress.total
+    progress.finished = time.perf_counter()
+    return progress
+
+def start_warm_up(pairs, warm, workers=WARMUP_WORKERS, budget=WARMUP_BUDGET_SECONDS):
+    """Warm up in a background thread, reporting to stderr when done; returns the Warmup progress"""
+    progress = Warmup(len(pairs))
+
+    def run():
+        warm_up(pairs, warm, workers, budget, progress)
+        print(progress.summary(), file=sys.stderr)
+
+    threading.Thread(target=run, name='cache-warmup', daemon=True).start()
+    return progress
@@ -0,0 +1,426 @@
+# coding=utf-8
+
+# Python client for the Element Words API (see openapi.yaml), using only the standard library.
+# Connections are kept alive and pooled, the element table is fetched once, and full word results
+# are cached locally and revalidated with their ETag. Many word lookups are deduplicated and run
+# concurrently over the pool, and summaries (count and best spelling) of many words are fetched
+# in a few large requests. AsyncElementWordsClient offers the same calls to asyncio code.
+
+import json
+import gzip
+import time
+import asyncio
+import threading
+import http.client
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, quote, urlencode
+
+DEFAULT_BASE_URL = 'https://elements.chriswilson.app'
+DEFAULT_TIMEOUT = 10
+USER_AGENT = 'element-words-client/1'
+
+# Connections kept open per client, which is also how many word lookups run at once
+MAX_CONNECTIONS = 8
+
+# Full word results kept for revalidation, and how long the element table is reused
+WORD_CACHE_SIZE = 1024
+ELEMENTS_TTL = 24 * 60 * 60
+
+# Words per summary request are limited by body size
+SUMMARY_BATCH_BYTES = 256 * 1024
+
+# Query flags the API only reads when true
+FLAG_PARAMETERS = ('allow_reversed_symbols', 'only_spellable')
+
+# The API operation (operationId in openapi.yaml) behind each method. The methods are written
+# by hand to add pooling, batching and caching; tests check their query parameters against the spec.
+OPERATIONS = {
+    'elements': 'getAllElements',
+    'word': 'getWordCombinations',
+    'stats': 'getWordStats',
+    'live': 'getLiveWord',
+    'summarize': 'spellText',
+    'filter_words': 'filterWords'
+}
+
+class ElementWordsError(Exception):
+    """An error response from the API, with its status, error code and message"""
+
+    def __init__(self, status, code, message, details=None, retry_after=None):
+        super().__init__(f"{status} {code}: {message}")
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+        # Seconds to wait before retrying, for RATE_LIMITED and other 503/429 responses
+        self.retry_after = retry_after
+
+def clean_word(word):
+    """Normalize a word like the API does: its letters, in lowercase"""
+    return ''.join(c for c in word if c.isalpha()).lower()
+
+def word_path(word, suffix=''):
+    """Path of a word resource; words without letters are sent as they are, for the API to reject"""
+    path = '/api/v1/words/' + quote(clean_word(word) or word, safe='')
+    return path + '/' + suffix if suffix else path
+
+def build_path(path, parameters):
+    """
+    A path with its query string in the API's canonical form (parameters sorted by name, flags
+    only when true), so requests are never redirected and share cache entries.
+    None and False values are left out, and lists are sent comma-separated.
+    """
+    query = []
+    for name, value in sorted(parameters.items()):
+        if value is None or value is False:
+            continue
+        if value is True:
+            value = 'true'
+        elif isinstance(value, (list, tuple)):
+            value = ','.join(value)
+        elif name in FLAG_PARAMETERS and str(value).lower() != 'true':
+            continue
+        query.append((name, str(value)))
+    query_string = urlencode(query, safe=',', quote_via=quote)
+    return path + '?' + query_string if query_string else path
+
+def batch_lines(lines, max_bytes):
+    """Join lines into newline-separated bodies of at most max_bytes (or one line, if longer)"""
+    batch = []
+    size = 0
+    for line in lines:
+        encoded = line.encode('utf-8')
+        if batch and size + len(encoded) + 1 > max_bytes:
+            yield b'\n'.join(batch)
+            batch = []
+            size = 0
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        yield b'\n'.join(batch)
+
+class ConnectionPool:
+    """
+    Keep-alive connections to one server, shared by every thread of a client. Connections are
+    opened as needed and at most max_idle are kept open between requests.
+    """
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT, max_idle=MAX_CONNECTIONS):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme!r}")
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.opened = 0
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        """An idle connection (reused=True) or a new one"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+            self.opened += 1
+        return self.connection_class(self.host, self.port, timeout=self.timeout), False
+
+    def _release(self, connection):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def request(self, method, path, body=None, headers=None):
+        """
+        Send a request and read its response; returns (status, headers, body bytes).
+        A request on a kept-alive connection the server has closed meanwhile is sent again.
+        """
+        while True:
+            connection, reused = self._acquire()
+            try:
+                connection.request(method, self.base_path + path, body, headers or {})
+                response = connection.getresponse()
+                data = response.read()
+            except (ConnectionError, http.client.BadStatusLine):
+                connection.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            return response.status, response.headers, data
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+class ElementWordsClient:
+    """
+    Blocking client for the Element Words API, safe to share between threads.
+    Calls return the response's data, and raise ElementWordsError for error responses.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, api_key=None, timeout=DEFAULT_TIMEOUT,
+                 max_connections=MAX_CONNECTIONS, word_cache_size=WORD_CACHE_SIZE, elements_ttl=ELEMENTS_TTL):
+        self.max_connections = max_connections
+        self.word_cache_size = word_cache_size
+        self.elements_ttl = elements_ttl
+        self._pool = ConnectionPool(base_url, timeout, max_connections)
+        self._headers = {
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip',
+            'User-Agent': USER_AGENT
+        }
+        if api_key:
+            self._headers['X-API-Key'] = api_key
+        # Canonical path -> (ETag, data) of full word results, least recently used first
+        self._word_cache = OrderedDict()
+        self._word_cache_lock = threading.Lock()
+        self._elements = None
+        self._elements_expire = 0
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _request(self, method, path, body=None, headers=None):
+        """Send a request (following a redirect to a canonical URL); returns (status, headers, body)"""
+        request_headers = dict(self._headers, **(headers or {}))
+        status, response_headers, data = self._pool.request(method, path, body, request_headers)
+        if status in (301, 302, 307, 308) and response_headers.get('Location'):
+            location = urlsplit(response_headers['Location'])
+            path = location.path + ('?' + location.query if location.query else '')
+            if self._pool.base_path and path.startswith(self._pool.base_path + '/'):
+                path = path[len(self._pool.base_path):]
+            status, response_headers, data = self._pool.request(method, path, body, request_headers)
+        if response_headers.get('Content-Encoding') == 'gzip':
+            data = gzip.decompress(data)
+        return status, response_headers, data
+
+    def _parse(self, status, headers, data):
+        """The parsed body of a successful response; raises ElementWordsError otherwise"""
+        try:
+            body = json.loads(data) if data else {}
+        except ValueError:
+            body = {}
+        if 200 <= status < 300:
+            return body
+        error = body.get('error') if isinstance(body, dict) else None
+        error = error if isinstance(error, dict) else {}
+        retry_after = headers.get('Retry-After')
+        raise ElementWordsError(
+            status,
+            error.get('code', 'HTTP_ERROR'),
+            error.get('message', http.client.responses.get(status, 'Unexpected response')),
+            error.get('details'),
+            int(retry_after) if retry_after and retry_after.isdigit() else None
+        )
+
+    def _get(self, path):
+        return self._parse(*self._request('GET', path))['data']
+
+    def _post(self, path, payload):
+        body = json.dumps(payload).encode('utf-8')
+        return self._parse(*self._request('POST', path, body, {'Content-Type': 'application/json'}))
+
+    # Reference data
+
+    def elements(self):
+        """Every element (symbol, name, atomic_number), fetched once and reused for elements_ttl seconds"""
+        if self._elements is None or time.monotonic() >= self._elements_expire:
+            self._elements = self._get('/api/v1/elements')
+            self._elements_expire = time.monotonic() + self.elements_ttl
+        return self._elements
+
+    def element(self, symbol):
+        """One element by symbol (case-insensitive), from the cached element table"""
+        symbol = symbol.strip().capitalize()
+        for element in self.elements():
+            if element["symbol"] == symbol:
+                return element
+        raise ElementWordsError(404, "ELEMENT_NOT_FOUND", f"Element with symbol '{symbol}' not found")
+
+    # Words
+
+    def word(self, word, allow_reversed_symbols=False, top=None, sample=None, seed=None,
+             symbols=None, max_atomic_number=None, exclude_symbols=None):
+        """
+        Element spellings of a word (getWordCombinations). Full results are cached and revalidated
+        with their ETag, so a repeated lookup only downloads the result again if it changed.
+        """
+        path = build_path(word_path(word), {
+            'allow_reversed_symbols': allow_reversed_symbols,
+            'top': top,
+            'sample': sample,
+            'seed': seed,
+            'symbols': symbols,
+            'max_atomic_number': max_atomic_number,
+            'exclude_symbols': exclude_symbols
+        })
+        with self._word_cache_lock:
+            cached = self._word_cache.get(path)
+        headers = {'If-None-Match': cached[0]} if cached else None
+
+        status, response_headers, data = self._request('GET', path, headers=headers)
+        if status == 304 and cached:
+            with self._word_cache_lock:
+                if path in self._word_cache:
+                    self._word_cache.move_to_end(path)
+            return cached[1]
+
+        result = self._parse(status, response_headers, data)['data']
+        etag = response_headers.get('ETag')
+        if etag and self.word_cache_size:
+            with self._word_cache_lock:
+                self._word_cache[path] = (etag, result)
+                self._word_cache.move_to_end(path)
+                while len(self._word_cache) > self.word_cache_size:
+                    self._word_cache.popitem(last=False)
+        return result
+
+    def words(self, words, **options):
+        """
+        Look up many words at once (options as for word()). Words that normalize alike are looked up
+        once, and up to max_connections lookups run concurrently. Returns {word: result} in input order.
+        """
+        words = list(words)
+        unique = list(dict.fromkeys(clean_word(word) or word for word in words))
+        results = dict(zip(unique, self._map(lambda word: self.word(word, **options), unique)))
+        return {word: results[clean_word(word) or word] for word in words}
+
+    def _map(self, function, items):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_connections, thread_name_prefix='element-words')
+        return list(self._executor.map(function, items))
+
+    def stats(self, word, allow_reversed_symbols=False, symbols=None, max_atomic_number=None, exclude_symbols=None):
+        """Statistics over every spelling of a word (getWordStats)"""
+        return self._get(build_path(word_path(word, 'stats'), {
+            'allow_reversed_symbols': allow_reversed_symbols,
+            'symbols': symbols,
+            'max_atomic_number': max_atomic_number,
+            'exclude_symbols': exclude_symbols
+        }))
+
+    def live(self, word, top=None, allow_reversed_symbols=False, symbols=None, max_atomic_number=None, exclude_symbols=None):
+        """Solution count and best spellings of a word being typed (getLiveWord)"""
+        return self._get(build_path(word_path(word, 'live'), {
+            'allow_reversed_symbols': allow_reversed_symbols,
+            'top': top,
+            'symbols': symbols,
+            'max_atomic_number': max_atomic_number,
+            'exclude_symbols': exclude_symbols
+        }))
+
+    def summarize(self, words, allow_reversed_symbols=False):
+        """
+        Spellability, spelling count and best spelling of many words, in as few requests as their
+        size allows (batched through spellText). Returns {word: {"spellable", "count", "best"}}.
+        """
+        words = list(words)
+        unique = list(dict.fromkeys(clean_word(word) for word in words if clean_word(word)))
+        path = build_path('/api/v1/text/spell', {'allow_reversed_symbols': allow_reversed_symbols, 'format': 'summary'})
+
+        summaries = {}
+        for body in batch_lines(unique, SUMMARY_BATCH_BYTES):
+            status, headers, data = self._request('POST', path, body, {'Content-Type': 'text/plain; charset=UTF-8'})
+            if status != 200:
+                self._parse(status, headers, data)
+            # One line per distinct word, then a line with the totals
+            for line in data.decode('utf-8').splitlines():
+                entry = json.loads(line)
+                if 'token' in entry:
+                    summaries[entry['token']] = {key: entry[key] for key in ('spellable', 'count', 'best')}
+
+        unspellable = {"spellable": False, "count": 0, "best": None}
+        return {word: summaries.get(clean_word(word), unspellable) for word in words}
+
+    def filter_words(self, words, allow_reversed_symbols=False, only_spellable=False):
+        """Which of many words are spellable, and their spelling counts (filterWords)"""
+        path = build_path('/api/v1/words/filter', {
+            'allow_reversed_symbols': allow_reversed_symbols,
+            'only_spellable': only_spellable
+        })
+        return self._post(path, {"words": list(words)})['data']
+
+    def clear_cache(self):
+        """Forget cached word results and the element table"""
+        with self._word_cache_lock:
+            self._word_cache.clear()
+        self._elements = None
+
+    def close(self):
+        """Close pooled connections and lookup threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class AsyncElementWordsClient:
+    """
+    asyncio client with the same calls as ElementWordsClient. Calls run the blocking client in
+    threads, at most max_concurrency at a time, sharing its connection pool and caches.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, api_key=None, timeout=DEFAULT_TIMEOUT,
+                 max_concurrency=MAX_CONNECTIONS, **options):
+        self.client = ElementWordsClient(base_url, api_key, timeout, max_connections=max_concurrency, **options)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _call(self, function, *args, **kwargs):
+        async with self._semaphore:
+            return await asyncio.to_thread(function, *args, **kwargs)
+
+    async def elements(self):
+        return await self._call(self.client.elements)
+
+    async def element(self, symbol):
+        return await self._call(self.client.element, symbol)
+
+    async def word(self, word, **options):
+        return await self._call(self.client.word, word, **options)
+
+    async def words(self, words, **options):
+        """Look up many words concurrently (bounded by max_concurrency); returns {word: result}"""
+        words = list(words)
+        unique = list(dict.fromkeys(clean_word(word) or word for word in words))
+        results = dict(zip(unique, await asyncio.gather(*(self.word(word, **options) for word in unique))))
+        return {word: results[clean_word(word) or word] for word in words}
+
+    async def stats(self, word, **options):
+        return await self._call(self.client.stats, word, **options)
+
+    async def live(self, word, **options):
+        return await self._call(self.client.live, word, **options)
+
+    async def summarize(self, words, allow_reversed_symbols=False):
+        return await self._call(self.client.summarize, list(words), allow_reversed_symbols)
+
+    async def filter_words(self, words, allow_reversed_symbols=False, only_spellable=False):
+        return await self._call(self.client.filter_words, list(words), allow_reversed_symbols, only_spellable)
+
+    async def aclose(self):
+        await asyncio.to_thread(self.client.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,126 @@
+# coding=utf-8
+
+# Incremental spelling for as-you-type lookups. A word's spellings are counted and ranked
+# left to right, one letter at a time, so extending a prefix by a letter only looks at the
+# symbols ending at that letter. Prefix states are kept in a short-lived cache, letting each
+# keystroke resume from the state of the previous one.
+
+import time
+import threading
+from collections import OrderedDict
+
+# Prefix states are kept this long after their last use, up to a limit per process
+PREFIX_STATE_TTL = 300
+MAX_PREFIX_STATES = 50000
+
+class PrefixState:
+    """
+    Spelling state of a lowercase prefix: its number of spellings and its best (up to top_size)
+    spellings, fewest symbols first with ties in lattice order (as in the full, sorted listing).
+    Each best entry is (symbol count, ranking key, tokens). States link to the state of the
+    prefix one letter shorter, which is all extending a prefix needs to look back through.
+    """
+    __slots__ = ('word', 'parent', 'count', 'best')
+
+    def __init__(self, word, parent, count, best):
+        self.word = word
+        self.parent = parent
+        self.count = count
+        self.best = best
+
+def empty_state():
+    """State of the empty prefix: one spelling, using no symbols"""
+    return PrefixState('', None, 1, [(0, (), ())])
+
+def extend_state(state, letter, symbol_set, top_size):
+    """
+    State of state.word + letter. Every spelling of the longer prefix is a spelling of a shorter
+    prefix followed by one symbol ending at the new letter, so only the states up to
+    symbol_set.max_length letters back are needed.
+    """
+    word = state.word + letter.lower()
+    length = len(word)
+    count = 0
+    candidates = []
+    start_state = state
+    for symbol_length in range(1, min(symbol_set.max_length, length) + 1):
+        if symbol_length > 1:
+            start_state = start_state.parent
+        matches = symbol_set.lookup.get(word[length - symbol_length:])
+        if not matches or not start_state.count:
+            continue
+        count += start_state.count * len(matches)
+        # Edges from a position are ordered shorter first, then in lookup order (normal before
+        # reversed), so (symbol length, match index) ranks them like the lattice does
+        for match_index, (token, _, _) in enumerate(matches):
+            rank = (symbol_length, match_index)
+            for size, key, tokens in start_state.best:
+                candidates.append((size + 1, key + (rank,), tokens + (token,)))
+    candidates.sort(key=lambda candidate: candidate[:2])
+    return PrefixState(word, state, count, candidates[:top_size])
+
+class PrefixCache:
+    """
+    Thread-safe cache of prefix states by (symbol set digest, top size, prefix), holding
+    at most max_entries, each for ttl seconds after its last use.
+    """
+
+    def __init__(self, max_entries=MAX_PREFIX_STATES, ttl=PREFIX_STATE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now=None):
+        """Return the state for key, or None if it isn't cached (or has expired)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                del self._entries[key]
+                return None
+            entry[1] = now + self.ttl
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, state, now=None):
+        """Cache a state, dropping expired and least recently used states if full"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries[key] = [state, now + self.ttl]
+            self._entries.move_to_end(key)
+            # Entries are in last-use order, so expired ones are at the front
+            while self._entries:
+                oldest_key, (_, expires) = next(iter(self._entries.items()))
+                if expires > now and len(self._entries) <= self.max_entries:
+                    break
+                del self._entries[oldest_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+def resume_state(cache, word, symbol_set, top_size):
+    """
+    Get the state of a lowercase word, extending the longest cached prefix of it (typically the
+    word minus its last letter) one letter at a time. Returns (state, cached prefix length).
+    """
+    resumed_length = 0
+    state = None
+    for end in range(len(word), 0, -1):
+        state = cache.get((symbol_set.digest, top_size, word[:end]))
+        if state is not None:
+            resumed_length = end
+            break
+    if state is None:
+        state = empty_state()
+
+    for end in range(resumed_length + 1, len(word) + 1):
+        state = extend_state(state, word[end - 1], symbol_set, top_size)
+        cache.put((symbol_set.digest, top_size, word[:end]), state)
+    return state, resumed_length
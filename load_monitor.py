@@ -0,0 +1,78 @@
+# coding=utf-8
+
+# Load signals for the readiness probe: requests in flight in this process, and the latency
+# (and router queue time, where the platform reports it) of recently finished requests.
+
+import time
+import threading
+from collections import deque
+
+# Latencies of this many recent requests are kept, and only those from the last RECENT_SECONDS count
+LATENCY_WINDOW = 2048
+RECENT_SECONDS = 60
+
+class LoadMonitor:
+    """Thread-safe count of requests in flight and window of recent request latencies"""
+
+    def __init__(self, window=LATENCY_WINDOW, recent_seconds=RECENT_SECONDS):
+        self.recent_seconds = recent_seconds
+        self.in_flight = 0
+        self._latencies = deque(maxlen=window)
+        self._queue_times = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def start(self, queue_seconds=None):
+        """Record a request starting (queue_seconds: time it waited before reaching the app); returns its start time"""
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight += 1
+            if queue_seconds is not None:
+                self._queue_times.append((now, queue_seconds))
+        return now
+
+    def finish(self, started):
+        """Record a request that started at started finishing"""
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            self._latencies.append((now, now - started))
+
+    def _recent(self, samples, now):
+        with self._lock:
+            return sorted(value for finished, value in samples if now - finished <= self.recent_seconds)
+
+    def latency_percentile(self, percentile, now=None):
+        """Latency in seconds at a percentile (0-100) of recent requests, or None if there were none"""
+        return percentile_of(self._recent(self._latencies, now or time.monotonic()), percentile)
+
+    def queue_time_percentile(self, percentile, now=None):
+        """Router queue time in seconds at a percentile of recent requests, or None if not reported"""
+        return percentile_of(self._recent(self._queue_times, now or time.monotonic()), percentile)
+
+    def recent_count(self, now=None):
+        """Number of requests finished in the recent window"""
+        return len(self._recent(self._latencies, now or time.monotonic()))
+
+def percentile_of(values, percentile):
+    """Nearest-rank percentile of sorted values, or None if empty"""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * percentile // 100))
+    return values[int(rank) - 1]
+
+def parse_request_start(header, now=None):
+    """
+    Seconds since a router's X-Request-Start timestamp (e.g. Heroku's, in milliseconds since
+    the epoch, optionally prefixed with t=), or None if the header is missing or invalid
+    """
+    if not header:
+        return None
+    try:
+        value = float(header.strip().lstrip('t='))
+    except ValueError:
+        return None
+    # Accept seconds, milliseconds or microseconds since the epoch
+    while value > 1e11:
+        value /= 1000
+    now = time.time() if now is None else now
+    return max(0.0, now - value)
@@ -4,13 +4,45 @@ import os
 import json
 import yaml
 import gzip
-import io
+import html
+import codecs
+import contextlib
+import re
+import random
+import mimetypes
+import threading
+import math
+import time
+import functools
+import hashlib
+import sqlite3
+import socketserver
+from collections import Counter, deque
+from itertools import islice
+from urllib.parse import quote, parse_qsl, urlencode
 from datetime import datetime
-from bottle import Bottle, response, request, abort, static_file
+from wsgiref.simple_server import WSGIServer
+from bottle import Bottle, HTTPError, HTTPResponse, response, request, abort, run
 
-# List of all element symbols
-ELEMENTS = {"H": "Hydrogen", "He": "Helium", "Li": "Lithium", "Be": "Beryllium", "B": "Boron", "C": "Carbon", "N": "Nitrogen", "O": "Oxygen", "F": "Fluorine", "Ne": "Neon", "Na": "Sodium", "Mg": "Magnesium", "Al": "Aluminium", "Si": "Silicon", "P": "Phosphorus", "S": "Sulfur", "Cl": "Chlorine", "Ar": "Argon", "K": "Potassium", "Ca": "Calcium", "Sc": "Scandium", "Ti": "Titanium", "V": "Vanadium", "Cr": "Chromium", "Mn": "Manganese", "Fe": "Iron", "Co": "Cobalt", "Ni": "Nickel", "Cu": "Copper", "Zn": "Zinc", "Ga": "Gallium", "Ge": "Germanium", "As": "Arsenic", "Se": "Selenium", "Br": "Bromine", "Kr": "Krypton", "Rb": "Rubidium", "Sr": "Strontium", "Y": "Yttrium", "Zr": "Zirconium", "Nb": "Niobium", "Mo": "Molybdenum", "Tc": "Technetium", "Ru": "Ruthenium", "Rh": "Rhodium", "Pd": "Palladium", "Ag": "Silver", "Cd": "Cadmium", "In": "Indium", "Sn": "Tin", "Sb": "Antimony", "Te": "Tellurium", "I": "Iodine", "Xe": "Xenon", "Cs": "Cesium", "Ba": "Barium", "La": "Lanthanum", "Ce": "Cerium", "Pr": "Praseodymium", "Nd": "Neodymium", "Pm": "Promethium", "Sm": "Samarium", "Eu": "Europium", "Gd": "Gadolinium", "Tb": "Terbium", "Dy": "Dysprosium", "Ho": "Holmium", "Er": "Erbium", "Tm": "Thulium", "Yb": "Ytterbium", "Lu": "Lutetium", "Hf": "Hafnium", "Ta": "Tantalum", "W": "Tungsten", "Re": "Rhenium", "Os": "Osmium", "Ir": "Iridium", "Pt": "Platinum", "Au": "Gold", "Hg": "Mercury", "Tl": "Thallium", "Pb": "Lead", "Bi": "Bismuth", "Po": "Polonium", "At": "Astatine", "Rn": "Radon", "Fr": "Francium", "Ra": "Radium", "Ac": "Actinium", "Th": "Thorium", "Pa": "Protactinium", "U": "Uranium", "Np": "Neptunium", "Pu": "Plutonium", "Am": "Americium", "Cm": "Curium", "Bk": "Berkelium", "Cf": "Californium", "Es": "Einsteinium", "Fm": "Fermium", "Md": "Mendelevium", "No": "Nobelium", "Lr": "Lawrencium", "Rf": "Rutherfordium", "Db": "Dubnium", "Sg": "Seaborgium", "Bh": "Bohrium", "Hs": "Hassium", "Mt": "Meitnerium", "Ds": "Darmstadtium", "Rg": "Roentgenium", "Cn": "Copernicium", "Nh": "Nihonium", "Fl": "Flerovium", "Mc": "Moscovium", "Lv": "Livermorium", "Ts": "Tennessine", "Og": "Oganesson"}
-ELEMENT_SYMBOLS = list(ELEMENTS.keys())
+import build_assets
+import build_images
+import cache_warmup
+import incremental
+import load_monitor
+import og_images
+import packed_solutions
+import rate_limit
+import request_timing
+import response_compression
+import result_store
+import solver
+import static_cache
+import symbol_sets
+import word_filter
+
+
+# One bit per element, for fast set tests over element symbols
+ELEMENT_BITS = {symbol: 1 << i for i, symbol in enumerate(solver.ELEMENT_SYMBOLS)}
 
 # Create Bottle app
 app = Bottle()
@@ -19,6 +51,46 @@ app = Bottle()
 API_VERSION = "v1"
 MAX_WORD_LENGTH = 50
 
+# Word list used for reverse (element tiles -> words) lookups
+DICTIONARY_PATH = os.environ.get('ELEMENT_WORDS_DICTIONARY', '/usr/share/dict/words')
+MAX_TILES = 100
+DEFAULT_DICTIONARY_RESULTS = 100
+MAX_DICTIONARY_RESULTS = 1000
+
+# Text analysis limits
+MAX_TEXT_BYTES = 64 * 1024 * 1024
+TEXT_CHUNK_SIZE = 64 * 1024
+MAX_RUN_TEXT_LENGTH = 100
+
+# Runs of letters (Unicode-aware, no digits or underscores)
+LETTER_RUN_PATTERN = re.compile(r'[^\W\d_]+')
+
+# In-memory word result cache (entries per process); larger results are never cached
+WORD_RESULT_CACHE_SIZE = 1024
+MAX_CACHED_SOLUTIONS = 10000
+
+# Sampling and ranked lookups return at most this many spellings
+MAX_WORD_SAMPLES = 100
+MAX_TOP_SOLUTIONS = 100
+
+# As-you-type lookups only return the best few spellings
+DEFAULT_LIVE_SOLUTIONS = 5
+MAX_LIVE_SOLUTIONS = 20
+
+# Custom symbol sets (request parameters -> compiled set, cached per process)
+SYMBOL_SET_CACHE_SIZE = 256
+MAX_SYMBOL_SET_SIZE = 1000
+MAX_SYMBOL_LENGTH = 10
+MAX_ATOMIC_NUMBER = 999
+
+# Rate limit cost model: solutions per unit for word lookups, body bytes per unit for POSTs
+SOLUTIONS_PER_COST_UNIT = 100
+BYTES_PER_COST_UNIT = 64 * 1024
+
+# Document spelling
+WORD_SUMMARY_CACHE_SIZE = 100000
+TEXT_OUTPUT_BATCH = 1000
+
 # Helper functions
 def create_error_response(code, message, details=None):
     """Create standardized error response"""
@@ -60,70 +132,43 @@ def set_json_headers():
     response.content_type = "application/json; charset=UTF-8"
     set_cors_headers()
 
-def get_available_symbols(reverse_symbols=False):
-    """Get list of available element symbols, optionally including reversed"""
-    if not reverse_symbols:
-        return ELEMENT_SYMBOLS
-    
-    # Create list with both normal and reversed two-letter symbols
-    symbols = list(ELEMENT_SYMBOLS)  # Start with all normal symbols
-    for symbol in ELEMENT_SYMBOLS:
-        if len(symbol) == 2:
-            reversed_symbol = symbol[::-1]
-            # Only add if it's not the same as the original (prevents duplicates)
-            if reversed_symbol != symbol:
-                symbols.append(reversed_symbol)
-    return symbols
-
-def calculate_solution_score(elements_data):
-    """Calculate the total score for a solution based on atomic numbers"""
-    total_score = 0
-    for element in elements_data:
-        atomic_number = element["atomic_number"]
-        if element["reversed"]:
-            # For reversed symbols, reverse the digits of the atomic number
-            # E.g., 118 becomes 811
-            reversed_atomic_number = int(str(atomic_number)[::-1])
-            total_score += reversed_atomic_number
-        else:
-            total_score += atomic_number
-    return total_score
-
-def compress_response():
-    """Compress response if client accepts gzip and content is compressible"""
-    if 'gzip' in request.environ.get('HTTP_ACCEPT_ENCODING', ''):
-        content_type = response.content_type
-        if (content_type and 
-            (content_type.startswith('text/') or 
-             content_type.startswith('application/json') or
-             content_type.startswith('application/javascript') or
-             content_type.startswith('application/xml'))):
-            
-            body = response.body
-            if isinstance(body, str):
-                body = body.encode('utf-8')
-            elif hasattr(body, 'read'):
-                body = body.read()
-                
-            if len(body) > 1024:  # Only compress if > 1KB
-                buffer = io.BytesIO()
-                with gzip.GzipFile(fileobj=buffer, mode='wb') as f:
-                    f.write(body)
-                compressed = buffer.getvalue()
-                
-                if len(compressed) < len(body):  # Only use if actually smaller
-                    response.body = compressed
-                    response.headers['Content-Encoding'] = 'gzip'
-                    response.headers['Content-Length'] = str(len(compressed))
+def client_accepts_gzip():
+    """Check whether the client accepts gzip-encoded responses"""
+    return 'gzip' in request.environ.get('HTTP_ACCEPT_ENCODING', '')
+
+def etag_matches(etag):
+    """Check whether the request's If-None-Match header matches the given ETag"""
+    if_none_match = request.environ.get('HTTP_IF_NONE_MATCH', '')
+    return any(tag.strip() in (etag, '*') for tag in if_none_match.split(','))
+
+def result_etag(result_json):
+    """
+    Weak ETag for a serialized result: responses embedding it only differ in their meta
+    timestamp, so they are semantically (not byte for byte) equal
+    """
+    return 'W/"' + hashlib.blake2b(result_json.encode('utf-8'), digest_size=8).hexdigest() + '"'
+
+# Letter sequence lookups for normal and reversed symbol sets:
+# each maps lowercase letters to (symbol, element symbol, reversed) tuples, normal symbols first
+SYMBOL_LOOKUP = {
+    reverse_symbols: symbol_set.lookup
+    for reverse_symbols, symbol_set in solver.DEFAULT_SYMBOL_SETS.items()
+}
+
+# Spellable one- and two-letter sequences, for single-pass text scanning
+SPELLABLE_SEQUENCES = {
+    reverse_symbols: (
+        frozenset(letters for letters in lookup if len(letters) == 1),
+        frozenset(letters for letters in lookup if len(letters) == 2)
+    )
+    for reverse_symbols, lookup in SYMBOL_LOOKUP.items()
+}
 
 @app.hook('after_request')
 def enable_cors():
     """Enable CORS and security headers for all responses"""
     set_cors_headers()
     
-    # Apply compression
-    compress_response()
-    
     # Security headers
     response.headers['X-Frame-Options'] = 'DENY'
     response.headers['X-Content-Type-Options'] = 'nosniff'
@@ -131,990 +176,372 @@ def enable_cors():
     response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
     response.headers['Content-Security-Policy'] = "default-src 'self'; style-src 'self' 'unsafe-inline'; script-src 'self' 'unsafe-inline'; img-src 'self' data:; font-src 'self'"
 
+# Load tracking for the readiness probe (probes themselves aren't counted)
+LOAD_MONITOR = load_monitor.LoadMonitor()
+PROBE_PATHS = ('/api/v1/health', '/api/v1/ready')
+
+@app.hook('before_request')
+def start_load_tracking():
+    """Count the request as in flight (registered first, so rejected requests are counted too)"""
+    if request.path in PROBE_PATHS:
+        return
+    queue_seconds = load_monitor.parse_request_start(request.environ.get('HTTP_X_REQUEST_START'))
+    request.environ['element_words.started'] = LOAD_MONITOR.start(queue_seconds)
+
+@app.hook('after_request')
+def finish_load_tracking():
+    """
+    Record the request's latency once its handler is done. Streamed bodies (text analysis and
+    spelling) are only sent after this, so for them it is the time to the first byte.
+    """
+    started = request.environ.pop('element_words.started', None)
+    if started is not None:
+        LOAD_MONITOR.finish(started)
+
+# Shared caches (CDNs, proxies) key on the URL, so each word result has one canonical URL:
+# the word's letters in lowercase, and the query parameters sorted by name
+WORD_ROUTE_PREFIX = '/api/v1/words/'
+WORD_ROUTE_SUFFIXES = ('', 'stats', 'live', 'image.png')
+FLAG_QUERY_PARAMETERS = ('allow_reversed_symbols',)
+CANONICAL_REDIRECTS = os.environ.get('ELEMENT_WORDS_CANONICAL_REDIRECTS', 'true').lower() in ('1', 'true', 'yes')
+
+# Word results only change when the solver does, so shared caches may keep them for a long time
+# (purge them by surrogate key after such a deploy); browsers check back daily
+WORD_MAX_AGE = int(os.environ.get('ELEMENT_WORDS_WORD_MAX_AGE', 86400))
+WORD_SHARED_MAX_AGE = int(os.environ.get('ELEMENT_WORDS_WORD_SHARED_MAX_AGE', 31536000))
+WORD_CACHE_CONTROL = f'public, max-age={WORD_MAX_AGE}, s-maxage={WORD_SHARED_MAX_AGE}, stale-while-revalidate=86400'
+
+def canonical_query_string(query_string):
+    """
+    A query string in canonical form: parameters sorted by name (repeated ones keep their order),
+    flags as true or left out, and values consistently percent-encoded
+    """
+    parameters = []
+    for name, value in parse_qsl(query_string, keep_blank_values=True):
+        if name in FLAG_QUERY_PARAMETERS:
+            if value.lower() != 'true':
+                continue
+            value = 'true'
+        parameters.append((name, value))
+    parameters.sort(key=lambda parameter: parameter[0])
+    return urlencode(parameters, safe=',', quote_via=quote)
+
+def canonical_word_url():
+    """
+    The canonical URL (path and query string) of the current word request, or None if its word
+    isn't valid (the route reports the error) or it isn't a word route
+    """
+    if not request.path.startswith(WORD_ROUTE_PREFIX):
+        return None
+    word, slash, suffix = request.path[len(WORD_ROUTE_PREFIX):].partition('/')
+    if suffix not in WORD_ROUTE_SUFFIXES:
+        return None
+    clean_word = ''.join(c for c in word if c.isalpha()).lower()
+    if not clean_word or len(clean_word) > MAX_WORD_LENGTH:
+        return None
+    url = quote(WORD_ROUTE_PREFIX + clean_word + slash + suffix)
+    query_string = canonical_query_string(request.query_string)
+    return url + '?' + query_string if query_string else url
+
+def set_word_cache_headers(word, symbol_set, cache_control=WORD_CACHE_CONTROL, surrogate_keys=()):
+    """
+    Let shared caches keep a word response: its lifetime, canonical URL, and surrogate keys
+    for purging every word response, or those for one word or custom symbol set
+    """
+    response.headers['Cache-Control'] = cache_control
+    url = canonical_word_url()
+    if url is not None:
+        response.headers['Content-Location'] = url
+    keys = ['words', 'word/' + quote(word, safe='')]
+    if symbol_set not in solver.DEFAULT_SYMBOL_SETS.values():
+        keys.append('symbols/' + symbol_set.digest)
+    response.headers['Surrogate-Key'] = ' '.join(keys + list(surrogate_keys))
+
+@app.hook('before_request')
+def redirect_to_canonical_url():
+    """Redirect word requests to their canonical URL (before they are charged for)"""
+    if not CANONICAL_REDIRECTS or request.method not in ('GET', 'HEAD'):
+        return
+    url = canonical_word_url()
+    if url is None:
+        return
+    request_url = quote(request.path)
+    if request.query_string:
+        request_url += '?' + request.query_string
+    if url != request_url:
+        raise HTTPResponse(status=301, headers={
+            'Location': url,
+            'Cache-Control': WORD_CACHE_CONTROL
+        })
+
+# Rate limiting: each client's requests are charged their estimated solver cost
+RATE_LIMITER = rate_limit.open_rate_limiter()
+RATE_LIMIT_EXEMPT_PATHS = PROBE_PATHS
+
+def get_client_key():
+    """Identify the client by API key when it sends an issued one, otherwise by IP address"""
+    api_key = request.environ.get('HTTP_X_API_KEY')
+    if not api_key:
+        authorization = request.environ.get('HTTP_AUTHORIZATION', '')
+        if authorization.startswith('Bearer '):
+            api_key = authorization[7:]
+    api_key = (api_key or '').strip()
+    if api_key in rate_limit.RATE_LIMIT_API_KEYS:
+        # Keys are secrets, so the (possibly shared, on-disk) bucket is named by a digest
+        return 'key:' + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:32]
+    # The router appends the real client address last; earlier entries can be spoofed
+    forwarded_for = request.environ.get('HTTP_X_FORWARDED_FOR')
+    if forwarded_for:
+        return 'ip:' + forwarded_for.rsplit(',', 1)[-1].strip()
+    return 'ip:' + request.environ.get('REMOTE_ADDR', '')
+
+def estimate_request_cost():
+    """Estimate a request's cost in rate limit units (1 for a cheap request)"""
+    path = request.path
+    if request.method == 'POST':
+        # Body-processing endpoints scale with the size of the body. A chunked body's size isn't
+        # known up front, so it's charged as the largest allowed (the limiter caps it at the burst)
+        if request.content_length < 0:
+            return 1 + MAX_TEXT_BYTES / BYTES_PER_COST_UNIT
+        return 1 + request.content_length / BYTES_PER_COST_UNIT
+    # Word lookups pay for the solutions they list once they are known (see charge_solutions),
+    # so a rejected request never costs the solver anything
+    return 1
+
+def charge_solutions(solution_count):
+    """Charge the client for the solutions a word lookup listed, on top of what it was admitted for"""
+    key = request.environ.get('element_words.rate_limit_key')
+    if key is None or not solution_count:
+        return
+    try:
+        RATE_LIMITER.charge(key, solution_count / SOLUTIONS_PER_COST_UNIT, overdraw=True)
+    except sqlite3.Error:
+        pass
+
+@app.hook('before_request')
+def enforce_rate_limit():
+    """Reject API requests from clients that have used up their budget"""
+    if RATE_LIMITER is None or request.method == 'OPTIONS':
+        return
+    path = request.path
+    if not path.startswith('/api/') or path in RATE_LIMIT_EXEMPT_PATHS:
+        return
+    
+    client_key = get_client_key()
+    try:
+        wait = RATE_LIMITER.charge(client_key, estimate_request_cost())
+    except sqlite3.Error:
+        # Fail open if the shared limiter store is unavailable
+        return
+    
+    if wait:
+        retry_after = max(1, math.ceil(wait))
+        error = create_error_response("RATE_LIMITED", "Too many requests, please retry later", {"retry_after": retry_after})
+        raise HTTPResponse(json.dumps(error), status=429, headers={
+            'Content-Type': 'application/json; charset=UTF-8',
+            'Retry-After': str(retry_after)
+        })
+    # Routes charge costs they only know once they have run to the same bucket
+    request.environ['element_words.rate_limit_key'] = client_key
+
+# Browsers cap how long they reuse a preflight response (Firefox at a day, Chromium at 2 hours)
+PREFLIGHT_MAX_AGE = 86400
+
 @app.route('/api/<version>/options', method='OPTIONS')
 @app.route('/api/<version>/<path:path>', method='OPTIONS')
 def handle_options(version=None, path=None):
     """Handle preflight OPTIONS requests"""
     set_cors_headers()
+    # Browsers (and shared caches) can reuse the preflight instead of repeating it per request
+    response.headers['Access-Control-Max-Age'] = str(PREFLIGHT_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={PREFLIGHT_MAX_AGE}'
     return {}
 
 # Web Application
+def load_built_asset(filename):
+    """Load a built asset and its precompressed variant into memory"""
+    asset_path = os.path.join(build_assets.DIST_DIR, filename)
+    with open(asset_path, 'rb') as f:
+        body = f.read()
+    with open(asset_path + '.gz', 'rb') as f:
+        compressed = f.read()
+    return {
+        "body": body,
+        "gzip": compressed,
+        "etag": '"' + build_assets.content_hash(body) + '"'
+    }
+
+def serve_built_asset(asset):
+    """Serve an in-memory built asset that must be revalidated on every use"""
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['ETag'] = asset["etag"]
+    response.headers['Vary'] = 'Accept-Encoding'
+
+    if etag_matches(asset["etag"]):
+        response.status = 304
+        return ""
+
+    if client_accepts_gzip():
+        response.headers['Content-Encoding'] = 'gzip'
+        return asset["gzip"]
+    return asset["body"]
+
+# Build fingerprinted assets on startup so the shell always references current CSS/JS
+ASSET_MANIFEST = build_assets.build()
+APP_SHELL = load_built_asset(build_assets.HTML_SHELL)
+SERVICE_WORKER = load_built_asset(build_assets.SERVICE_WORKER)
+
+# Shared word links get their own Open Graph tags, since link preview crawlers don't run app.js
+SHARED_SHELL_CACHE_SIZE = 1024
+
+def set_meta_content(page, meta_id, value):
+    """Replace the content of the meta tag with the given id"""
+    pattern = re.compile(r'content="[^"]*"(?= id="' + meta_id + '")')
+    return pattern.sub(lambda _: 'content="' + html.escape(value) + '"', page, count=1)
+
+@functools.lru_cache(maxsize=SHARED_SHELL_CACHE_SIZE)
+def build_shared_app_shell(origin, word, reverse_symbols):
+    """The app shell with Open Graph tags (title, description and card image) for a shared word"""
+    option = 'allow_reversed_symbols=true' if reverse_symbols else ''
+    title = f"Element Words - {word.upper()}"
+    page = APP_SHELL["body"].decode('utf-8')
+    page = set_meta_content(page, 'og-title', title)
+    page = set_meta_content(page, 'og-description', f'Check out "{word.upper()}" spelled using chemical element symbols from the periodic table!')
+    page = set_meta_content(page, 'og-image', f"{origin}/api/v1/words/{quote(word)}/image.png" + ('?' + option if option else ''))
+    page = set_meta_content(page, 'og-image-alt', title)
+    page = set_meta_content(page, 'og-image-width', '1200')
+    page = set_meta_content(page, 'og-image-height', '630')
+    page = set_meta_content(page, 'og-url', f"{origin}/?word={quote(word)}" + ('&' + option if option else ''))
+    body = page.encode('utf-8')
+    return {
+        "body": body,
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        "etag": '"' + build_assets.content_hash(body) + '"'
+    }
+
 @app.get('/')
 def element_words_app():
     """Element Words Web Application"""
     response.content_type = "text/html; charset=UTF-8"
-    return """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Element Words - Spell with Chemical Elements</title>
-        
-        <!-- Favicon - Multiple formats for better subdomain compatibility -->
-        <link rel="shortcut icon" type="image/x-icon" href="/static/favicon.ico" />
-        <link rel="icon" type="image/svg+xml" href="/static/favicon.svg" />
-        <link rel="icon" type="image/png" sizes="16x16" href="/static/favicon-16x16.png" />
-        <link rel="icon" type="image/png" sizes="32x32" href="/static/favicon-32x32.png" />
-        <link rel="icon" type="image/png" sizes="96x96" href="/static/favicon-96x96.png" />
-
-        <!-- Apple Touch Icons - Default (for Apple Share Sheet) should be largest size -->
-        <link rel="apple-touch-icon" href="/static/apple-180x180-touch-icon.png" />
-        <link rel="apple-touch-icon" sizes="57x57" href="/static/apple-57x57-touch-icon.png" />
-        <link rel="apple-touch-icon" sizes="60x60" href="/static/apple-60x60-touch-icon.png" />
-        <link rel="apple-touch-icon" sizes="72x72" href="/static/apple-72x72-touch-icon.png" />
-        <link rel="apple-touch-icon" sizes="76x76" href="/static/apple-76x76-touch-icon.png" />
-        <link rel="apple-touch-icon" sizes="114x114" href="/static/apple-114x114-touch-icon.png" />
-        <link rel="apple-touch-icon" sizes="120x120" href="/static/apple-120x120-touch-icon.png" />
-        <link rel="apple-touch-icon" sizes="144x144" href="/static/apple-144x144-touch-icon.png" />
-        <link rel="apple-touch-icon" sizes="152x152" href="/static/apple-152x152-touch-icon.png" />
-        <link rel="apple-touch-icon" sizes="180x180" href="/static/apple-180x180-touch-icon.png" />
-        
-        <link rel="icon" type="image/png" sizes="196x196" href="/static/android-chrome-196x196.png" />
-        <link rel="icon" type="image/png" href="/static/android-chrome-192x192.png" sizes="192x192" type="image/png">
-        <link rel="icon" type="image/png" href="/static/android-chrome-384x384.png" sizes="384x384" type="image/png">
-        <link rel="icon" type="image/png" href="/static/android-chrome-512x512.png" sizes="512x512" type="image/png">
-        
-                <meta name="theme-color" content="#667eea" />
-          
-        <meta name="msapplication-TileColor" content="#667eea" />
-        <meta name="msapplication-TileImage" content="/static/windows-tile.png">
-        <meta name="msapplication-square70x70logo" content="/static/windows-small-tile.png" />
-        <meta name="msapplication-square150x150logo" content="/static/windows-medium-tile.png" />
-        <meta name="msapplication-wide310x150logo" content="/static/windows-wide-tile.png" />
-        <meta name="msapplication-square310x310logo" content="/static/windows-large-tile.png" />
-        
-        <link rel="manifest" href="/static/site.webmanifest" />
-        
-        <!-- Additional meta tags for PWA and share support -->
-        <meta name="mobile-web-app-capable" content="yes">
-        <meta name="apple-mobile-web-app-capable" content="yes">
-        <meta name="apple-mobile-web-app-status-bar-style" content="default">
-        <meta name="apple-mobile-web-app-title" content="Element Words">
-        <meta name="theme-color" content="#667eea">
-        <meta name="msapplication-TileColor" content="#667eea">
-        <meta name="msapplication-TileImage" content="/static/favicon-96x96.png">
-        
-        <!-- Open Graph / Social Media Meta Tags -->
-        <meta property="og:type" content="website">
-        <meta property="og:title" content="Element Words - Spell with Chemical Elements" id="og-title">
-        <meta property="og:description" content="Create words using chemical element symbols from the periodic table." id="og-description">
-        <meta property="og:image" content="https://elements.chriswilson.app/static/android-chrome-512x512.png" id="og-image">
-        <meta property="og:image:alt" content="Element Words - Spell with Chemical Elements" id="og-image-alt">
-        <meta property="og:image:width" content="512">
-        <meta property="og:image:height" content="512">
-        <meta property="og:image:type" content="image/png">
-        <meta property="og:url" content="{request.url}" id="og-url">
-        
-        <!-- Apple Share Sheet specific meta tags -->
-        <meta name="apple-touch-fullscreen" content="yes">
-        <meta name="format-detection" content="telephone=no">
-
-        <!-- General meta tags -->
-        <meta name="description" content="Create words using chemical element symbols from the periodic table.">
-        <meta name="keywords" content="chemistry, periodic table, elements, word game, science, education">
-        <meta name="author" content="Chris Wilson">
-        
-        <style>
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            
-            body {
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                padding: 20px;
-            }
-            
-            .container {
-                background: white;
-                border-radius: 20px;
-                box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-                padding: 40px;
-                max-width: 800px;
-                width: 100%;
-            }
-            
-            h1 {
-                text-align: center;
-                color: #2d3748;
-                margin-bottom: 10px;
-                font-size: 2.5rem;
-                font-weight: 700;
-            }
-            
-            .subtitle {
-                text-align: center;
-                color: #718096;
-                margin-bottom: 40px;
-                font-size: 1.1rem;
-            }
-            
-            .input-section {
-                margin-bottom: 30px;
-            }
-            
-            .input-group {
-                display: flex;
-                gap: 10px;
-                margin-bottom: 15px;
-                flex-wrap: wrap;
-            }
-            
-            #wordInput {
-                flex: 1;
-                min-width: 250px;
-                padding: 15px 20px;
-                border: 2px solid #e2e8f0;
-                border-radius: 12px;
-                font-size: 1.1rem;
-                transition: border-color 0.2s ease;
-            }
-            
-            #wordInput:focus {
-                outline: none;
-                border-color: #667eea;
-                box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-            }
-            
-            .btn {
-                padding: 15px 30px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                border: none;
-                border-radius: 12px;
-                font-size: 1.1rem;
-                font-weight: 600;
-                cursor: pointer;
-                transition: transform 0.2s ease, box-shadow 0.2s ease;
-            }
-            
-            .btn:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 10px 20px rgba(102, 126, 234, 0.3);
-            }
-            
-            .btn:active {
-                transform: translateY(0);
-            }
-            
-            .btn:disabled {
-                opacity: 0.6;
-                cursor: not-allowed;
-                transform: none;
-                box-shadow: none;
-            }
-            
-            .btn-secondary {
-                background: linear-gradient(135deg, #718096 0%, #4a5568 100%);
-            }
-            
-            .btn-secondary:hover {
-                box-shadow: 0 10px 20px rgba(113, 128, 150, 0.3);
-            }
-            
-            .checkbox-group {
-                display: flex;
-                align-items: center;
-                gap: 10px;
-                color: #4a5568;
-            }
-            
-            .checkbox-group input[type="checkbox"] {
-                width: 18px;
-                height: 18px;
-                accent-color: #667eea;
-            }
-            
-            .loading {
-                text-align: center;
-                color: #718096;
-                margin: 20px 0;
-                font-size: 1.1rem;
-            }
-            
-            .error {
-                background: #fed7d7;
-                color: #c53030;
-                padding: 15px 20px;
-                border-radius: 12px;
-                margin: 20px 0;
-                border-left: 4px solid #c53030;
-            }
-            
-            .no-results {
-                text-align: center;
-                color: #718096;
-                margin: 30px 0;
-                font-size: 1.1rem;
-            }
-            
-            .solutions-count {
-                text-align: center;
-                margin: 20px 0;
-                padding: 12px 20px;
-                background: transparent;
-                color: #667eea;
-                border: 2px solid #667eea;
-                border-radius: 8px;
-                font-size: 1.1rem;
-                font-weight: 500;
-                display: inline-block;
-                backdrop-filter: blur(10px);
-                background: rgba(102, 126, 234, 0.05);
-            }
-            
-            .sorting-controls {
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                gap: 15px;
-                margin-bottom: 25px;
-                flex-wrap: wrap;
-            }
-            
-            .sorting-controls label {
-                font-weight: 600;
-                color: #4a5568;
-            }
-            
-            .sorting-controls select {
-                padding: 8px 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 8px;
-                background: white;
-                font-size: 1rem;
-                cursor: pointer;
-                transition: border-color 0.2s ease;
-            }
-            
-            .sorting-controls select:focus {
-                outline: none;
-                border-color: #667eea;
-                box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-            }
-            
-            .results {
-                margin-top: 30px;
-            }
-            
-            .solution {
-                background: #f7fafc;
-                border-radius: 16px;
-                padding: 25px;
-                margin-bottom: 20px;
-                border-left: 4px solid #667eea;
-                transition: transform 0.2s ease;
-            }
-            
-            .solution:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 8px 16px rgba(0, 0, 0, 0.1);
-            }
-            
-            .solution-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 15px;
-            }
-            
-            .solution-title {
-                font-size: 1.2rem;
-                font-weight: 600;
-                color: #2d3748;
-            }
-            
-            .solution-stats {
-                display: flex;
-                gap: 10px;
-                align-items: center;
-            }
-            
-            .element-count {
-                background: #667eea;
-                color: white;
-                padding: 4px 12px;
-                border-radius: 20px;
-                font-size: 0.9rem;
-                font-weight: 500;
-            }
-            
-            .score {
-                background: #48bb78;
-                color: white;
-                padding: 4px 12px;
-                border-radius: 20px;
-                font-size: 0.9rem;
-                font-weight: 500;
-            }
-            
-            .elements-container {
-                display: flex;
-                flex-wrap: wrap;
-                gap: 10px;
-            }
-            
-            .element-tile {
-                background: white;
-                border: 2px solid #e2e8f0;
-                border-radius: 12px;
-                padding: 15px;
-                min-width: 60px;
-                text-align: center;
-                position: relative;
-                transition: all 0.2s ease;
-                cursor: pointer;
-            }
-            
-            .element-tile:hover {
-                border-color: #667eea;
-                transform: translateY(-2px);
-                box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-            }
-            
-            .element-tile.reversed {
-                border-color: #ed8936;
-                background: #fef5e7;
-            }
-            
-            .element-tile.reversed:hover {
-                border-color: #dd6b20;
-            }
-            
-            .element-symbol {
-                font-size: 1.4rem;
-                font-weight: 700;
-                color: #2d3748;
-                margin-bottom: 4px;
-            }
-            
-            .element-name {
-                font-size: 0.8rem;
-                color: #718096;
-                font-weight: 500;
-            }
-            
-            .element-number {
-                position: absolute;
-                top: 2px;
-                right: 4px;
-                font-size: 0.7rem;
-                color: #a0aec0;
-                font-weight: 500;
-            }
-            
-            .element-tile.reversed .element-number {
-                color: #ed8936;
-            }
-            
-            .element-reverse-icon {
-                position: absolute;
-                top: 2px;
-                left: 4px;
-                font-size: 0.7rem;
-                color: #ed8936;
-                font-weight: 500;
-            }
-            
+    
+    shell = APP_SHELL
+    word = ''.join(c for c in request.query.get('word', '') if c.isalpha()).lower()
+    if word and len(word) <= MAX_WORD_LENGTH:
+        reverse_symbols = request.query.get('allow_reversed_symbols', '').lower() == 'true'
+        origin = f"{request.urlparts.scheme}://{request.urlparts.netloc}"
+        shell = build_shared_app_shell(origin, word, reverse_symbols)
+    
+    # The shell is tiny and references content-hashed assets, so always revalidate it
+    return serve_built_asset(shell)
 
-            
-            .api-link {
-                text-align: center;
-                margin-top: 40px;
-                padding-top: 20px;
-                border-top: 1px solid #e2e8f0;
-            }
-            
-            .api-link a {
-                color: #667eea;
-                text-decoration: none;
-                font-weight: 500;
-            }
-            
-            .api-link a:hover {
-                text-decoration: underline;
-            }
-            
-            @media (max-width: 600px) {
-                .container {
-                    margin: 10px;
-                    padding: 20px;
-                }
-                
-                h1 {
-                    font-size: 2rem;
-                }
-                
-                .input-group {
-                    flex-direction: column;
-                }
-                
-                #wordInput {
-                    min-width: 100%;
-                }
-                
-                .solution-header {
-                    flex-direction: column;
-                    gap: 10px;
-                    align-items: flex-start;
-                }
-                
-                .sorting-controls {
-                    flex-direction: column;
-                    gap: 10px;
-                    align-items: stretch;
-                }
-                
-                .sorting-controls select {
-                    width: 100%;
-                }
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>Element Words</h1>
-            <p class="subtitle">Create words using chemical element symbols</p>
-            
-            <div class="input-section">
-                <div class="input-group">
-                    <input type="text" id="wordInput" placeholder="Enter a word (e.g., hero, water, science)" maxlength="50" style="text-transform: lowercase;">
-                    <button class="btn" onclick="searchWord()">Find Elements</button>
-                    <button class="btn btn-secondary" id="shareBtn" onclick="shareCurrentState()" style="display: none;">Share</button>
-                </div>
-                <div class="checkbox-group">
-                    <input type="checkbox" id="allowReversed">
-                    <label for="allowReversed">Allow reversed symbols</label>
-                </div>
-            </div>
-            
-            <div id="loading" class="loading" style="display: none;">
-                Searching for element combinations...
-            </div>
-            
-            <div id="error" class="error" style="display: none;"></div>
-            
-            <div id="noResults" class="no-results" style="display: none;">
-                No element combinations found for this word. Try allowing reversed symbols or a different word.
-            </div>
-            
-            <div id="solutionsCount" class="solutions-count" style="display: none;">
-                <span id="countText"></span>
-            </div>
-            
-            <div id="sortingControls" class="sorting-controls" style="display: none;">
-                <label for="sortBy">Sort by:</label>
-                <select id="sortBy">
-                    <option value="elements">Number of Elements</option>
-                    <option value="score">Score</option>
-                </select>
-                <select id="sortOrder">
-                    <option value="asc">Ascending</option>
-                    <option value="desc">Descending</option>
-                </select>
-            </div>
-            
-            <div id="results" class="results"></div>
-            
-            <div class="api-link">
-                <a href="/api/v1/docs" target="_blank">View API Documentation</a>
-            </div>
-        </div>
-        
-        <script>
-            const wordInput = document.getElementById('wordInput');
-            const allowReversedCheckbox = document.getElementById('allowReversed');
-            const shareBtn = document.getElementById('shareBtn');
-            const loadingDiv = document.getElementById('loading');
-            const errorDiv = document.getElementById('error');
-            const noResultsDiv = document.getElementById('noResults');
-            const solutionsCountDiv = document.getElementById('solutionsCount');
-            const sortingControlsDiv = document.getElementById('sortingControls');
-            const sortBySelect = document.getElementById('sortBy');
-            const sortOrderSelect = document.getElementById('sortOrder');
-            const countTextSpan = document.getElementById('countText');
-            const resultsDiv = document.getElementById('results');
-            
-            // Store current solutions for re-sorting
-            let currentSolutions = [];
-            
-            // Update page title and meta tags for sharing
-            function updatePageMetadata(word) {
-                const baseTitle = "Element Words";
-                const cleanWord = word ? word.trim().toUpperCase() : null;
-                const newTitle = cleanWord ? `${baseTitle} - ${cleanWord}` : `${baseTitle} - Spell with Chemical Elements`;
-                const newDescription = cleanWord ? 
-                    `Check out "${cleanWord}" spelled using chemical element symbols from the periodic table!` : 
-                    "Create words using chemical element symbols from the periodic table.";
-                
-                // Update page title
-                document.title = newTitle;
-                
-                // Update Open Graph meta tags
-                const ogTitle = document.getElementById('og-title');
-                const ogDescription = document.getElementById('og-description');
-                const ogImageAlt = document.getElementById('og-image-alt');
-                const ogUrl = document.getElementById('og-url');
-                
-                if (ogTitle) ogTitle.setAttribute('content', newTitle);
-                if (ogDescription) ogDescription.setAttribute('content', newDescription);
-                if (ogImageAlt) ogImageAlt.setAttribute('content', newTitle);
-                if (ogUrl) ogUrl.setAttribute('content', window.location.href);
-                
-                // Update general description meta tag
-                const descriptionMeta = document.querySelector('meta[name="description"]');
-                if (descriptionMeta) {
-                    descriptionMeta.setAttribute('content', newDescription);
-                }
-                
-                // Force a DOM update to ensure changes are applied
-                document.head.offsetHeight; // Trigger reflow
-            }
-            
-            // Initialize app based on URL parameters on page load
-            function initializeFromURL() {
-                const urlParams = new URLSearchParams(window.location.search);
-                
-                // Set word if provided
-                const word = urlParams.get('word');
-                if (word) {
-                    wordInput.value = word;
-                }
-                
-                // Set allow_reversed_symbols if provided
-                const allowReversed = urlParams.get('allow_reversed_symbols');
-                if (allowReversed === 'true') {
-                    allowReversedCheckbox.checked = true;
-                }
-                
-                // Set sorting options if provided
-                const sortBy = urlParams.get('sort_by');
-                if (sortBy && (sortBy === 'elements' || sortBy === 'score')) {
-                    sortBySelect.value = sortBy;
-                }
-                
-                const sortOrder = urlParams.get('sort_order');
-                if (sortOrder && (sortOrder === 'asc' || sortOrder === 'desc')) {
-                    sortOrderSelect.value = sortOrder;
-                }
-                
-                // Update metadata immediately with the word from URL if present
-                if (word) {
-                    updatePageMetadata(word);
-                    searchWord();
-                } else {
-                    // Set initial metadata
-                    updatePageMetadata();
-                }
-            }
-            
-            // Update URL with current state
-            function updateURL() {
-                const urlParams = new URLSearchParams();
-                
-                const word = wordInput.value.trim().toLowerCase();
-                if (word) {
-                    urlParams.set('word', word);
-                }
-                
-                if (allowReversedCheckbox.checked) {
-                    urlParams.set('allow_reversed_symbols', 'true');
-                }
-                
-                if (currentSolutions.length > 1) {
-                    urlParams.set('sort_by', sortBySelect.value);
-                    urlParams.set('sort_order', sortOrderSelect.value);
-                }
-                
-                // Update URL without reloading the page
-                const newURL = window.location.pathname + (urlParams.toString() ? '?' + urlParams.toString() : '');
-                window.history.replaceState({}, '', newURL);
-            }
-            
-            // Allow Enter key to trigger search
-            wordInput.addEventListener('keypress', function(e) {
-                if (e.key === 'Enter') {
-                    searchWord();
-                }
-            });
-            
-            // Clear results when input changes
-            wordInput.addEventListener('input', function() {
-                clearResults();
-            });
-            
-            allowReversedCheckbox.addEventListener('change', function() {
-                if (wordInput.value.trim()) {
-                    searchWord();
-                } else {
-                    updateURL();
-                }
-            });
-            
-            // Add event listeners for sorting controls
-            sortBySelect.addEventListener('change', function() {
-                if (currentSolutions.length > 0) {
-                    displaySolutions(currentSolutions);
-                }
-                updateURL();
-            });
-            
-            sortOrderSelect.addEventListener('change', function() {
-                if (currentSolutions.length > 0) {
-                    displaySolutions(currentSolutions);
-                }
-                updateURL();
-            });
-            
-            function clearResults() {
-                loadingDiv.style.display = 'none';
-                errorDiv.style.display = 'none';
-                noResultsDiv.style.display = 'none';
-                solutionsCountDiv.style.display = 'none';
-                sortingControlsDiv.style.display = 'none';
-                shareBtn.style.display = 'none';
-                resultsDiv.innerHTML = '';
-                currentSolutions = [];
-                // Reset metadata to default
-                updatePageMetadata();
-            }
-            
-            async function searchWord() {
-                const word = wordInput.value.trim().toLowerCase();
-                if (!word) {
-                    showError('Please enter a word');
-                    return;
-                }
-                
-                clearResults();
-                loadingDiv.style.display = 'block';
-                
-                try {
-                    const allowReversed = allowReversedCheckbox.checked;
-                    const url = `/api/v1/words/${encodeURIComponent(word)}${allowReversed ? '?allow_reversed_symbols=true' : ''}`;
-                    
-                    const response = await fetch(url);
-                    const data = await response.json();
-                    
-                    loadingDiv.style.display = 'none';
-                    
-                    if (!response.ok) {
-                        showError(data.error?.message || 'An error occurred');
-                        return;
-                    }
-                    
-                    displayResults(data.data);
-                    updateURL();
-                } catch (error) {
-                    loadingDiv.style.display = 'none';
-                    showError('Network error. Please try again.');
-                }
-            }
-            
-            function showError(message) {
-                errorDiv.textContent = message;
-                errorDiv.style.display = 'block';
-            }
-            
-            function displayResults(data) {
-                if (!data.solutions || data.solutions.length === 0) {
-                    noResultsDiv.style.display = 'block';
-                    // Update metadata for no results case
-                    updatePageMetadata(data.input_word);
-                    return;
-                }
-                
-                // Store solutions for re-sorting
-                currentSolutions = data.solutions;
-                
-                // Update page metadata with the current word for sharing
-                updatePageMetadata(data.input_word);
-                
-                // Show share button when there are results
-                shareBtn.style.display = 'inline-block';
-                
-                // Display solutions with current sorting
-                displaySolutions(currentSolutions);
-            }
-            
-            // Share current state
-            function shareCurrentState() {
-                const currentURL = window.location.href;
-                const word = wordInput.value.trim();
-                
-                // Construct the title dynamically to ensure it matches the current state
-                const baseTitle = "Element Words";
-                const shareTitle = word ? `${baseTitle} - ${word.toUpperCase()}` : baseTitle;
-                
-                const shareText = word ? 
-                    `Check out "${word.toUpperCase()}" spelled using chemical element symbols!` : 
-                    'Check out this word made from chemical element symbols!';
-                
-                // Ensure meta tags are updated before sharing (for share sheet preview)
-                updatePageMetadata(word);
-                
-                // Force meta tag updates to be processed immediately
-                // This is critical for share sheet previews
-                const ogTitle = document.getElementById('og-title');
-                const ogDescription = document.getElementById('og-description');
-                if (ogTitle && word) {
-                    ogTitle.setAttribute('content', `Element Words - ${word.toUpperCase()}`);
-                }
-                if (ogDescription && word) {
-                    ogDescription.setAttribute('content', `Check out "${word.toUpperCase()}" spelled using element symbols from the periodic table!`);
-                }
-                
-                // Add a small delay to ensure meta tags are processed before sharing
-                // This helps with share sheet previews that read the meta tags
-                setTimeout(() => {
-                    // Try to use the Web Share API if available (modern browsers, especially mobile)
-                    if (navigator.share) {
-                        navigator.share({
-                            title: shareTitle,
-                            text: shareText,
-                            url: currentURL
-                        }).catch(err => {
-                            // Fallback to copying URL if share fails
-                            copyToClipboard(currentURL);
-                        });
-                    } else {
-                        // Fallback: copy URL to clipboard
-                        copyToClipboard(currentURL);
-                    }
-                }, 100); // Small delay to allow meta tag updates to be processed
-            }
-            
-            // Copy text to clipboard
-            function copyToClipboard(text) {
-                // Try the modern clipboard API first
-                if (navigator.clipboard && navigator.clipboard.writeText) {
-                    navigator.clipboard.writeText(text).then(() => {
-                        showToast('URL copied to clipboard!');
-                    }).catch(() => {
-                        // Fallback to older method
-                        fallbackCopyToClipboard(text);
-                    });
-                } else {
-                    // Fallback to older method
-                    fallbackCopyToClipboard(text);
-                }
-            }
-            
-            // Fallback clipboard method for older browsers
-            function fallbackCopyToClipboard(text) {
-                const textArea = document.createElement('textarea');
-                textArea.value = text;
-                textArea.style.position = 'fixed';
-                textArea.style.left = '-999999px';
-                textArea.style.top = '-999999px';
-                document.body.appendChild(textArea);
-                textArea.focus();
-                textArea.select();
-                
-                try {
-                    document.execCommand('copy');
-                    showToast('URL copied to clipboard!');
-                } catch (err) {
-                    showToast('Unable to copy URL. Please copy manually: ' + text);
-                }
-                
-                document.body.removeChild(textArea);
-            }
-            
-            // Show toast notification
-            function showToast(message) {
-                // Create toast element
-                const toast = document.createElement('div');
-                toast.style.cssText = `
-                    position: fixed;
-                    top: 20px;
-                    right: 20px;
-                    background: #48bb78;
-                    color: white;
-                    padding: 12px 20px;
-                    border-radius: 8px;
-                    font-weight: 500;
-                    z-index: 1000;
-                    transform: translateX(100%);
-                    transition: transform 0.3s ease;
-                    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-                `;
-                toast.textContent = message;
-                
-                document.body.appendChild(toast);
-                
-                // Animate in
-                setTimeout(() => {
-                    toast.style.transform = 'translateX(0)';
-                }, 100);
-                
-                // Remove after 3 seconds
-                setTimeout(() => {
-                    toast.style.transform = 'translateX(100%)';
-                    setTimeout(() => {
-                        if (document.body.contains(toast)) {
-                            document.body.removeChild(toast);
-                        }
-                    }, 300);
-                }, 3000);
-            }
-            
-            function displaySolutions(solutions) {
-                const solutionCount = solutions.length;
-                
-                // Display solutions count
-                const countText = solutionCount === 1 ? '1 solution found' : `${solutionCount} solutions found`;
-                countTextSpan.textContent = countText;
-                solutionsCountDiv.style.display = 'block';
-                
-                // Show sorting controls if there are multiple solutions
-                if (solutionCount > 1) {
-                    sortingControlsDiv.style.display = 'flex';
-                }
-                
-                // Sort solutions based on current selection
-                const sortBy = sortBySelect.value;
-                const sortOrder = sortOrderSelect.value;
-                
-                const sortedSolutions = [...solutions].sort((a, b) => {
-                    let valueA, valueB;
-                    
-                    if (sortBy === 'elements') {
-                        valueA = a.elements.length;
-                        valueB = b.elements.length;
-                    } else if (sortBy === 'score') {
-                        valueA = a.score || 0;
-                        valueB = b.score || 0;
-                    }
-                    
-                    if (sortOrder === 'asc') {
-                        return valueA - valueB;
-                    } else {
-                        return valueB - valueA;
-                    }
-                });
-                
-                let html = '';
-                
-                sortedSolutions.forEach((solution, index) => {
-                    const elementCount = solution.elements.length;
-                    const elementCountText = elementCount === 1 ? '1 element' : `${elementCount} elements`;
-                    const score = solution.score || 0;
-                    
-                    html += `
-                        <div class="solution">
-                            <div class="solution-header">
-                                <div class="solution-title">${solution.representation}</div>
-                                <div class="solution-stats">
-                                    <div class="element-count">${elementCountText}</div>
-                                    <div class="score">Score: ${score}</div>
-                                </div>
-                            </div>
-                            <div class="elements-container">
-                    `;
-                    
-                    solution.elements.forEach(element => {
-                        const reversedClass = element.reversed ? ' reversed' : '';
-                        
-                        // Transform display for reversed symbols (UI only)
-                        let displaySymbol = element.symbol;
-                        let displayAtomicNumber = element.atomic_number;
-                        
-                        if (element.reversed) {
-                            // Reverse the symbol letter order (e.g., "He" -> "eH")
-                            displaySymbol = element.symbol.split('').reverse().join('');
-                            // Reverse the atomic number digits (e.g., 107 -> 701)
-                            displayAtomicNumber = element.atomic_number.toString().split('').reverse().join('');
-                        }
-                        
-                        html += `
-                            <div class="element-tile${reversedClass}" title="${element.name} (${displaySymbol})${element.reversed ? ' - Reversed symbol' : ''}">
-                                ${element.reversed ? '<div class="element-reverse-icon">⟲</div>' : ''}
-                                <div class="element-number">${displayAtomicNumber}</div>
-                                <div class="element-symbol">${displaySymbol}</div>
-                                <div class="element-name">${element.name}</div>
-                            </div>
-                        `;
-                    });
-                    
-                    html += `
-                            </div>
-                        </div>
-                    `;
-                });
-                
-                resultsDiv.innerHTML = html;
-            }
-            
-            // Initialize app on page load
-            window.addEventListener('load', function() {
-                initializeFromURL();
-                // Only focus input if no word was provided in URL
-                if (!wordInput.value.trim()) {
-                    wordInput.focus();
-                }
-            });
-        </script>
-    </body>
-    </html>
-    """
+@app.get('/sw.js')
+def service_worker():
+    """Serve the service worker from the site root so it can control every page"""
+    response.content_type = "application/javascript; charset=UTF-8"
+    response.headers['Service-Worker-Allowed'] = '/'
+    return serve_built_asset(SERVICE_WORKER)
 
 # Static file serving
-@app.route('/static/<filename>')
-def serve_static(filename):
-    """Serve static files (favicon, images, etc.)"""
+# Static files are read once and then served from memory (or streamed, if large)
+STATIC_FILES = static_cache.StaticFileCache('./static')
+
+def send_static_file(filepath, headers=None, mimetype=None):
+    """Serve a file under ./static with conditional and range request support"""
+    entry = STATIC_FILES.get(filepath, mimetype)
+    if entry is None:
+        return HTTPError(404, "File does not exist.")
+    status, response_headers, body = static_cache.respond(entry, request.environ, headers)
+    return HTTPResponse(body, status=status, headers=response_headers)
+
+# Optimized image variants written by build_images.py (originals are served without them)
+IMAGE_VARIANTS = build_images.load_manifest()
+
+def choose_image_variant(filepath):
+    """
+    Pick the smallest built variant of an image the client accepts (WebP only if the Accept
+    header allows it), at the width requested with ?w= if any. Returns None to serve the original.
+    """
+    entry = IMAGE_VARIANTS.get(filepath)
+    if entry is None:
+        return None
+    
+    accepts_webp = 'image/webp' in request.environ.get('HTTP_ACCEPT', '')
+    variants = [v for v in entry["variants"] if v["type"] == entry["type"] or (accepts_webp and v["type"] == 'image/webp')]
+    
+    # Requested width: the narrowest variant at least that wide
+    width = entry["width"]
+    try:
+        requested = int(request.query.get('w', ''))
+        width = min((v["width"] for v in variants if v["width"] >= requested), default=width)
+    except ValueError:
+        pass
+    
+    variants = [v for v in variants if v["width"] == width]
+    variant = min(variants, key=lambda v: v["bytes"], default=None)
+    if variant is None or (width == entry["width"] and variant["bytes"] >= entry["bytes"]):
+        return None
+    return variant
+
+@app.route('/static/<filepath:path>')
+def serve_static(filepath):
+    """Serve static files (favicon, images, built web app assets, etc.)"""
+    headers = {}
+    filename = os.path.basename(filepath)
+
+    if filepath.startswith('dist/') and build_assets.FINGERPRINT_PATTERN.match(filename):
+        # Content-hashed assets never change under the same name
+        headers['Cache-Control'] = 'public, max-age=31536000, immutable'  # 1 year
+        headers['Vary'] = 'Accept-Encoding'
+
+        # Serve the precompressed sidecar written by build_assets when possible
+        if client_accepts_gzip():
+            mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            if STATIC_FILES.get(filepath + '.gz', mimetype) is not None:
+                headers['Content-Encoding'] = 'gzip'
+                return send_static_file(filepath + '.gz', headers, mimetype)
     # Set aggressive caching for static assets
-    if filename.endswith(('.png', '.ico', '.svg', '.jpg', '.jpeg', '.gif', '.webp')):
-        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'  # 1 year
+    elif filename.endswith(('.png', '.ico', '.svg', '.jpg', '.jpeg', '.gif', '.webp')):
+        headers['Cache-Control'] = 'public, max-age=31536000, immutable'  # 1 year
+        
+        # Serve the best optimized variant for this client, negotiated on Accept
+        if filepath in IMAGE_VARIANTS:
+            headers['Vary'] = 'Accept'
+            variant = choose_image_variant(filepath)
+            if variant is not None:
+                return send_static_file(variant["file"], headers, variant["type"])
     elif filename.endswith(('.css', '.js')):
-        response.headers['Cache-Control'] = 'public, max-age=86400'  # 1 day
+        headers['Cache-Control'] = 'public, max-age=86400'  # 1 day
     else:
-        response.headers['Cache-Control'] = 'public, max-age=3600'  # 1 hour
+        headers['Cache-Control'] = 'public, max-age=3600'  # 1 hour
     
-    return static_file(filename, root='./static')
+    return send_static_file(filepath, headers)
 
 # Favicon routes for better subdomain compatibility
 @app.route('/favicon.ico')
 def favicon_ico():
     """Serve favicon.ico (many browsers still look for this)"""
-    response.headers['Cache-Control'] = 'public, max-age=86400'  # Cache for 1 day
-    return static_file('favicon.ico', root='./static')
+    return send_static_file('favicon.ico', {'Cache-Control': 'public, max-age=86400'})  # Cache for 1 day
 
 @app.route('/favicon.svg')
 def favicon_svg():
     """Serve SVG favicon directly"""
-    response.headers['Cache-Control'] = 'public, max-age=86400'  # Cache for 1 day
-    response.headers['Content-Type'] = 'image/svg+xml'
-    return static_file('favicon.svg', root='./static')
+    return send_static_file('favicon.svg', {'Cache-Control': 'public, max-age=86400'}, 'image/svg+xml')
 
 @app.route('/apple-touch-icon.png')
 @app.route('/apple-touch-icon-precomposed.png')
 def apple_touch_icon():
     """Serve Apple touch icon (largest size for optimal display)"""
-    response.headers['Cache-Control'] = 'public, max-age=86400'  # Cache for 1 day
-    response.headers['Content-Type'] = 'image/png'
-    return static_file('apple-180x180-touch-icon.png', root='./static')
+    return send_static_file('apple-180x180-touch-icon.png', {'Cache-Control': 'public, max-age=86400'}, 'image/png')
 
 @app.route('/apple-touch-icon-180x180.png')
 def apple_touch_icon_180():
     """Serve large Apple touch icon (for home screen)"""
-    response.headers['Cache-Control'] = 'public, max-age=86400'  # Cache for 1 day
-    response.headers['Content-Type'] = 'image/png'
-    return static_file('apple-180x180-touch-icon.png', root='./static')
+    return send_static_file('apple-180x180-touch-icon.png', {'Cache-Control': 'public, max-age=86400'}, 'image/png')
 
 @app.route('/site.webmanifest')
 def web_manifest():
     """Serve web manifest"""
-    response.headers['Cache-Control'] = 'public, max-age=86400'  # Cache for 1 day
-    response.headers['Content-Type'] = 'application/manifest+json'
-    return static_file('site.webmanifest', root='./static')
+    return send_static_file('site.webmanifest', {'Cache-Control': 'public, max-age=86400'}, 'application/manifest+json')
 
 # API Documentation endpoint (moved to /api route)
 @app.get('/api')
@@ -1152,7 +579,88 @@ def api_documentation():
                 <strong>Path Parameters:</strong><br>
                 • <code>word</code>: The word to analyze (max 50 characters, alphabetic only)<br><br>
                 <strong>Query Parameters:</strong><br>
-                • <code>allow_reversed_symbols</code> (optional): Set to "true" to allow both normal and reversed two-letter element symbols (He+eH, Li+iL, etc.)
+                • <code>allow_reversed_symbols</code> (optional): Set to "true" to allow both normal and reversed two-letter element symbols (He+eH, Li+iL, etc.)<br>
+                • <code>sample</code> (optional): Return this many uniformly random solutions (1-100) instead of all of them<br>
+                • <code>seed</code> (optional): Seed for reproducible samples (returned in meta when omitted)<br>
+                • <code>top</code> (optional): Return only the first N solutions (1-100), fewest elements first<br>
+                • <code>symbols</code> (optional): Comma-separated custom tiles to spell with instead of elements (e.g. cat,dog,c,at)<br>
+                • <code>max_atomic_number</code> (optional): Only use the first N elements (placeholders such as Uue past 118)<br>
+                • <code>exclude_symbols</code> (optional): Comma-separated symbols to leave out
+            </div>
+        </div>
+        
+        <div class="endpoint">
+            <p><span class="method">GET</span> <span class="url">/api/v1/words/{word}/stats</span></p>
+            <p>Score and element count ranges and histograms, and per-element usage, across all combinations for a word (without listing them)</p>
+            <div class="params">
+                <strong>Query Parameters:</strong><br>
+                • <code>allow_reversed_symbols</code> (optional): Set to "true" to allow reversed two-letter symbols<br>
+                • <code>symbols</code>, <code>max_atomic_number</code>, <code>exclude_symbols</code> (optional): Symbol set, as for word combinations
+            </div>
+        </div>
+        
+        <div class="endpoint">
+            <p><span class="method">GET</span> <span class="url">/api/v1/words/{word}/live</span></p>
+            <p>Solution count and best spellings of a word as it is typed; each call resumes from the previous prefix's cached state, so it is cheap to call on every keystroke</p>
+            <div class="params">
+                <strong>Query Parameters:</strong><br>
+                • <code>top</code> (optional): Number of best spellings to return (1-20, default 5)<br>
+                • <code>allow_reversed_symbols</code> (optional): Set to "true" to allow reversed two-letter symbols<br>
+                • <code>symbols</code>, <code>max_atomic_number</code>, <code>exclude_symbols</code> (optional): Symbol set, as for word combinations
+            </div>
+        </div>
+        
+        <div class="endpoint">
+            <p><span class="method">GET</span> <span class="url">/api/v1/words/{word}/image.png</span></p>
+            <p>Social card image (1200x630 PNG) showing a word's best spelling as element tiles, for link previews</p>
+            <div class="params">
+                <strong>Query Parameters:</strong><br>
+                • <code>allow_reversed_symbols</code> (optional): Set to "true" to allow reversed two-letter symbols<br>
+                • <code>symbols</code>, <code>max_atomic_number</code>, <code>exclude_symbols</code> (optional): Symbol set, as for word combinations
+            </div>
+        </div>
+        
+        <div class="endpoint">
+            <p><span class="method">POST</span> <span class="url">/api/v1/words/filter</span></p>
+            <p>Check which words in a large list are spellable and count their spellings (one word per line, or JSON <code>{"words": [...]}</code>)</p>
+            <div class="params">
+                <strong>Query Parameters:</strong><br>
+                • <code>allow_reversed_symbols</code> (optional): Set to "true" to allow reversed two-letter symbols<br>
+                • <code>only_spellable</code> (optional): Set to "true" to only return spellable words<br>
+                Words are checked by their letters only, case-insensitively (like the other endpoints), and can be at most 50 letters long
+            </div>
+        </div>
+        
+        <div class="endpoint">
+            <p><span class="method">GET</span> <span class="url">/api/v1/dictionary/words</span></p>
+            <p>Find dictionary words that can be spelled from a set of element tiles</p>
+            <div class="params">
+                <strong>Query Parameters:</strong><br>
+                • <code>elements</code>: Comma-separated element symbols, repeated for multiple tiles (e.g. H,O,Fe,Er,N)<br>
+                • <code>allow_reversed_symbols</code> (optional): Set to "true" to allow two-letter tiles to be used reversed<br>
+                • <code>limit</code> (optional): Maximum number of words to return (default 100, max 1000)<br>
+                Responds <code>503</code> with a <code>Retry-After</code> header while the dictionary index is still being built
+            </div>
+        </div>
+        
+        <div class="endpoint">
+            <p><span class="method">POST</span> <span class="url">/api/v1/text/analyze</span></p>
+            <p>Find every maximal spellable run in a (large) plain-text body, plus the longest run and the spellable fraction</p>
+            <div class="params">
+                <strong>Query Parameters:</strong><br>
+                • <code>allow_reversed_symbols</code> (optional): Set to "true" to allow reversed two-letter symbols<br>
+                • <code>min_length</code> (optional): Only list runs of at least this many letters
+            </div>
+        </div>
+        
+        <div class="endpoint">
+            <p><span class="method">POST</span> <span class="url">/api/v1/text/spell</span></p>
+            <p>Spell every word of a plain-text body, streamed back as newline-delimited JSON in document order</p>
+            <div class="params">
+                <strong>Query Parameters:</strong><br>
+                • <code>format</code> (optional): "ndjson" (one line per token, default) or "summary" (one line per distinct token)<br>
+                • <code>allow_reversed_symbols</code> (optional): Set to "true" to allow reversed two-letter symbols<br>
+                Tokens longer than 50 letters are reported as unspellable, with a null count and <code>"too_long": true</code>
             </div>
         </div>
         
@@ -1208,6 +716,15 @@ def api_documentation():
   }
 }</pre>
         
+        <h2>Rate Limits</h2>
+        <p>Requests are limited per issued API key (<code>X-API-Key</code>) or IP address; unknown keys are limited by IP address. Each request costs one unit, plus one per 64KB of body for uploads. Word lookups listing every solution are also charged one unit per 100 solutions once they are answered, which later requests wait off.
+        Over the limit, the API responds <code>429</code> with a <code>RATE_LIMITED</code> error and a <code>Retry-After</code> header.</p>
+        
+        <h2>Caching</h2>
+        <p>Word responses are served from one canonical URL per result: the word's letters in lowercase, with query parameters sorted by name.
+        Other spellings of it (<code>/api/v1/words/HeRo</code>, <code>/api/v1/words/he-ro</code>) are redirected there with a <code>301</code>.
+        Responses may be kept by shared caches for a year and by browsers for a day, and carry <code>Surrogate-Key</code> headers for purging.</p>
+        
         <p><a href="https://github.com/chriswilson1982/element-words">GitHub Repository</a></p>
         <p><a href="/">← Back to Element Words App</a></p>
     </body>
@@ -1221,11 +738,11 @@ def get_elements():
     set_json_headers()
     
     elements_data = []
-    for symbol, name in ELEMENTS.items():
+    for symbol, name in solver.ELEMENTS.items():
         elements_data.append({
             "symbol": symbol,
             "name": name,
-            "atomic_number": ELEMENT_SYMBOLS.index(symbol) + 1
+            "atomic_number": solver.ELEMENT_SYMBOLS.index(symbol) + 1
         })
     
     meta = {"total_count": len(elements_data)}
@@ -1243,18 +760,56 @@ def get_element(symbol):
         response.status = 400
         return create_error_response("MISSING_SYMBOL", "Element symbol is required")
     
-    if symbol not in ELEMENTS:
+    if symbol not in solver.ELEMENTS:
         response.status = 404
         return create_error_response("ELEMENT_NOT_FOUND", f"Element with symbol '{symbol}' not found")
     
     element_data = {
         "symbol": symbol,
-        "name": ELEMENTS[symbol],
-        "atomic_number": ELEMENT_SYMBOLS.index(symbol) + 1
+        "name": solver.ELEMENTS[symbol],
+        "atomic_number": solver.ELEMENT_SYMBOLS.index(symbol) + 1
     }
     
     return create_success_response(element_data)
 
+# Readiness thresholds: the instance reports itself saturated past any of them
+READY_MAX_IN_FLIGHT = int(os.environ.get('ELEMENT_WORDS_READY_MAX_IN_FLIGHT', 16))
+READY_MAX_QUEUED = int(os.environ.get('ELEMENT_WORDS_READY_MAX_QUEUED', 16))
+READY_MAX_P99_MS = float(os.environ.get('ELEMENT_WORDS_READY_MAX_P99_MS', 2000))
+READY_MAX_QUEUE_TIME_MS = float(os.environ.get('ELEMENT_WORDS_READY_MAX_QUEUE_TIME_MS', 1000))
+SELF_TEST_MAX_MS = float(os.environ.get('ELEMENT_WORDS_SELF_TEST_MAX_MS', 100))
+
+# Latency percentiles need a few samples before they can mark the instance saturated
+READY_MIN_SAMPLES = 20
+
+# Self-test: a small word whose solutions are known (reversed symbols exercise every code path)
+SELF_TEST_WORD = 'bacon'
+SELF_TEST_SOLUTIONS = 7
+
+# Deploy-time cache warm-up progress (None when no warm-up was started)
+WARMUP = None
+
+def run_self_test():
+    """
+    Solve and serialize the self-test word bypassing the solver's caches: its lattice is rebuilt
+    (not looked up) and its solutions enumerated from it. Returns (passed, milliseconds).
+    """
+    started = time.perf_counter()
+    symbol_set = solver.DEFAULT_SYMBOL_SETS[True]
+    lattice, counts = solver.build_counted_lattice.__wrapped__(SELF_TEST_WORD, symbol_set)
+    solutions = packed_solutions.SolutionList(solver.get_token_table(symbol_set))
+    for path in solver.iter_lattice_paths(lattice, counts):
+        solutions.append(path)
+    solutions.sort_by_length()
+    serialized = json.loads(solutions.to_json())
+    elapsed = (time.perf_counter() - started) * 1000
+    passed = counts[0] == len(solutions) == len(serialized) == SELF_TEST_SOLUTIONS
+    return passed, elapsed
+
+def milliseconds(seconds):
+    """A duration in seconds as milliseconds for the probe's report (None stays None)"""
+    return None if seconds is None else round(seconds * 1000, 2)
+
 # Health check endpoint
 @app.get('/api/v1/health')
 def health_check():
@@ -1268,7 +823,212 @@ def health_check():
     
     return create_success_response(health_data)
 
+@app.get('/api/v1/ready')
+def readiness_check():
+    """
+    Readiness probe: runs a timed solver self-test and reports this instance's load.
+    Returns 503 when it is saturated, so load balancers route new requests elsewhere.
+    """
+    set_json_headers()
+    response.headers['Cache-Control'] = 'no-store'
+    
+    passed, self_test_ms = run_self_test()
+    in_flight = LOAD_MONITOR.in_flight
+    # Requests waiting on a solve already running for another request, and card renders not yet done
+    queued = WORD_LOOKUPS.waiting + (OG_IMAGE_RENDERER.pending if OG_IMAGE_RENDERER is not None else 0)
+    recent_requests = LOAD_MONITOR.recent_count()
+    p99 = LOAD_MONITOR.latency_percentile(99)
+    queue_time_p99 = LOAD_MONITOR.queue_time_percentile(99)
+    
+    reasons = []
+    if not passed:
+        reasons.append("self_test_failed")
+    elif self_test_ms > SELF_TEST_MAX_MS:
+        reasons.append("self_test_slow")
+    if in_flight >= READY_MAX_IN_FLIGHT:
+        reasons.append("too_many_in_flight")
+    if queued >= READY_MAX_QUEUED:
+        reasons.append("queue_full")
+    if WARMUP is not None and WARMUP.running:
+        reasons.append("warming_up")
+    if recent_requests >= READY_MIN_SAMPLES:
+        if p99 * 1000 > READY_MAX_P99_MS:
+            reasons.append("slow_responses")
+        if queue_time_p99 is not None and queue_time_p99 * 1000 > READY_MAX_QUEUE_TIME_MS:
+            reasons.append("slow_queue")
+    
+    ready_data = {
+        "status": "saturated" if reasons else "ready",
+        "reasons": reasons,
+        "self_test": {
+            "passed": passed,
+            "duration_ms": round(self_test_ms, 2)
+        },
+        "in_flight": in_flight,
+        "queue_depth": queued,
+        "recent_requests": recent_requests,
+        "p99_latency_ms": milliseconds(p99),
+        "p99_queue_time_ms": milliseconds(queue_time_p99)
+    }
+    if WARMUP is not None:
+        ready_data["warmup"] = WARMUP.as_dict()
+    
+    if reasons:
+        response.status = 503
+        response.headers['Retry-After'] = '5'
+    return create_success_response(ready_data)
+
 # Find word combinations
+def get_request_symbol_set(reverse_symbols=False):
+    """
+    Get the symbol set selected or defined by the request's query parameters.
+    Raises ValueError (with a message for the client) if the parameters are invalid.
+    """
+    return build_request_symbol_set(
+        request.query.get('symbols', ''),
+        request.query.get('max_atomic_number', ''),
+        request.query.get('exclude_symbols', ''),
+        reverse_symbols
+    )
+
+@functools.lru_cache(maxsize=SYMBOL_SET_CACHE_SIZE)
+def build_request_symbol_set(symbols, max_atomic_number, exclude_symbols, reverse_symbols=False):
+    """
+    Build a symbol set from request parameters (all strings, empty when not given):
+      - symbols: comma-separated custom tiles replacing the elements (numbered in the given order)
+      - max_atomic_number: only the first N elements, with systematic placeholders past the known ones
+      - exclude_symbols: comma-separated symbols to leave out (case-insensitive)
+    """
+    if not (symbols or max_atomic_number or exclude_symbols):
+        return solver.DEFAULT_SYMBOL_SETS[reverse_symbols]
+    
+    if symbols:
+        if max_atomic_number:
+            raise ValueError("symbols and max_atomic_number can't be combined")
+        tiles = list(dict.fromkeys(tile.strip() for tile in symbols.split(',') if tile.strip()))
+        if len(tiles) > MAX_SYMBOL_SET_SIZE:
+            raise ValueError(f"A symbol set can have at most {MAX_SYMBOL_SET_SIZE} symbols")
+        invalid = [tile for tile in tiles if not tile.isalpha() or len(tile) > MAX_SYMBOL_LENGTH]
+        if not tiles or invalid:
+            raise ValueError(f"Symbols must be 1-{MAX_SYMBOL_LENGTH} letters, separated by commas")
+        entries = [(tile, tile, number) for number, tile in enumerate(tiles, 1)]
+    else:
+        try:
+            limit = int(max_atomic_number) if max_atomic_number else len(solver.ELEMENT_SYMBOLS)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_ATOMIC_NUMBER:
+            raise ValueError(f"max_atomic_number must be an integer between 1 and {MAX_ATOMIC_NUMBER}")
+        entries = solver.element_entries(limit)
+    
+    excluded = {symbol.strip().lower() for symbol in exclude_symbols.split(',') if symbol.strip()}
+    unknown = excluded - {symbol.lower() for symbol, _, _ in entries}
+    if unknown:
+        raise ValueError(f"Unknown symbols to exclude: {', '.join(sorted(unknown))}")
+    entries = [entry for entry in entries if entry[0].lower() not in excluded]
+    
+    return symbol_sets.compile_symbol_set(entries, reverse_symbols)
+
+def compute_word_data(word, reverse_symbols=False, symbol_set=None):
+    """
+    Solve a normalized word. Its solutions are packed token indexes (a SolutionList), formatted
+    for the API only when serialized (see word_data_json)
+    """
+    symbol_set = solver.resolve_symbol_set(reverse_symbols, symbol_set)
+    
+    with request_timing.phase('solve'):
+        solutions = solver.pack_solutions(word.lower(), symbol_set=symbol_set)
+    
+    # Sort by number of elements used (fewer elements first)
+    with request_timing.phase('sort'):
+        solutions.sort_by_length()
+    
+    return {
+        "input_word": word.lower(),
+        "solutions": solutions
+    }
+
+def word_data_json(word_data):
+    """Serialize computed word data, as json.dumps would with the solutions as dicts"""
+    return ('{"input_word": ' + json.dumps(word_data["input_word"])
+            + ', "solutions": ' + word_data["solutions"].to_json() + '}')
+
+# Result caching: per-process memory first, then the shared on-disk store (if configured)
+WORD_RESULT_CACHE = result_store.LRUCache(WORD_RESULT_CACHE_SIZE)
+RESULT_STORE = result_store.open_result_store()
+
+# Concurrent misses for the same word share one computation (across workers when the store is shared)
+WORD_LOOKUPS = result_store.SingleFlight()
+HOST_LOCKS = result_store.open_host_locks()
+
+def get_word_json(word, reverse_symbols=False, symbol_set=None, store=None):
+    """
+    Get the serialized result for a normalized word from the caches, solving it on a miss
+    (store: the result store to use instead of the configured one)
+    """
+    symbol_set = solver.resolve_symbol_set(reverse_symbols, symbol_set)
+    custom_digest = None if symbol_set == solver.DEFAULT_SYMBOL_SETS[reverse_symbols] else symbol_set.digest
+    key = result_store.result_key(word, reverse_symbols, custom_digest)
+    word_json = WORD_RESULT_CACHE.get(key)
+    if word_json is not None:
+        request_timing.annotate(cache="memory")
+        return word_json
+    return WORD_LOOKUPS.do(key, lambda: load_word_json(key, word, symbol_set, store))
+
+def solve_word_json(word, symbol_set):
+    """Solve a normalized word and serialize its result"""
+    word_data = compute_word_data(word.lower(), symbol_set=symbol_set)
+    with request_timing.phase('serialize'):
+        return word_data_json(word_data)
+
+def load_word_json(key, word, symbol_set, store=None):
+    """Load a word's serialized result from the store, or solve and cache it (once per host)"""
+    store = RESULT_STORE if store is None else store
+    if solver.count_solutions(word.lower(), symbol_set=symbol_set) > MAX_CACHED_SOLUTIONS:
+        # Too big to store, so there's nothing for other workers to share: solve without the host lock
+        request_timing.annotate(cache="miss")
+        return solve_word_json(word, symbol_set)
+    
+    with HOST_LOCKS.hold(key) if HOST_LOCKS is not None else contextlib.nullcontext():
+        # Another worker may have stored the result while we waited for the lock
+        word_json = None
+        if store is not None:
+            try:
+                with request_timing.phase('store'):
+                    word_json = store.get_serialized(key)
+            except sqlite3.Error:
+                # The store is an optimization; fall back to solving
+                word_json = None
+        
+        if word_json is None:
+            request_timing.annotate(cache="miss")
+            word_json = solve_word_json(word, symbol_set)
+            if store is not None:
+                try:
+                    with request_timing.phase('store'):
+                        store.put_serialized(key, word_json)
+                except sqlite3.Error:
+                    pass
+        else:
+            request_timing.annotate(cache="store")
+    
+    WORD_RESULT_CACHE.put(key, word_json)
+    return word_json
+
+def warm_word_result(word, reverse_symbols=False, store=None):
+    """
+    Load a word's result into the caches as a lookup would: this process's memory cache and the
+    result store (store, or the configured one). Returns False if the word is invalid or too big
+    to cache.
+    """
+    clean_word = solver.normalize_word(word)
+    if not clean_word or len(clean_word) > MAX_WORD_LENGTH:
+        return False
+    if solver.count_solutions(clean_word, reverse_symbols=reverse_symbols) > MAX_CACHED_SOLUTIONS:
+        return False
+    get_word_json(clean_word, reverse_symbols, store=store)
+    return True
+
 @app.get('/api/v1/words/<word>')
 def get_word_combinations(word):
     """Find all possible element combinations for a word"""
@@ -1283,7 +1043,8 @@ def get_word_combinations(word):
     reverse_symbols = request.query.get('allow_reversed_symbols', '').lower() == 'true'
     
     # Sanitize input: remove non-alphabetic characters
-    clean_word = ''.join(c for c in word if c.isalpha())
+    with request_timing.phase('sanitize'):
+        clean_word = ''.join(c for c in word if c.isalpha())
     if not clean_word:
         response.status = 400
         return create_error_response("INVALID_WORD", "Word must contain at least one alphabetic character")
@@ -1294,116 +1055,795 @@ def get_word_combinations(word):
         return create_error_response("WORD_TOO_LONG", f"Word length exceeds maximum limit of {MAX_WORD_LENGTH} characters")
     
     try:
-        combinations = find_combinations(clean_word, reverse_symbols=reverse_symbols)
-        
-        # Format solutions
-        solutions = []
-        for text_repr, symbols_tuple in combinations:
-            # Map symbols back to original (non-reversed) symbols for element data
-            # and track which symbols were reversed
-            elements_data = []
-            for symbol in symbols_tuple:
-                is_reversed = False
-                if reverse_symbols and len(symbol) == 2:
-                    # Check if this symbol is a reversed version
-                    original_symbol = symbol[::-1] if symbol[::-1] in ELEMENTS else symbol
-                    is_reversed = (symbol[::-1] in ELEMENTS and symbol[::-1] != symbol)
-                else:
-                    original_symbol = symbol
-                
-                elements_data.append({
-                    "symbol": original_symbol,
-                    "name": ELEMENTS[original_symbol],
-                    "atomic_number": ELEMENT_SYMBOLS.index(original_symbol) + 1,
-                    "reversed": is_reversed
-                })
-            
-            # Calculate score for this solution
-            score = calculate_solution_score(elements_data)
-            
-            solution = {
-                "representation": text_repr,
-                "symbols": list(symbols_tuple),
-                "elements": elements_data,
-                "score": score
-            }
-            solutions.append(solution)
+        symbol_set = get_request_symbol_set(reverse_symbols)
+    except ValueError as e:
+        response.status = 400
+        return create_error_response("INVALID_SYMBOL_SET", str(e))
+    
+    meta = {}
+    if reverse_symbols:
+        meta["allow_reversed_symbols"] = True
+    if symbol_set != solver.DEFAULT_SYMBOL_SETS[reverse_symbols]:
+        meta["symbol_set"] = symbol_set.digest
+    
+    # Only the first solutions of the full (sorted) list
+    if 'top' in request.query:
+        try:
+            top_size = int(request.query.get('top'))
+        except ValueError:
+            top_size = 0
+        if not 1 <= top_size <= MAX_TOP_SOLUTIONS:
+            response.status = 400
+            return create_error_response("INVALID_TOP", f"top must be an integer between 1 and {MAX_TOP_SOLUTIONS}")
+        if 'sample' in request.query:
+            response.status = 400
+            return create_error_response("INVALID_TOP", "top and sample can't be combined")
         
-        # Sort by number of elements used (fewer elements first)
-        solutions.sort(key=lambda x: len(x['symbols']))
+        with request_timing.phase('solve'):
+            solution_count, solutions = solver.top_solutions(clean_word.lower(), top_size, symbol_set=symbol_set)
+        request_timing.annotate(solutions=solution_count)
+        meta["top"] = top_size
+        set_word_cache_headers(clean_word.lower(), symbol_set)
+        return create_success_response({
+            "input_word": clean_word.lower(),
+            "solution_count": solution_count,
+            "solutions": solutions
+        }, meta)
+    
+    # Random sample of solutions instead of the full list
+    if 'sample' in request.query:
+        try:
+            sample_size = int(request.query.get('sample'))
+        except ValueError:
+            sample_size = 0
+        if not 1 <= sample_size <= MAX_WORD_SAMPLES:
+            response.status = 400
+            return create_error_response("INVALID_SAMPLE", f"sample must be an integer between 1 and {MAX_WORD_SAMPLES}")
         
-        meta = {}
-        if reverse_symbols:
-            meta["allow_reversed_symbols"] = True
+        # Without a seed, pick one and report it so the sample can be reproduced
+        seed = request.query.get('seed')
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+            # Each unseeded request gets a different sample
+            response.headers['Cache-Control'] = 'no-store'
+        else:
+            if seed.isdigit():
+                seed = int(seed)
+            set_word_cache_headers(clean_word.lower(), symbol_set)
         
-        word_data = {
+        with request_timing.phase('solve'):
+            solution_count, solutions = solver.sample_solutions(clean_word.lower(), sample_size, seed, symbol_set=symbol_set)
+        request_timing.annotate(solutions=solution_count)
+        meta.update({"sample": sample_size, "seed": seed})
+        return create_success_response({
             "input_word": clean_word.lower(),
+            "solution_count": solution_count,
             "solutions": solutions
-        }
+        }, meta)
+    
+    try:
+        word_json = get_word_json(clean_word, reverse_symbols, symbol_set)
         
-        return create_success_response(word_data, meta)
+        # Clients holding this result revalidate it without downloading it again
+        etag = result_etag(word_json)
+        set_word_cache_headers(clean_word.lower(), symbol_set)
+        response.headers['ETag'] = etag
+        if etag_matches(etag):
+            response.status = 304
+            return ""
+        
+        # Cached results aren't parsed, so their solutions are counted in the JSON
+        solution_count = word_json.count('"representation": ')
+        request_timing.annotate(solutions=solution_count)
+        charge_solutions(solution_count)
+        
+        # Splice the shared serialized result into this request's envelope
+        with request_timing.phase('serialize'):
+            meta_json = json.dumps(create_success_response(None, meta)["meta"])
+            body = '{"data": ' + word_json + ', "meta": ' + meta_json + '}'
+        return body
         
     except Exception as e:
         response.status = 500
         return create_error_response("PROCESSING_ERROR", "Error processing word combinations")
 
-def find_combinations(word, path="", symbols=None, reverse_symbols=False):
-    """
-    Recursive function to find valid combinations of symbols forming the word.
-    Returns a list of tuples, where each tuple contains:
-      - A string representation of the solution.
-      - A tuple of element symbols used to form the solution.
-    """
-    if symbols is None:
-        symbols = []
+@app.get('/api/v1/words/<word>/stats')
+def get_word_stats(word):
+    """Statistics over all element combinations for a word"""
+    set_json_headers()
+    
+    reverse_symbols = request.query.get('allow_reversed_symbols', '').lower() == 'true'
     
-    if not word:  # Base case: if the word is empty, return the path and symbols
-        return [(path, tuple(symbols))]
+    clean_word = ''.join(c for c in word if c.isalpha())
+    if not clean_word:
+        response.status = 400
+        return create_error_response("INVALID_WORD", "Word must contain at least one alphabetic character")
+    
+    if len(clean_word) > MAX_WORD_LENGTH:
+        response.status = 400
+        return create_error_response("WORD_TOO_LONG", f"Word length exceeds maximum limit of {MAX_WORD_LENGTH} characters")
+    
+    try:
+        symbol_set = get_request_symbol_set(reverse_symbols)
+    except ValueError as e:
+        response.status = 400
+        return create_error_response("INVALID_SYMBOL_SET", str(e))
+    
+    meta = {}
+    if reverse_symbols:
+        meta["allow_reversed_symbols"] = True
+    if symbol_set != solver.DEFAULT_SYMBOL_SETS[reverse_symbols]:
+        meta["symbol_set"] = symbol_set.digest
+    
+    with request_timing.phase('solve'):
+        stats = solver.compute_word_stats(clean_word.lower(), symbol_set=symbol_set)
+    request_timing.annotate(solutions=stats["solution_count"])
+    set_word_cache_headers(clean_word.lower(), symbol_set)
+    return create_success_response(stats, meta)
+
+# As-you-type lookups: each keystroke resumes from the cached state of the previous prefix
+PREFIX_STATES = incremental.PrefixCache()
 
-    results = []
-    seen = set()  # Track unique combinations to avoid duplicates
+@app.get('/api/v1/words/<word>/live')
+def get_live_word(word):
+    """Solution count and best spellings of a word being typed (cheap to call on every keystroke)"""
+    set_json_headers()
     
-    # Get the appropriate symbol set (normal or reversed)
-    available_symbols = get_available_symbols(reverse_symbols)
+    reverse_symbols = request.query.get('allow_reversed_symbols', '').lower() == 'true'
     
-    # Try 1 or 2 character substrings of the word
-    for i in range(1, min(3, len(word) + 1)):
-        # Get the next 1 or 2 letters
-        substring = word[:i]
-        
-        # For reversed symbols, we need to try different cases to match symbols like "eH"
-        if reverse_symbols:
-            # Try all possible case variations for the substring
-            case_variations = [
-                substring,  # as-is: "eh"
-                substring.capitalize(),  # capitalize: "Eh" 
-                substring.upper(),  # upper: "EH"
-            ]
-            
-            # For 2-letter substrings, also try with second letter capitalized
-            if len(substring) == 2:
-                case_variations.append(substring[0].lower() + substring[1].upper())  # "eH"
-            
-            for variation in case_variations:
-                if variation in available_symbols:
-                    sub_results = find_combinations(
-                        word[i:], path + variation, symbols + [variation], reverse_symbols)
-                    for result in sub_results:
-                        if result not in seen:
-                            seen.add(result)
-                            results.append(result)
-        else:
-            # Standard behavior: capitalize the prefix
-            prefix = substring.capitalize()
-            if prefix in available_symbols:
-                sub_results = find_combinations(
-                    word[i:], path + prefix, symbols + [prefix], reverse_symbols)
-                for result in sub_results:
-                    if result not in seen:
-                        seen.add(result)
-                        results.append(result)
-
-    return results
+    clean_word = ''.join(c for c in word if c.isalpha()).lower()
+    if not clean_word:
+        response.status = 400
+        return create_error_response("INVALID_WORD", "Word must contain at least one alphabetic character")
+    
+    if len(clean_word) > MAX_WORD_LENGTH:
+        response.status = 400
+        return create_error_response("WORD_TOO_LONG", f"Word length exceeds maximum limit of {MAX_WORD_LENGTH} characters")
+    
+    try:
+        top_size = int(request.query.get('top', DEFAULT_LIVE_SOLUTIONS))
+    except ValueError:
+        top_size = 0
+    if not 1 <= top_size <= MAX_LIVE_SOLUTIONS:
+        response.status = 400
+        return create_error_response("INVALID_TOP", f"top must be an integer between 1 and {MAX_LIVE_SOLUTIONS}")
+    
+    try:
+        symbol_set = get_request_symbol_set(reverse_symbols)
+    except ValueError as e:
+        response.status = 400
+        return create_error_response("INVALID_SYMBOL_SET", str(e))
+    
+    with request_timing.phase('solve'):
+        state, resumed_length = incremental.resume_state(PREFIX_STATES, clean_word, symbol_set, top_size)
+    request_timing.annotate(solutions=state.count)
+    
+    meta = {"top": top_size, "resumed_length": resumed_length}
+    if reverse_symbols:
+        meta["allow_reversed_symbols"] = True
+    if symbol_set != solver.DEFAULT_SYMBOL_SETS[reverse_symbols]:
+        meta["symbol_set"] = symbol_set.digest
+    
+    set_word_cache_headers(clean_word, symbol_set)
+    return create_success_response({
+        "input_word": clean_word,
+        "solution_count": state.count,
+        "solutions": [solver.format_solution(''.join(tokens), tokens, symbol_set) for _, _, tokens in state.best]
+    }, meta)
+
+# Social card images (Open Graph) for a word's best spelling, rendered with Pillow when available
+OG_IMAGE_RENDERER = og_images.open_card_renderer()
+
+# A word's card only changes with the card design (RENDER_VERSION is part of its ETag)
+OG_IMAGE_CACHE_CONTROL = 'public, max-age=2592000, stale-while-revalidate=86400'
+
+@app.get('/api/v1/words/<word>/image.png')
+def get_word_image(word):
+    """Social card image (1200x630 PNG) showing a word's best element spelling"""
+    set_json_headers()
+    
+    if OG_IMAGE_RENDERER is None:
+        response.status = 503
+        return create_error_response("FEATURE_UNAVAILABLE", "Word images require Pillow, which is not installed")
+    
+    reverse_symbols = request.query.get('allow_reversed_symbols', '').lower() == 'true'
+    
+    clean_word = ''.join(c for c in word if c.isalpha()).lower()
+    if not clean_word:
+        response.status = 400
+        return create_error_response("INVALID_WORD", "Word must contain at least one alphabetic character")
+    
+    if len(clean_word) > MAX_WORD_LENGTH:
+        response.status = 400
+        return create_error_response("WORD_TOO_LONG", f"Word length exceeds maximum limit of {MAX_WORD_LENGTH} characters")
+    
+    try:
+        symbol_set = get_request_symbol_set(reverse_symbols)
+    except ValueError as e:
+        response.status = 400
+        return create_error_response("INVALID_SYMBOL_SET", str(e))
+    
+    custom_digest = None if symbol_set == solver.DEFAULT_SYMBOL_SETS[reverse_symbols] else symbol_set.digest
+    key = result_store.result_key(clean_word, reverse_symbols, custom_digest) + f"|og={og_images.RENDER_VERSION}"
+    etag = '"' + og_images.card_digest(key) + '"'
+    
+    if etag_matches(etag):
+        set_word_cache_headers(clean_word, symbol_set, OG_IMAGE_CACHE_CONTROL, ('images',))
+        response.headers['ETag'] = etag
+        response.status = 304
+        return ""
+    
+    def render():
+        _, solutions = solver.top_solutions(clean_word, 1, symbol_set=symbol_set)
+        return og_images.render_card(clean_word, solutions[0]["elements"] if solutions else None)
+    
+    try:
+        image = OG_IMAGE_RENDERER.get(key, render)
+    except og_images.RenderBusy as e:
+        response.status = 503
+        response.headers['Retry-After'] = '1'
+        response.headers['Cache-Control'] = 'no-store'
+        return create_error_response("RENDER_BUSY", str(e))
+    
+    response.content_type = 'image/png'
+    set_word_cache_headers(clean_word, symbol_set, OG_IMAGE_CACHE_CONTROL, ('images',))
+    response.headers['ETag'] = etag
+    return image
+
+# Batch spellability filter (vectorized with NumPy when available)
+WORD_FILTER_TABLES = {
+    reverse_symbols: word_filter.build_lookup_tables({letters: len(matches) for letters, matches in lookup.items()})
+    for reverse_symbols, lookup in SYMBOL_LOOKUP.items()
+} if word_filter.np is not None else None
+
+@app.post('/api/v1/words/filter')
+def filter_word_list():
+    """Check which words in a large list are spellable, and count their spellings"""
+    set_json_headers()
+
+    if WORD_FILTER_TABLES is None:
+        response.status = 503
+        return create_error_response("FEATURE_UNAVAILABLE", "Batch filtering requires NumPy, which is not installed")
+
+    if request.content_length > MAX_TEXT_BYTES:
+        response.status = 413
+        return create_error_response("TEXT_TOO_LARGE", f"Word list exceeds maximum size of {MAX_TEXT_BYTES} bytes")
+
+    # Read the body here rather than through request.json, which rejects (with an HTML error page)
+    # anything over Bottle's MEMFILE_MAX; chunked bodies have no length to check up front
+    body = request.body.read(MAX_TEXT_BYTES + 1)
+    if len(body) > MAX_TEXT_BYTES:
+        response.status = 413
+        return create_error_response("TEXT_TOO_LARGE", f"Word list exceeds maximum size of {MAX_TEXT_BYTES} bytes")
+
+    # Accept a JSON {"words": [...]} body or plain text with one word per line
+    if request.content_type.startswith('application/json'):
+        try:
+            data = json.loads(body.decode('utf-8'))
+        except ValueError:
+            data = None
+        words = data.get('words') if isinstance(data, dict) else None
+        if not isinstance(words, list) or not all(isinstance(word, str) for word in words):
+            response.status = 400
+            return create_error_response("INVALID_WORD_LIST", "Body must be a JSON object with a 'words' array of strings")
+    else:
+        words = [line.strip() for line in body.decode('utf-8', errors='replace').splitlines()]
+        words = [word for word in words if word]
+
+    # Words are solved as every other endpoint solves them: their letters only, in lowercase
+    # (so he-ro is hero). The response still lists them as sent.
+    letters = [solver.normalize_word(word) for word in words]
+
+    # Spelling counts grow exponentially with length, past what JSON (or the client) can take
+    too_long = [word for word, word_letters in zip(words, letters) if len(word_letters) > MAX_WORD_LENGTH]
+    if too_long:
+        response.status = 400
+        return create_error_response(
+            "WORD_TOO_LONG",
+            f"Word length exceeds maximum limit of {MAX_WORD_LENGTH} characters",
+            {"words": too_long[:10], "count": len(too_long)}
+        )
+
+    reverse_symbols = request.query.get('allow_reversed_symbols', '').lower() == 'true'
+    only_spellable = request.query.get('only_spellable', '').lower() == 'true'
+
+    spellable, counts = word_filter.filter_words(letters, WORD_FILTER_TABLES[reverse_symbols])
+
+    meta = {
+        "total_count": len(words),
+        "spellable_count": int(spellable.sum())
+    }
+    if reverse_symbols:
+        meta["allow_reversed_symbols"] = True
+
+    if only_spellable:
+        data = {
+            "words": [word for word, is_spellable in zip(words, spellable.tolist()) if is_spellable],
+            "counts": counts[spellable].tolist()
+        }
+    else:
+        data = {
+            "words": words,
+            "spellable": spellable.tolist(),
+            "counts": counts.tolist()
+        }
+
+    return create_success_response(data, meta)
+
+# Dictionary reverse lookup (element tiles -> words)
+def find_element_signatures(word, reverse_symbols=False):
+    """
+    Find every distinct multiset of elements that can spell a word.
+    Returns a list of signatures, each a tuple of (element symbol, count) pairs.
+    An empty list means the word cannot be spelled.
+    """
+    lookup = SYMBOL_LOOKUP[reverse_symbols]
+    word = word.lower()
+    # states[i] holds the sorted element tuples that spell word[:i]
+    states = [set() for _ in range(len(word) + 1)]
+    states[0].add(())
+    for i in range(len(word)):
+        if not states[i]:
+            continue
+        for length in (1, 2):
+            if i + length > len(word):
+                break
+            for _, element_symbol, _ in lookup.get(word[i:i + length], ()):
+                for signature in states[i]:
+                    states[i + length].add(tuple(sorted(signature + (element_symbol,))))
+        states[i] = None
+
+    # All spellings cover the same letters, so no signature can contain another
+    return [tuple(Counter(signature).items()) for signature in states[-1]]
+
+def element_mask(symbols):
+    """Bitmask of the distinct elements in a collection of element symbols"""
+    mask = 0
+    for symbol in symbols:
+        mask |= ELEMENT_BITS[symbol]
+    return mask
+
+def tile_letter_mask(letters):
+    """Bitmask of the distinct letters (a-z) in a string"""
+    mask = 0
+    for c in letters:
+        mask |= 1 << (ord(c) - 97)
+    return mask
+
+def load_dictionary(path):
+    """Load a word list (one word per line), keeping lowercase alphabetic words once each"""
+    words = set()
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            word = line.strip().lower()
+            if word and word.isascii() and word.isalpha() and len(word) <= MAX_WORD_LENGTH:
+                words.add(word)
+    return sorted(words)
+
+def build_dictionary_index(words, reverse_symbols=False):
+    """
+    Precompute a reverse lookup index over a word list.
+    Spellable words are bucketed by the set of letters they use, so a query only
+    visits buckets whose letters the tiles can supply. Each entry keeps the word's
+    element signatures for the final multiset check.
+    """
+    buckets = {}
+    for word in words:
+        signatures = find_element_signatures(word, reverse_symbols)
+        if signatures:
+            # Most signatures use each element once, so a mask test settles them;
+            # only repeated elements need their counts checked
+            checks = tuple(
+                (element_mask(symbol for symbol, _ in signature),
+                 tuple((symbol, count) for symbol, count in signature if count > 1))
+                for signature in signatures
+            )
+            buckets.setdefault(tile_letter_mask(word), []).append((len(word), word, checks))
+
+    # Shortest words first, so scanning a bucket can stop once words get too long
+    for entries in buckets.values():
+        entries.sort()
+
+    return {
+        "buckets": buckets,
+        "word_count": len(words),
+        "indexed_count": sum(len(entries) for entries in buckets.values())
+    }
+
+def search_dictionary_index(index, tiles):
+    """
+    Find dictionary words spellable from a multiset of element tiles.
+    Each tile can be used at most once. Returns matching words, longest first.
+    """
+    tile_counts = Counter(tiles)
+    letters = ''.join(symbol.lower() * count for symbol, count in tile_counts.items())
+    letter_mask = tile_letter_mask(letters)
+    buckets = index["buckets"]
+
+    # Enumerate submasks of the tile letters when that is cheaper than scanning every bucket
+    if (1 << bin(letter_mask).count('1')) <= len(buckets):
+        candidate_buckets = []
+        submask = letter_mask
+        while submask:
+            if submask in buckets:
+                candidate_buckets.append(buckets[submask])
+            submask = (submask - 1) & letter_mask
+    else:
+        candidate_buckets = [entries for mask, entries in buckets.items() if mask & ~letter_mask == 0]
+
+    tiles_mask = element_mask(tile_counts)
+    matches = []
+    for entries in candidate_buckets:
+        for length, word, checks in entries:
+            if length > len(letters):
+                break
+            for signature_mask, repeated in checks:
+                if signature_mask & ~tiles_mask == 0 and all(tile_counts[symbol] >= count for symbol, count in repeated):
+                    matches.append(word)
+                    break
+
+    matches.sort(key=lambda word: (-len(word), word))
+    return matches
+
+# Reverse lookup indexes, built once per symbol mode on a background thread (the default one at startup)
+DICTIONARY_INDEXES = {}
+DICTIONARY_BUILDS = set()
+DICTIONARY_LOCK = threading.Lock()
+
+def start_dictionary_index_build(reverse_symbols=False):
+    """Start building a symbol mode's reverse lookup index in the background, unless it is built or being built"""
+    with DICTIONARY_LOCK:
+        if reverse_symbols in DICTIONARY_INDEXES or reverse_symbols in DICTIONARY_BUILDS:
+            return
+        DICTIONARY_BUILDS.add(reverse_symbols)
+    threading.Thread(target=build_configured_dictionary_index, args=(reverse_symbols,), daemon=True).start()
+
+def build_configured_dictionary_index(reverse_symbols):
+    """Build a symbol mode's reverse lookup index from the configured dictionary"""
+    try:
+        DICTIONARY_INDEXES[reverse_symbols] = build_dictionary_index(load_dictionary(DICTIONARY_PATH), reverse_symbols)
+    except OSError:
+        # The next request for this mode starts the build again
+        pass
+    finally:
+        with DICTIONARY_LOCK:
+            DICTIONARY_BUILDS.discard(reverse_symbols)
+
+@app.get('/api/v1/dictionary/words')
+def get_dictionary_words():
+    """Find dictionary words that can be spelled from a set of element tiles"""
+    set_json_headers()
+
+    tiles = [tile.strip().capitalize() for tile in request.query.get('elements', '').split(',') if tile.strip()]
+    if not tiles:
+        response.status = 400
+        return create_error_response("MISSING_ELEMENTS", "At least one element symbol is required")
+
+    if len(tiles) > MAX_TILES:
+        response.status = 400
+        return create_error_response("TOO_MANY_ELEMENTS", f"Number of elements exceeds maximum limit of {MAX_TILES}")
+
+    unknown = sorted(set(tile for tile in tiles if tile not in solver.ELEMENTS))
+    if unknown:
+        response.status = 400
+        return create_error_response("INVALID_ELEMENTS", "Unknown element symbols", {"symbols": unknown})
+
+    try:
+        limit = int(request.query.get('limit', DEFAULT_DICTIONARY_RESULTS))
+    except ValueError:
+        limit = DEFAULT_DICTIONARY_RESULTS
+    limit = max(1, min(limit, MAX_DICTIONARY_RESULTS))
+
+    reverse_symbols = request.query.get('allow_reversed_symbols', '').lower() == 'true'
+
+    index = DICTIONARY_INDEXES.get(reverse_symbols)
+    if index is None:
+        response.status = 503
+        if not os.path.isfile(DICTIONARY_PATH):
+            return create_error_response("DICTIONARY_UNAVAILABLE", "Dictionary word list is not available")
+        # Never hold a request (or lookups in the other mode) for a whole build
+        start_dictionary_index_build(reverse_symbols)
+        response.headers['Retry-After'] = '5'
+        return create_error_response("DICTIONARY_LOADING", "Dictionary index is still being built")
+
+    matches = search_dictionary_index(index, tiles)
+
+    meta = {
+        "total_count": len(matches),
+        "dictionary_size": index["word_count"]
+    }
+    if reverse_symbols:
+        meta["allow_reversed_symbols"] = True
+
+    data = {
+        "elements": tiles,
+        "words": matches[:limit]
+    }
+
+    return create_success_response(data, meta)
+
+# Text analysis (spellable runs in arbitrary text)
+def iter_request_text(max_bytes):
+    """Read the request body as decoded text chunks without buffering it all"""
+    stream = request.environ['wsgi.input']
+    remaining = min(request.content_length, max_bytes) if request.content_length >= 0 else max_bytes
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while remaining > 0:
+        data = stream.read(min(TEXT_CHUNK_SIZE, remaining))
+        if not data:
+            break
+        remaining -= len(data)
+        yield decoder.decode(data)
+    yield decoder.decode(b'', final=True)
+
+def find_spellable_runs(chunks, reverse_symbols=False, summary=None):
+    """
+    Scan text in a single pass and yield every maximal spellable run.
+    Yields (start, end, text) character offsets, where text is None for runs
+    longer than MAX_RUN_TEXT_LENGTH. Non-letters always end a run.
+    If a summary dict is given, it is filled with letter counts and the longest
+    run once the scan finishes. Memory use does not depend on the text length.
+    """
+    one_letter, two_letter = SPELLABLE_SEQUENCES[reverse_symbols]
+
+    # Current chunk plus enough preceding text to return a just-confirmed run
+    window = ''
+    window_start = 0
+    position = 0
+    previous = ''
+    # Start of the longest spellable run ending at the previous two positions
+    start_1 = start_2 = None
+    # Candidate runs that a later, longer run could still contain (sorted by start)
+    pending = deque()
+    letters = spellable_letters = covered_end = 0
+    longest = None
+
+    def confirm(start, end):
+        nonlocal spellable_letters, covered_end, longest
+        spellable_letters += end - max(start, covered_end)
+        covered_end = end
+        text = None
+        if end - start <= MAX_RUN_TEXT_LENGTH:
+            text = window[start - window_start:end - window_start]
+        if longest is None or end - start > longest[1] - longest[0]:
+            longest = (start, end, text)
+        return start, end, text
+
+    for chunk in chunks:
+        carry = window[-(MAX_RUN_TEXT_LENGTH + 2):]
+        window_start = position - len(carry)
+        window = carry + chunk
+        chunk_start = position
+
+        for match in LETTER_RUN_PATTERN.finditer(chunk):
+            if chunk_start + match.start() != position:
+                # Nothing spans a non-letter, so every candidate is final
+                while pending:
+                    yield confirm(*pending.popleft())
+                previous = ''
+                start_1 = start_2 = None
+                position = chunk_start + match.start()
+
+            letters += match.end() - match.start()
+            for char in match.group().lower():
+                position += 1
+                start = None
+                if char in one_letter:
+                    start = position - 1 if start_1 is None else start_1
+                if previous and previous + char in two_letter:
+                    candidate = position - 2 if start_2 is None else start_2
+                    if start is None or candidate < start:
+                        start = candidate
+                previous = char
+                start_1, start_2 = start, start_1
+
+                if start is not None:
+                    # Earlier candidates starting at or after this run are inside it
+                    while pending and pending[-1][0] >= start:
+                        pending.pop()
+                    pending.append((start, position))
+
+                # Every later run starts at or after this bound, so earlier candidates are maximal
+                if pending:
+                    bound = position - 1 if start_2 is None else start_2
+                    if start_1 is not None and start_1 < bound:
+                        bound = start_1
+                    while pending and pending[0][0] < bound:
+                        yield confirm(*pending.popleft())
+
+        if position != chunk_start + len(chunk):
+            # The chunk ended with non-letters
+            while pending:
+                yield confirm(*pending.popleft())
+            previous = ''
+            start_1 = start_2 = None
+            position = chunk_start + len(chunk)
+
+    while pending:
+        yield confirm(*pending.popleft())
+
+    if summary is not None:
+        summary.update({
+            "letters": letters,
+            "spellable_letters": spellable_letters,
+            "longest": longest
+        })
+
+def format_run(run):
+    """Format a (start, end, text) run for the API"""
+    start, end, text = run
+    formatted = {"start": start, "end": end, "length": end - start}
+    if text is not None:
+        formatted["text"] = text
+    return formatted
+
+@app.post('/api/v1/text/analyze')
+def analyze_text():
+    """Find spellable runs in a (possibly very large) text body"""
+    set_json_headers()
+
+    if request.content_length > MAX_TEXT_BYTES:
+        response.status = 413
+        return create_error_response("TEXT_TOO_LARGE", f"Text exceeds maximum size of {MAX_TEXT_BYTES} bytes")
+
+    reverse_symbols = request.query.get('allow_reversed_symbols', '').lower() == 'true'
+    try:
+        min_length = max(1, int(request.query.get('min_length', 1)))
+    except ValueError:
+        min_length = 1
+
+    meta = {}
+    if reverse_symbols:
+        meta["allow_reversed_symbols"] = True
+    envelope = create_success_response(None, meta)
+
+    def generate():
+        # Stream the runs as they are found, then the summary
+        summary = {}
+        yield '{"data": {"runs": ['
+        separator = ''
+        for run in find_spellable_runs(iter_request_text(MAX_TEXT_BYTES), reverse_symbols, summary):
+            if run[1] - run[0] >= min_length:
+                yield separator + json.dumps(format_run(run))
+                separator = ', '
+        letters = summary["letters"]
+        totals = {
+            "longest": format_run(summary["longest"]) if summary["longest"] else None,
+            "letters": letters,
+            "spellable_letters": summary["spellable_letters"],
+            "spellable_fraction": round(summary["spellable_letters"] / letters, 6) if letters else 0.0
+        }
+        yield '], ' + json.dumps(totals)[1:] + ', "meta": ' + json.dumps(envelope["meta"]) + '}'
+
+    return generate()
+
+# Document spelling (every word in a text body)
+@functools.lru_cache(maxsize=WORD_SUMMARY_CACHE_SIZE)
+def summarize_word(word, reverse_symbols=False):
+    """
+    Count the spellings of a lowercase word and find the best one without enumerating them.
+    The best spelling uses the fewest elements, ties going to the one solver.iter_solutions lists first.
+    Returns (count, representation); representation is None when the word can't be spelled.
+    """
+    lookup = SYMBOL_LOOKUP[reverse_symbols]
+    length = len(word)
+    # Suffix DP: number of spellings of word[i:], and the first symbol of its best spelling
+    counts = [0] * (length + 1)
+    fewest = [0] * (length + 1)
+    choice = [None] * (length + 1)
+    counts[length] = 1
+    for i in range(length - 1, -1, -1):
+        for size in (1, 2):
+            following = i + size
+            if following > length:
+                break
+            if not counts[following]:
+                continue
+            for symbol, _, _ in lookup.get(word[i:following], ()):
+                counts[i] += counts[following]
+                if choice[i] is None or fewest[following] + 1 < fewest[i]:
+                    fewest[i] = fewest[following] + 1
+                    choice[i] = (symbol, following)
+
+    if not counts[0]:
+        return 0, None
+
+    parts = []
+    i = 0
+    while i < length:
+        symbol, i = choice[i]
+        parts.append(symbol)
+    return counts[0], ''.join(parts)
+
+def iter_text_tokens(chunks):
+    """Yield (offset, token) for every run of letters, including runs split across chunks"""
+    carry = ''
+    position = 0
+    for chunk in chunks:
+        text = carry + chunk
+        base = position - len(carry)
+        position += len(chunk)
+        carry = ''
+        for match in LETTER_RUN_PATTERN.finditer(text):
+            if match.end() == len(text):
+                # The token may continue in the next chunk
+                carry = match.group()
+            else:
+                yield base + match.start(), match.group()
+    if carry:
+        yield position - len(carry), carry
+
+# Tokens longer than MAX_WORD_LENGTH are reported unspellable, without a count
+TOO_LONG_TOKEN_RESULT = (False, json.dumps({"spellable": False, "count": None, "best": None, "too_long": True})[1:])
+
+@app.post('/api/v1/text/spell')
+def spell_text():
+    """Spell every word of a text body, streaming NDJSON results in document order"""
+    if request.content_length > MAX_TEXT_BYTES:
+        set_json_headers()
+        response.status = 413
+        return create_error_response("TEXT_TOO_LARGE", f"Text exceeds maximum size of {MAX_TEXT_BYTES} bytes")
+
+    output_format = request.query.get('format', 'ndjson').lower()
+    if output_format not in ('ndjson', 'summary'):
+        set_json_headers()
+        response.status = 400
+        return create_error_response("INVALID_FORMAT", "Format must be 'ndjson' or 'summary'")
+
+    reverse_symbols = request.query.get('allow_reversed_symbols', '').lower() == 'true'
+
+    response.content_type = "application/x-ndjson; charset=UTF-8"
+    set_cors_headers()
+
+    def generate():
+        started = time.perf_counter()
+        # Results are computed once per distinct token, then reused as preformatted JSON
+        results = {}
+        occurrences = Counter()
+        tokens = spellable_tokens = 0
+        lines = []
+
+        for offset, token in iter_text_tokens(iter_request_text(MAX_TEXT_BYTES)):
+            key = token.lower()
+            result = results.get(key)
+            if result is None:
+                if len(key) > MAX_WORD_LENGTH:
+                    # Counts of long runs grow without bound (and aren't worth caching)
+                    result = results[key] = TOO_LONG_TOKEN_RESULT
+                else:
+                    count, best = summarize_word(key, reverse_symbols)
+                    result = results[key] = (
+                        count > 0,
+                        json.dumps({"spellable": count > 0, "count": count, "best": best})[1:]
+                    )
+            tokens += 1
+            spellable_tokens += result[0]
+
+            if output_format == 'ndjson':
+                # Tokens are letters only, so they never need JSON escaping
+                lines.append(f'{{"token": "{token}", "offset": {offset}, {result[1]}\n')
+                if len(lines) >= TEXT_OUTPUT_BATCH:
+                    yield ''.join(lines)
+                    lines.clear()
+            else:
+                occurrences[key] += 1
+
+        if output_format == 'summary':
+            for key, result in results.items():
+                lines.append(f'{{"token": "{key}", "occurrences": {occurrences[key]}, {result[1]}\n')
+        yield ''.join(lines)
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            "tokens": tokens,
+            "distinct_tokens": len(results),
+            "spellable_tokens": spellable_tokens,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "tokens_per_second": round(tokens / elapsed) if elapsed > 0 else None
+        }
+        yield json.dumps({"summary": summary}) + '\n'
+
+    return generate()
 
 # OpenAPI Specification endpoints
 @app.get('/api/v1/openapi.yaml')
@@ -1496,9 +1936,51 @@ def error500(error):
     response.status = 500
     return create_error_response("INTERNAL_ERROR", "An internal server error occurred")
 
+# Startup work runs in the background: started by the server in __main__, or by the first request
+# (e.g. the readiness probe) under any other WSGI server. Importing the module never starts it.
+STARTUP_LOCK = threading.Lock()
+STARTED = False
+
+def start_background_work():
+    """Prebuild the default dictionary index and warm the result caches (once per process)"""
+    global STARTED, WARMUP
+    with STARTUP_LOCK:
+        if STARTED:
+            return
+        try:
+            if os.path.isfile(DICTIONARY_PATH):
+                start_dictionary_index_build()
+            
+            # Refill the result caches with popular words; the readiness probe waits for it
+            warmup_words = cache_warmup.load_warmup_words(cache_warmup.WARMUP_ACCESS_LOG, cache_warmup.WARMUP_WORD_LIST)
+            if warmup_words:
+                WARMUP = cache_warmup.start_warm_up(warmup_words, warm_word_result)
+        finally:
+            # Set last, so concurrent first requests wait for WARMUP rather than report ready
+            # without it (and set even on failure, so startup is only tried once)
+            STARTED = True
+
+@app.hook('before_request')
+def start_background_work_on_first_request():
+    """Start the startup work under WSGI servers that import the app rather than run __main__"""
+    if not STARTED:
+        start_background_work()
+
+# WSGI entry point: the app, wrapped with request timing when it is enabled
+application = request_timing.instrument(response_compression.GzipMiddleware(app))
+
 # Run app
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    """
+    Bottle's default wsgiref server with a thread per request. Served one at a time, requests
+    never overlap, so the readiness probe's in-flight and queue signals would always be zero.
+    """
+    daemon_threads = True
+
 if __name__ == "__main__":
+    start_background_work()
+
     if os.environ.get('APP_LOCATION') == 'heroku':
-        app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)))
+        run(application, host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), server_class=ThreadingWSGIServer)
     else:
-        app.run(host='localhost', port=8080, debug=True)
+        run(application, host='localhost', port=8080, debug=True, server_class=ThreadingWSGIServer)
@@ -0,0 +1,356 @@
+# coding=utf-8
+
+# Social card images (Open Graph) for words: the word's best spelling drawn as element tiles.
+# Renders run on a small thread pool, so a burst of new cards can't tie up the server,
+# and are cached in memory and on disk (shared by every worker process on the host).
+
+import os
+import io
+import sys
+import math
+import time
+import hashlib
+import tempfile
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+try:
+    from PIL import Image, ImageChops, ImageDraw, ImageFont
+except ImportError:  # Optional dependency; without it the card endpoint is unavailable
+    Image = None
+
+import result_store
+
+CARD_WIDTH = 1200
+CARD_HEIGHT = 630
+
+# Bump when the card design changes, so cached renders of the old design aren't served
+RENDER_VERSION = 1
+
+# Render cache settings: recent cards in memory, more on disk
+OG_IMAGE_CACHE_DIR = os.environ.get('ELEMENT_WORDS_OG_IMAGE_CACHE', os.path.join(tempfile.gettempdir(), 'element-words-og'))
+OG_IMAGE_CACHE_MAX_BYTES = int(os.environ.get('ELEMENT_WORDS_OG_IMAGE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+MEMORY_CACHE_ENTRIES = 256
+
+# Render pool settings: renders beyond the queue limit are refused rather than queued
+RENDER_WORKERS = int(os.environ.get('ELEMENT_WORDS_OG_IMAGE_WORKERS', 2))
+MAX_QUEUED_RENDERS = 16
+RENDER_TIMEOUT = 5
+
+# Colors matching the web app (background gradient, tiles, reversed tiles)
+GRADIENT_START = (102, 126, 234)
+GRADIENT_END = (118, 75, 162)
+TILE_COLOR = (255, 255, 255)
+TILE_BORDER = (226, 232, 240)
+REVERSED_TILE_COLOR = (254, 245, 231)
+REVERSED_TILE_BORDER = (237, 137, 54)
+SYMBOL_COLOR = (45, 55, 72)
+NAME_COLOR = (113, 128, 150)
+NUMBER_COLOR = (160, 174, 192)
+TEXT_COLOR = (255, 255, 255)
+
+# Bold fonts to try before Pillow's built-in font (which is emboldened with a stroke instead)
+FONT_CANDIDATES = ['DejaVuSans-Bold.ttf', 'LiberationSans-Bold.ttf', 'Arial Bold.ttf', 'arialbd.ttf']
+
+# Layout: title at the top, footer at the bottom, tiles in rows in between
+MARGIN = 48
+TITLE_HEIGHT = 96
+FOOTER_HEIGHT = 64
+TILE_GAP = 16
+MAX_TILE_SIZE = 200
+MIN_NAME_TILE_SIZE = 96
+
+class RenderBusy(Exception):
+    """Raised when a card can't be rendered right now (too many renders queued, or too slow)"""
+
+@functools.lru_cache(maxsize=None)
+def load_font(size):
+    """Load a bold font at a pixel size; returns (font, stroke width to embolden it with)"""
+    for name in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(name, size), 0
+        except OSError:
+            continue
+    return ImageFont.load_default(size), max(1, size // 28)
+
+def fit_font(draw, text, size, max_width):
+    """The largest font (up to size) that fits text in max_width pixels"""
+    while size > 8:
+        font, stroke = load_font(size)
+        if draw.textlength(text, font=font) + 2 * stroke <= max_width:
+            break
+        size = int(size * 0.9)
+    return load_font(size)
+
+@functools.lru_cache(maxsize=1)
+def card_background():
+    """The diagonal gradient every card is drawn on (built once)"""
+    gradient = Image.linear_gradient('L')
+    horizontal = gradient.rotate(90).resize((CARD_WIDTH, CARD_HEIGHT))
+    vertical = gradient.resize((CARD_WIDTH, CARD_HEIGHT))
+    mask = ImageChops.add(horizontal, vertical, scale=2.0)
+    return Image.composite(Image.new('RGB', (CARD_WIDTH, CARD_HEIGHT), GRADIENT_END),
+                           Image.new('RGB', (CARD_WIDTH, CARD_HEIGHT), GRADIENT_START), mask)
+
+def tile_layout(count):
+    """Choose (tile size, columns) fitting count tiles in the card's tile area as large as possible"""
+    width = CARD_WIDTH - 2 * MARGIN
+    height = CARD_HEIGHT - 2 * MARGIN - TITLE_HEIGHT - FOOTER_HEIGHT
+    best = (0, 1)
+    for columns in range(1, count + 1):
+        rows = math.ceil(count / columns)
+        size = min(
+            (width - (columns - 1) * TILE_GAP) // columns,
+            (height - (rows - 1) * TILE_GAP) // rows,
+            MAX_TILE_SIZE
+        )
+        if size > best[0]:
+            best = (size, columns)
+    return best
+
+def draw_text(draw, position, text, size, max_width, fill, anchor):
+    """Draw text at a position, shrinking it to fit max_width"""
+    font, stroke = fit_font(draw, text, size, max_width)
+    draw.text(position, text, font=font, fill=fill, anchor=anchor, stroke_width=stroke, stroke_fill=fill)
+
+def draw_tile(draw, x, y, size, element):
+    """Draw one element tile (atomic number, symbol and name), as the web app shows it"""
+    symbol = element["symbol"]
+    number = str(element["atomic_number"])
+    if element["reversed"]:
+        # Reversed symbols show their letters and atomic number digits reversed
+        symbol, number = symbol[::-1], number[::-1]
+        fill, outline = REVERSED_TILE_COLOR, REVERSED_TILE_BORDER
+        number_color = REVERSED_TILE_BORDER
+    else:
+        fill, outline = TILE_COLOR, TILE_BORDER
+        number_color = NUMBER_COLOR
+
+    draw.rounded_rectangle((x, y, x + size, y + size), radius=size // 8, fill=fill,
+                           outline=outline, width=max(2, size // 40))
+    inner = size * 0.84
+    draw_text(draw, (x + size * 0.92, y + size * 0.08), number, int(size * 0.16), inner / 2, number_color, 'ra')
+    if size >= MIN_NAME_TILE_SIZE:
+        draw_text(draw, (x + size / 2, y + size * 0.5), symbol, int(size * 0.42), inner, SYMBOL_COLOR, 'mm')
+        draw_text(draw, (x + size / 2, y + size * 0.86), element["name"], int(size * 0.13), inner, NAME_COLOR, 'ms')
+    else:
+        draw_text(draw, (x + size / 2, y + size * 0.56), symbol, int(size * 0.46), inner, SYMBOL_COLOR, 'mm')
+
+def render_card(word, elements):
+    """
+    Render a word's social card as PNG bytes.
+    elements are the formatted elements of its best spelling, or None if it can't be spelled.
+    """
+    image = card_background().copy()
+    draw = ImageDraw.Draw(image)
+    center = CARD_WIDTH / 2
+    text_width = CARD_WIDTH - 2 * MARGIN
+
+    draw_text(draw, (center, MARGIN + TITLE_HEIGHT / 2), word.upper(), 64, text_width, TEXT_COLOR, 'mm')
+
+    if elements:
+        size, columns = tile_layout(len(elements))
+        rows = math.ceil(len(elements) / columns)
+        area_top = MARGIN + TITLE_HEIGHT
+        area_height = CARD_HEIGHT - 2 * MARGIN - TITLE_HEIGHT - FOOTER_HEIGHT
+        top = area_top + (area_height - rows * size - (rows - 1) * TILE_GAP) / 2
+        for row in range(rows):
+            row_elements = elements[row * columns:(row + 1) * columns]
+            # Rows are centered, so a short last row sits in the middle
+            left = center - (len(row_elements) * size + (len(row_elements) - 1) * TILE_GAP) / 2
+            for i, element in enumerate(row_elements):
+                draw_tile(draw, int(left + i * (size + TILE_GAP)), int(top + row * (size + TILE_GAP)), size, element)
+        count = len(elements)
+        footer = f"Element Words · spelled with {count} element{'s' if count != 1 else ''}"
+    else:
+        draw_text(draw, (center, CARD_HEIGHT / 2), "can't be spelled with element symbols", 40, text_width, TEXT_COLOR, 'mm')
+        footer = "Element Words"
+
+    draw_text(draw, (center, CARD_HEIGHT - MARGIN - FOOTER_HEIGHT / 2), footer, 30, text_width, TEXT_COLOR, 'mm')
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+def card_digest(key):
+    """Hash naming a card's cache file (and used as its ETag)"""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+class RenderCache:
+    """
+    Rendered cards by key: the most recent in memory, the rest in a directory shared by the
+    host's worker processes. The directory is pruned, oldest first, once it exceeds max_bytes.
+    """
+
+    def __init__(self, directory=OG_IMAGE_CACHE_DIR, max_bytes=OG_IMAGE_CACHE_MAX_BYTES, memory_entries=MEMORY_CACHE_ENTRIES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory = result_store.LRUCache(memory_entries)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, card_digest(key) + '.png')
+
+    def _disk_entries(self):
+        """(path, mtime, size) of every cached card on disk"""
+        entries = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.png'):
+                path = os.path.join(self.directory, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def get(self, key):
+        """Return the cached PNG for key, or None"""
+        data = self.memory.get(key)
+        if data is not None:
+            return data
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Mark it recently used, so pruning keeps it
+            os.utime(path)
+        except OSError:
+            return None
+        self.memory.put(key, data)
+        return data
+
+    def put(self, key, data):
+        """Cache a rendered PNG in memory and on disk"""
+        self.memory.put(key, data)
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            # The disk cache is an optimization; the card is still cached in memory
+            return
+        with self._lock:
+            self.disk_bytes += len(data)
+            if self.disk_bytes > self.max_bytes:
+                self.prune()
+
+    def prune(self):
+        """Delete least recently used cards until the directory is back under its target size"""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * result_store.EVICTION_TARGET
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self.disk_bytes = total
+
+    def clear(self):
+        """Delete every cached card"""
+        self.memory.clear()
+        with self._lock:
+            for path, _, _ in self._disk_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.disk_bytes = 0
+
+class CardRenderer:
+    """
+    Renders cards on a small thread pool, through the render cache.
+    Identical concurrent requests share one render, at most max_queued renders are pending at
+    once, and callers stop waiting after a timeout (the render still finishes and is cached).
+    """
+
+    def __init__(self, cache, workers=RENDER_WORKERS, max_queued=MAX_QUEUED_RENDERS):
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='og-render')
+        self._slots = threading.BoundedSemaphore(max_queued)
+        self._renders = result_store.SingleFlight()
+        self._pending_lock = threading.Lock()
+        # Renders queued or running on the pool
+        self.pending = 0
+
+    def get(self, key, render, timeout=RENDER_TIMEOUT):
+        """
+        Return the PNG for key from the cache, or render it with render() on the pool.
+        Raises RenderBusy if the pool is full or the render takes longer than timeout seconds.
+        """
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        return self._renders.do(key, lambda: self._render(key, render, timeout))
+
+    def _render(self, key, render, timeout):
+        if not self._slots.acquire(blocking=False):
+            raise RenderBusy("Too many images are being rendered")
+        with self._pending_lock:
+            self.pending += 1
+        future = self._pool.submit(self._run, key, render)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            raise RenderBusy("The image is still being rendered")
+
+    def _run(self, key, render):
+        try:
+            data = render()
+            self.cache.put(key, data)
+            return data
+        finally:
+            with self._pending_lock:
+                self.pending -= 1
+            self._slots.release()
+
+def open_card_renderer():
+    """Create the card renderer, or return None when Pillow isn't installed"""
+    if Image is None:
+        return None
+    return CardRenderer(RenderCache())
+
+def benchmark(words, repeat=20):
+    """Print first-render, disk-cached and memory-cached latencies for words"""
+    # Imported here so rendering itself doesn't need the solver
+    import solver
+
+    with tempfile.TemporaryDirectory() as directory:
+        renderer = CardRenderer(RenderCache(directory))
+        for word in words:
+            key = result_store.result_key(word, False) + f"|og={RENDER_VERSION}"
+
+            def render():
+                _, solutions = solver.top_solutions(word, 1)
+                return render_card(word, solutions[0]["elements"] if solutions else None)
+
+            started = time.perf_counter()
+            data = renderer.get(key, render)
+            first = time.perf_counter() - started
+
+            renderer.cache.memory.clear()
+            started = time.perf_counter()
+            renderer.get(key, render)
+            disk = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for _ in range(repeat):
+                renderer.get(key, render)
+            memory = (time.perf_counter() - started) / repeat
+
+            print(f"{word}: {len(data)} bytes, first render {first * 1000:.1f} ms, "
+                  f"disk cache {disk * 1000:.2f} ms, memory cache {memory * 1e6:.1f} us")
+
+if __name__ == "__main__":
+    if Image is None:
+        sys.exit("Pillow is required to render cards")
+    benchmark(sys.argv[1:] or ['hero', 'chemistry', 'supercalifragilisticexpialidocious', 'xyz'])
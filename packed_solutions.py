@@ -0,0 +1,194 @@
+# coding=utf-8
+
+# Compact in-memory solutions. A word's solutions are stored as the token indexes of every
+# solution packed into one array (a byte each for sets of up to 256 tokens), with the offset
+# where each solution starts. Token and element data live once per symbol set in an immutable
+# TokenTable, and solutions only become dicts (or JSON) at the serialization edge.
+
+import sys
+import json
+import time
+from array import array
+
+class TokenTable:
+    """
+    Per symbol set, immutable data for each token (by index, in the set's token order): its
+    text, element fields and score, and the JSON fragments solutions are serialized from
+    """
+    __slots__ = ('tokens', 'index', 'typecode', 'elements', 'scores',
+                 'token_json', 'text_json', 'element_json')
+
+    def __init__(self, symbol_set, score):
+        """score(number, is_reversed) scores one token"""
+        self.tokens = tuple(symbol_set.tokens)
+        self.index = {token: i for i, token in enumerate(self.tokens)}
+        self.typecode = 'B' if len(self.tokens) <= 256 else 'H'
+        elements = []
+        for token in self.tokens:
+            symbol, is_reversed = symbol_set.tokens[token]
+            name, number = symbol_set.info[symbol]
+            elements.append((symbol, name, number, is_reversed))
+        self.elements = tuple(elements)
+        self.scores = tuple(score(number, is_reversed) for _, _, number, is_reversed in self.elements)
+        # The fragments are json.dumps output, so serialized solutions match json.dumps of their dicts
+        self.token_json = tuple(json.dumps(token) for token in self.tokens)
+        self.text_json = tuple(fragment[1:-1] for fragment in self.token_json)
+        self.element_json = tuple(json.dumps(self.element_dict(i)) for i in range(len(self.tokens)))
+
+    def element_dict(self, i):
+        """A new dict of token i's element fields, as the API formats them"""
+        symbol, name, number, is_reversed = self.elements[i]
+        return {"symbol": symbol, "name": name, "atomic_number": number, "reversed": is_reversed}
+
+class Solution:
+    """View of one packed solution: its token indexes, read from the shared table"""
+    __slots__ = ('table', 'indexes')
+
+    def __init__(self, table, indexes):
+        self.table = table
+        self.indexes = indexes
+
+    def __len__(self):
+        return len(self.indexes)
+
+    @property
+    def symbols(self):
+        return [self.table.tokens[i] for i in self.indexes]
+
+    @property
+    def representation(self):
+        return ''.join(self.symbols)
+
+    @property
+    def score(self):
+        scores = self.table.scores
+        return sum(scores[i] for i in self.indexes)
+
+    def to_dict(self):
+        """The solution as the API formats it (representation, symbols, elements, score)"""
+        return {
+            "representation": self.representation,
+            "symbols": self.symbols,
+            "elements": [self.table.element_dict(i) for i in self.indexes],
+            "score": self.score
+        }
+
+    def to_json(self):
+        """json.dumps(self.to_dict()), built from the table's fragments"""
+        table = self.table
+        indexes = self.indexes
+        return (
+            '{"representation": "' + ''.join([table.text_json[i] for i in indexes])
+            + '", "symbols": [' + ', '.join([table.token_json[i] for i in indexes])
+            + '], "elements": [' + ', '.join([table.element_json[i] for i in indexes])
+            + '], "score": ' + str(sum([table.scores[i] for i in indexes])) + '}'
+        )
+
+class SolutionList:
+    """
+    A word's solutions packed into one array of token indexes. offsets[k] is where solution k
+    starts, and offsets[-1] the end of the last one. Items are Solution views.
+    """
+    __slots__ = ('table', 'data', 'offsets')
+
+    def __init__(self, table):
+        self.table = table
+        self.data = array(table.typecode)
+        self.offsets = array('I', [0])
+
+    def append(self, tokens):
+        """Add a solution given as a sequence of tokens"""
+        index = self.table.index
+        self.data.extend([index[token] for token in tokens])
+        self.offsets.append(len(self.data))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("solution index out of range")
+        return Solution(self.table, memoryview(self.data)[self.offsets[k]:self.offsets[k + 1]])
+
+    def __iter__(self):
+        view = memoryview(self.data)
+        offsets = self.offsets
+        for k in range(len(self)):
+            yield Solution(self.table, view[offsets[k]:offsets[k + 1]])
+
+    def sort_by_length(self):
+        """Order solutions by their number of tokens, stably (ties keep their order)"""
+        offsets = self.offsets
+        order = sorted(range(len(self)), key=lambda k: offsets[k + 1] - offsets[k])
+        data = array(self.data.typecode)
+        sorted_offsets = array('I', [0])
+        view = memoryview(self.data)
+        for k in order:
+            data.extend(view[offsets[k]:offsets[k + 1]])
+            sorted_offsets.append(len(data))
+        self.data = data
+        self.offsets = sorted_offsets
+
+    def to_dicts(self):
+        return [solution.to_dict() for solution in self]
+
+    def to_json(self):
+        """The solutions as a JSON array, as json.dumps(self.to_dicts()) would write it"""
+        return '[' + ', '.join([solution.to_json() for solution in self]) + ']'
+
+def measure(function):
+    """Run function twice: timed, then under tracemalloc. Returns (result, seconds, retained bytes, peak bytes)"""
+    # Imported here so importing the representation stays cheap
+    import tracemalloc
+
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    try:
+        result = function()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, retained, peak
+
+def benchmark(words):
+    """Print the memory and time taken by each word's solutions as dicts and packed, and to serialize them"""
+    # Imported here: the solver builds on this module
+    import solver
+
+    symbol_set = solver.DEFAULT_SYMBOL_SETS[True]
+    table = solver.get_token_table(symbol_set)
+    for word in words:
+        spellings = list(solver.iter_solutions(word, symbol_set=symbol_set))
+
+        def as_dicts():
+            return [solver.format_solution(text, symbols, symbol_set) for text, symbols in spellings]
+
+        def packed():
+            solutions = SolutionList(table)
+            for _, symbols in spellings:
+                solutions.append(symbols)
+            return solutions
+
+        dicts, dict_seconds, dict_bytes, _ = measure(as_dicts)
+        solutions, packed_seconds, packed_bytes, _ = measure(packed)
+        started = time.perf_counter()
+        dicts_json = json.dumps(dicts)
+        dumps_seconds = time.perf_counter() - started
+        del dicts
+        started = time.perf_counter()
+        packed_json = solutions.to_json()
+        packed_json_seconds = time.perf_counter() - started
+        assert packed_json == dicts_json
+
+        print(f"{word}: {len(solutions)} solutions")
+        print(f"  dicts:  {dict_bytes / 1024:.0f} KiB, built in {dict_seconds * 1000:.1f} ms, "
+              f"serialized in {dumps_seconds * 1000:.1f} ms")
+        print(f"  packed: {packed_bytes / 1024:.0f} KiB, built in {packed_seconds * 1000:.1f} ms, "
+              f"serialized in {packed_json_seconds * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1:] or ['nonconservationist', 'hypersensitivitieshypersensitivities', 'nonconservationistnonconservationist'])
@@ -0,0 +1,221 @@
+# coding=utf-8
+
+# Parallel export of every spelling of a word, one per line, in lattice (depth first) order.
+# The word's symbol lattice is cut into contiguous ranges of spellings, balanced by the number
+# of spellings below each prefix path, and a process pool enumerates the ranges. The output size
+# of every range is known in advance, so workers write straight into their slice of the output
+# file and no process ever holds more than a write buffer of spellings.
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+
+import solver
+import symbol_sets
+
+# Ranges per worker: more ranges even out uneven ones, at the cost of a little scheduling
+PARTITIONS_PER_WORKER = 8
+
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+def count_lattice(lattice, length):
+    """
+    For each position i, the number of spellings of the suffix from i and their total
+    encoded size in bytes (symbol text only), computed right to left
+    """
+    counts = [0] * (length + 1)
+    sizes = [0] * (length + 1)
+    symbols = [0] * (length + 1)
+    counts[length] = 1
+    for i in range(length - 1, -1, -1):
+        for end, token, _, _ in lattice[i]:
+            if counts[end]:
+                counts[i] += counts[end]
+                sizes[i] += sizes[end] + counts[end] * len(token.encode('utf-8'))
+                symbols[i] += symbols[end] + counts[end]
+    return counts, sizes, symbols
+
+class ExportPlan:
+    """A word's lattice with its suffix counts, and the byte size of each prefix path's output"""
+
+    def __init__(self, word, symbol_set, separator=''):
+        self.word = word
+        self.symbol_set = symbol_set
+        self.separator = separator.encode('utf-8')
+        self.lattice = symbol_set.lattice(word)
+        self.counts, self.sizes, self.symbols = count_lattice(self.lattice, len(word))
+
+    @property
+    def total(self):
+        return self.counts[0]
+
+    def output_bytes(self, position, prefix):
+        """Bytes written for every spelling starting with prefix (a path to position)"""
+        count = self.counts[position]
+        if not count:
+            return 0
+        prefix_bytes = sum(len(token.encode('utf-8')) for token in prefix)
+        symbols = self.symbols[position] + len(prefix) * count
+        # Each line is its symbols, a separator between consecutive symbols, and a newline
+        return (count * prefix_bytes + self.sizes[position]
+                + (symbols - count) * len(self.separator) + count)
+
+    def split(self, parts):
+        """
+        Cut the spellings into at most parts contiguous ranges of similar size.
+        Returns a list of ranges, each a list of (position, prefix) paths whose spellings it holds,
+        in output order.
+        """
+        if not self.total:
+            return []
+        length = len(self.word)
+        target = self.total / parts
+
+        # Replace heavy prefix paths by their children until none is above the target size;
+        # children replace their parent in place, so the paths stay in output order
+        frontier = [(0, ())]
+        while True:
+            expanded = []
+            changed = False
+            for position, prefix in frontier:
+                if self.counts[position] > target and position < length:
+                    expanded.extend(
+                        (end, prefix + (token,))
+                        for end, token, _, _ in self.lattice[position] if self.counts[end]
+                    )
+                    changed = True
+                else:
+                    expanded.append((position, prefix))
+            frontier = expanded
+            if not changed:
+                break
+
+        # Group consecutive paths into ranges of about target spellings each
+        ranges = [[]]
+        done = 0
+        for position, prefix in frontier:
+            if ranges[-1] and done >= target * len(ranges):
+                ranges.append([])
+            ranges[-1].append((position, prefix))
+            done += self.counts[position]
+        return ranges
+
+# Per-process state of pool workers, set up once by init_worker
+_worker_plan = None
+
+def init_worker(word, entries, reverse_symbols, separator):
+    """Build the export plan in a pool worker (each process compiles its own symbol set)"""
+    global _worker_plan
+    symbol_set = symbol_sets.compile_symbol_set(entries, reverse_symbols)
+    _worker_plan = ExportPlan(word, symbol_set, separator)
+
+def write_range(paths, write):
+    """Write the spellings of a range's prefix paths through write(bytes); returns the count"""
+    plan = _worker_plan
+    separator = plan.separator.decode('utf-8')
+    written = 0
+    buffer = []
+    buffered = 0
+    for position, prefix in paths:
+        for suffix in solver.iter_lattice_paths(plan.lattice, plan.counts, position):
+            line = (separator.join(prefix + tuple(suffix)) + '\n').encode('utf-8')
+            buffer.append(line)
+            buffered += len(line)
+            written += 1
+            if buffered >= WRITE_BUFFER_BYTES:
+                write(b''.join(buffer))
+                buffer = []
+                buffered = 0
+    if buffer:
+        write(b''.join(buffer))
+    return written
+
+def export_range_to_file(task):
+    """Pool task: write a range into its slice of the (already sized) output file"""
+    paths, path, offset = task
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        position = [offset]
+
+        def write(data):
+            view = memoryview(data)
+            while view:
+                sent = os.pwrite(fd, view, position[0])
+                position[0] += sent
+                view = view[sent:]
+
+        return write_range(paths, write)
+    finally:
+        os.close(fd)
+
+def export_range_to_part(task):
+    """Pool task: write a range into its own part file, for merging into a stream"""
+    paths, part_path = task
+    with open(part_path, 'wb') as f:
+        return write_range(paths, f.write), part_path
+
+def export_spellings(word, symbol_set, output, workers=None, separator=''):
+    """
+    Write every spelling of a lowercase word to output (a file path, or a binary stream such as
+    stdout), one per line with its symbols joined by separator, in the order iter_solutions
+    yields them. Returns the number of spellings written.
+    """
+    workers = workers or os.cpu_count() or 1
+    plan = ExportPlan(word, symbol_set, separator)
+    ranges = plan.split(workers * PARTITIONS_PER_WORKER)
+    init_args = (word, symbol_set.entries, symbol_set.reverse_symbols, separator)
+
+    if isinstance(output, str):
+        # Each range's offset is the size of everything before it
+        tasks = []
+        offset = 0
+        for paths in ranges:
+            tasks.append((paths, output, offset))
+            offset += sum(plan.output_bytes(position, prefix) for position, prefix in paths)
+        with open(output, 'wb') as f:
+            f.truncate(offset)
+        if workers == 1 or len(tasks) <= 1:
+            init_worker(*init_args)
+            return sum(map(export_range_to_file, tasks))
+        with multiprocessing.Pool(workers, initializer=init_worker, initargs=init_args) as pool:
+            return sum(pool.imap_unordered(export_range_to_file, tasks))
+
+    # Streams can't be written out of order: ranges go to part files, copied over in order
+    written = 0
+    with tempfile.TemporaryDirectory() as directory:
+        tasks = [(paths, os.path.join(directory, f"{i}.part")) for i, paths in enumerate(ranges)]
+        with multiprocessing.Pool(workers, initializer=init_worker, initargs=init_args) as pool:
+            for count, part_path in pool.imap(export_range_to_part, tasks):
+                with open(part_path, 'rb') as f:
+                    shutil.copyfileobj(f, output)
+                os.remove(part_path)
+                written += count
+    output.flush()
+    return written
+
+def main(argv=None):
+    """Command line interface for exporting every spelling of a word"""
+    parser = argparse.ArgumentParser(description="Export every element spelling of a word, one per line")
+    parser.add_argument('word', help="The word to spell (non-letters are removed)")
+    parser.add_argument('-o', '--output', default='-', help="Output file (default: stdout)")
+    parser.add_argument('--reversed', action='store_true', help="Allow reversed two-letter symbols")
+    parser.add_argument('--separator', default='', help="Text between symbols (default: none, e.g. BaCoN)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    word = solver.normalize_word(args.word)
+    symbol_set = solver.DEFAULT_SYMBOL_SETS[args.reversed]
+    started = time.perf_counter()
+    if args.output == '-':
+        written = export_spellings(word, symbol_set, sys.stdout.buffer, args.workers, args.separator)
+    else:
+        written = export_spellings(word, symbol_set, args.output, args.workers, args.separator)
+    elapsed = time.perf_counter() - started
+    print(f"Exported {written} spellings in {elapsed:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
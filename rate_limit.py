@@ -0,0 +1,146 @@
+# coding=utf-8
+
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Token bucket settings: cost units refilled per second, and the bucket size (burst)
+RATE_LIMIT_RATE = float(os.environ.get('ELEMENT_WORDS_RATE_LIMIT', 20))
+RATE_LIMIT_BURST = float(os.environ.get('ELEMENT_WORDS_RATE_LIMIT_BURST', 100))
+
+# Optional SQLite file for sharing buckets between worker processes on the same host
+RATE_LIMIT_STORE_PATH = os.environ.get('ELEMENT_WORDS_RATE_LIMIT_STORE', '')
+
+# Issued API keys (comma-separated). Only these get a bucket of their own; any other key is
+# ignored, so clients can't dodge their limit by sending a new key with each request
+RATE_LIMIT_API_KEYS = frozenset(
+    key.strip() for key in os.environ.get('ELEMENT_WORDS_API_KEYS', '').split(',') if key.strip()
+)
+
+# Drop idle buckets once this many clients are tracked (a full bucket carries no state)
+MAX_TRACKED_CLIENTS = 100000
+
+# Seconds between sweeps of refilled buckets out of the shared store
+SHARED_PRUNE_INTERVAL = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+class RateLimiter:
+    """
+    Per-client token bucket limiter where each request is charged its estimated cost.
+    Buckets live in a dict in this process, or in a SQLite file when shared across workers.
+    """
+
+    def __init__(self, rate=RATE_LIMIT_RATE, burst=RATE_LIMIT_BURST, shared_path=None):
+        self.rate = rate
+        self.burst = burst
+        self.shared_path = shared_path
+        # Least recently charged first, so refilled buckets are pruned from the front
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_shared_prune = 0
+        if shared_path:
+            self._connection().executescript(SCHEMA)
+
+    def charge(self, key, cost, now=None, overdraw=False):
+        """
+        Charge a request's cost to a client's bucket.
+        Returns 0 if the request is allowed, otherwise the seconds to wait before retrying.
+        Requests costing more than the burst are charged the full burst, so they stay possible.
+        With overdraw, a cost only known once the request was allowed is always taken: the bucket
+        can go negative (down to minus the burst), and the client's next requests wait it off.
+        """
+        now = time.monotonic() if now is None else now
+        cost = min(cost, self.burst)
+        if self.shared_path:
+            return self._charge_shared(key, cost, time.time(), overdraw)
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= MAX_TRACKED_CLIENTS:
+                    self._prune(now)
+                bucket = self._buckets[key] = [self.burst, now]
+            else:
+                self._buckets.move_to_end(key)
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if overdraw:
+                bucket[0] = max(-self.burst, tokens - cost)
+                return 0
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return 0
+            bucket[0] = tokens
+            return (cost - tokens) / self.rate
+
+    def _prune(self, now):
+        """
+        Forget clients whose buckets have refilled completely, oldest first, stopping at the first
+        that hasn't. If none has, forget the least recently charged client to make room.
+        """
+        buckets = self._buckets
+        while buckets:
+            key, (tokens, updated) = next(iter(buckets.items()))
+            if now - updated < (self.burst - tokens) / self.rate:
+                break
+            del buckets[key]
+        if len(buckets) >= MAX_TRACKED_CLIENTS:
+            buckets.popitem(last=False)
+
+    def _connection(self):
+        """Get this thread's connection to the shared store, reconnecting after a fork"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.shared_path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _charge_shared(self, key, cost, now, overdraw=False):
+        """Charge a bucket stored in the shared SQLite file (wall clock time, as processes differ)"""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens = self.burst if row is None else min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+            if overdraw:
+                wait = 0
+                tokens = max(-self.burst, tokens - cost)
+            else:
+                wait = 0 if tokens >= cost else (cost - tokens) / self.rate
+                if not wait:
+                    tokens -= cost
+            connection.execute(
+                'INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            if now >= self._next_shared_prune:
+                # Forget clients whose buckets have refilled completely, as _prune does in memory
+                self._next_shared_prune = now + SHARED_PRUNE_INTERVAL
+                connection.execute(
+                    'DELETE FROM buckets WHERE updated + (? - tokens) / ? <= ?',
+                    (self.burst, self.rate, now)
+                )
+            connection.execute('COMMIT')
+        except sqlite3.Error:
+            connection.execute('ROLLBACK')
+            raise
+        return wait
+
+def open_rate_limiter():
+    """Create the configured rate limiter, or return None when limiting is disabled"""
+    if RATE_LIMIT_RATE <= 0:
+        return None
+    return RateLimiter(shared_path=RATE_LIMIT_STORE_PATH or None)
@@ -0,0 +1,204 @@
+# coding=utf-8
+
+# Per-request phase timing, reported in a Server-Timing header and a structured JSON access log.
+# Instrumented code wraps each step in phase(name). Outside a timed request (or when timing is
+# disabled and the app isn't wrapped at all) phase() returns a shared no-op context.
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import threading
+import contextlib
+from datetime import datetime
+
+# Timing is off unless enabled; when off the WSGI app isn't wrapped at all
+REQUEST_TIMING_ENABLED = os.environ.get('ELEMENT_WORDS_REQUEST_TIMING', '').lower() in ('1', 'true', 'yes')
+
+# Fraction of requests written to the access log; requests slower than the threshold always are
+ACCESS_LOG_SAMPLE_RATE = float(os.environ.get('ELEMENT_WORDS_ACCESS_LOG_SAMPLE_RATE', 0.01))
+SLOW_REQUEST_MS = float(os.environ.get('ELEMENT_WORDS_SLOW_REQUEST_MS', 1000))
+
+ACCESS_LOGGER_NAME = 'element_words.access'
+
+class TraceLocal(threading.local):
+    """The timed request being handled on this thread (None outside one)"""
+    trace = None
+
+_local = TraceLocal()
+_no_phase = contextlib.nullcontext()
+
+class RequestTrace:
+    """Phase durations and log fields collected while one request is handled"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # Phase name -> seconds (summed if a phase runs more than once), in first-run order
+        self.phases = {}
+        self.fields = {}
+        self.status = None
+        self.response_seconds = None
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        """Server-Timing header value: each phase and the total, in milliseconds"""
+        metrics = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()]
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ', '.join(metrics)
+
+class Phase:
+    """Context manager adding the time spent inside it to a trace's phase"""
+    __slots__ = ('trace', 'name', 'started')
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.add(self.name, time.perf_counter() - self.started)
+        return False
+
+def phase(name):
+    """Time a step of the current request, e.g. with phase('solve'): ..."""
+    trace = _local.trace
+    if trace is None:
+        return _no_phase
+    return Phase(trace, name)
+
+def annotate(**fields):
+    """Add fields (e.g. solutions=12) to the current request's access log line"""
+    trace = _local.trace
+    if trace is not None:
+        trace.fields.update(fields)
+
+def active():
+    """Whether the current request is being timed (to skip work only needed for the log)"""
+    return _local.trace is not None
+
+class TimingMiddleware:
+    """
+    WSGI middleware timing each request. Adds a Server-Timing header with the phases recorded
+    before the response starts, and logs one JSON line per sampled (or slow) request once the
+    body has been sent, with the phases, status, response bytes and annotated fields.
+    """
+
+    def __init__(self, app, logger=None, sample_rate=ACCESS_LOG_SAMPLE_RATE, slow_ms=SLOW_REQUEST_MS):
+        self.app = app
+        self.logger = logger or open_access_logger()
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    def __call__(self, environ, start_response):
+        trace = RequestTrace()
+
+        def timed_start_response(status, headers, exc_info=None):
+            trace.status = int(status.split(' ', 1)[0])
+            trace.response_seconds = trace.elapsed()
+            headers = list(headers)
+            headers.append(('Server-Timing', trace.server_timing(trace.response_seconds)))
+            headers.append(('Timing-Allow-Origin', '*'))
+            for name, value in headers:
+                if name.lower() == 'content-length':
+                    trace.fields.setdefault('content_length', int(value))
+            return start_response(status, headers, exc_info)
+
+        _local.trace = trace
+        try:
+            body = self.app(environ, timed_start_response)
+        except BaseException:
+            _local.trace = None
+            raise
+
+        # Bodies already in memory are measured now; streamed bodies as they are sent
+        if isinstance(body, (list, tuple)):
+            _local.trace = None
+            self.finish(trace, environ, sum(map(len, body)))
+            return body
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if isinstance(file_wrapper, type) and isinstance(body, file_wrapper):
+            # Left unwrapped so the server can still sendfile() it
+            _local.trace = None
+            self.finish(trace, environ, trace.fields.get('content_length'))
+            return body
+        _local.trace = None
+        return TimedBody(self, trace, environ, body)
+
+    def finish(self, trace, environ, sent_bytes):
+        """Write the access log line if the request is sampled or slow"""
+        total = trace.elapsed()
+        slow = total * 1000 >= self.slow_ms
+        if not slow and random.random() >= self.sample_rate:
+            return
+        entry = {
+            "time": datetime.utcnow().isoformat() + "Z",
+            "method": environ.get('REQUEST_METHOD'),
+            "path": environ.get('PATH_INFO'),
+            "query": environ.get('QUERY_STRING') or None,
+            "status": trace.status,
+            "duration_ms": round(total * 1000, 2),
+            "response_ms": round((trace.response_seconds or total) * 1000, 2),
+            "phases": {name: round(seconds * 1000, 3) for name, seconds in trace.phases.items()},
+            "bytes": sent_bytes,
+            "slow": slow
+        }
+        entry.update(trace.fields)
+        self.logger.info(json.dumps(entry, separators=(',', ':')))
+
+class TimedBody:
+    """A streamed response body that counts the bytes sent and logs the request when closed"""
+
+    def __init__(self, middleware, trace, environ, body):
+        self.middleware = middleware
+        self.trace = trace
+        self.environ = environ
+        self.body = body
+        self.sent_bytes = 0
+
+    def __iter__(self):
+        iterator = iter(self.body)
+        while True:
+            # Phases recorded while the body is generated belong to this request
+            _local.trace = self.trace
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _local.trace = None
+            self.sent_bytes += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            if hasattr(self.body, 'close'):
+                self.body.close()
+        finally:
+            self.middleware.finish(self.trace, self.environ, self.sent_bytes)
+
+def open_access_logger():
+    """The access logger, writing bare JSON lines to stdout unless logging is configured elsewhere"""
+    logger = logging.getLogger(ACCESS_LOGGER_NAME)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+def instrument(app):
+    """Wrap a WSGI app with request timing when it is enabled; otherwise return it unchanged"""
+    if not REQUEST_TIMING_ENABLED:
+        return app
+    return TimingMiddleware(app)
@@ -0,0 +1,88 @@
+# coding=utf-8
+
+# Gzip compression of route responses, as WSGI middleware. Bottle applies a route's return
+# value after its after_request hooks have run, so the body can only be compressed once the
+# app has produced it. Bodies already in memory are compressed; streamed bodies (generators,
+# open files sent with wsgi.file_wrapper), partial and already-encoded responses pass through.
+
+import gzip
+
+import request_timing
+
+# Smaller bodies aren't worth compressing (or a Vary header that splits shared caches)
+MIN_COMPRESS_BYTES = 1024
+COMPRESS_LEVEL = 6
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+
+def get_header(headers, name):
+    """A header's value from a WSGI header list, or None"""
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+def set_header(headers, name, value):
+    """Replace a header in a WSGI header list (or add it)"""
+    headers[:] = [(key, old) for key, old in headers if key.lower() != name.lower()]
+    headers.append((name, value))
+
+def add_vary(headers, header):
+    """Add a request header to the Vary header in a WSGI header list"""
+    vary = get_header(headers, 'Vary')
+    if not vary:
+        set_header(headers, 'Vary', header)
+    elif header.lower() not in (name.strip().lower() for name in vary.split(',')):
+        set_header(headers, 'Vary', vary + ', ' + header)
+
+class GzipMiddleware:
+    """
+    WSGI middleware gzipping compressible in-memory response bodies of at least min_bytes for
+    clients that accept it. Only responses that are compressed for those clients get
+    Vary: Accept-Encoding, so shared caches don't split identical bytes.
+    The wrapped app must not use the write() callable (Bottle never does).
+    """
+
+    def __init__(self, app, min_bytes=MIN_COMPRESS_BYTES, compress_level=COMPRESS_LEVEL):
+        self.app = app
+        self.min_bytes = min_bytes
+        self.compress_level = compress_level
+
+    def __call__(self, environ, start_response):
+        started = []
+
+        def buffered_start_response(status, headers, exc_info=None):
+            started[:] = [status, list(headers), exc_info]
+
+        body = self.app(environ, buffered_start_response)
+        status, headers, exc_info = started
+
+        if self.compressible(environ, status, headers, body):
+            data = b''.join(body)
+            if len(data) >= self.min_bytes:
+                add_vary(headers, 'Accept-Encoding')
+                if 'gzip' in environ.get('HTTP_ACCEPT_ENCODING', ''):
+                    with request_timing.phase('compress'):
+                        compressed = gzip.compress(data, compresslevel=self.compress_level)
+                    if len(compressed) < len(data):
+                        data = compressed
+                        set_header(headers, 'Content-Encoding', 'gzip')
+                        set_header(headers, 'Content-Length', str(len(data)))
+                        # The bytes differ from the unencoded response's, so a strong ETag becomes weak
+                        etag = get_header(headers, 'ETag')
+                        if etag and not etag.startswith('W/'):
+                            set_header(headers, 'ETag', 'W/' + etag)
+            body = [data]
+
+        start_response(status, headers, exc_info)
+        return body
+
+    @staticmethod
+    def compressible(environ, status, headers, body):
+        """Whether a response is a whole, unencoded, compressible body held in memory"""
+        if environ.get('REQUEST_METHOD') == 'HEAD' or not status.startswith('200'):
+            return False
+        if not isinstance(body, (list, tuple)) or get_header(headers, 'Content-Encoding'):
+            return False
+        content_type = get_header(headers, 'Content-Type') or ''
+        return content_type.startswith(COMPRESSIBLE_TYPES)
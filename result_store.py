@@ -0,0 +1,356 @@
+# coding=utf-8
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+from collections import Counter, OrderedDict
+from urllib.parse import unquote
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; host-wide coalescing is disabled there
+    fcntl = None
+
+# Persistent result store settings (the store is disabled unless a path is configured)
+RESULT_STORE_PATH = os.environ.get('ELEMENT_WORDS_RESULT_STORE', '')
+RESULT_STORE_MAX_BYTES = int(os.environ.get('ELEMENT_WORDS_RESULT_STORE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Evict down to this fraction of the size limit, so eviction doesn't run on every write
+EVICTION_TARGET = 0.9
+EVICTION_BATCH = 256
+
+# Only refresh an entry's access time when it is older than this, to keep reads read-only
+TOUCH_INTERVAL = 60
+
+COMPRESSION_LEVEL = 6
+
+# Keys are hashed onto this many lock files for host-wide coalescing
+HOST_LOCK_STRIPES = 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, size) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results BEGIN
+    UPDATE totals SET size = size + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results BEGIN
+    UPDATE totals SET size = size - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS results_update AFTER UPDATE OF size ON results BEGIN
+    UPDATE totals SET size = size - OLD.size + NEW.size WHERE id = 0;
+END;
+"""
+
+# Word lookups in access logs, e.g. "GET /api/v1/words/hero?allow_reversed_symbols=true HTTP/1.1"
+ACCESS_LOG_PATTERN = re.compile(r'/api/v1/words/([^/?\s"]+)(\?[^\s"]*)?')
+
+def result_key(word, reverse_symbols=False, symbol_set_digest=None):
+    """Build the store key for a normalized word and its options (custom symbol sets by digest)"""
+    key = f"{word.lower()}|reversed={int(bool(reverse_symbols))}"
+    if symbol_set_digest:
+        key += f"|symbols={symbol_set_digest}"
+    return key
+
+class LRUCache:
+    """Thread-safe in-memory cache holding at most max_entries, least recently used evicted first"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Cache a value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every cached value"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class ResultStore:
+    """
+    SQLite-backed store of compressed word results, shared by every worker process on the host.
+    Uses WAL mode so readers never block on writers, and evicts least recently used
+    entries once the stored size exceeds max_bytes.
+    """
+
+    def __init__(self, path, max_bytes=RESULT_STORE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+        # Resynchronize the tracked total, in case it drifted (stores written by older versions)
+        connection.execute('UPDATE totals SET size = (SELECT COALESCE(SUM(size), 0) FROM results) WHERE id = 0')
+
+    def _connection(self):
+        """Get this thread's connection, reconnecting after a fork"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key):
+        """Return the stored result for key, or None"""
+        value = self.get_serialized(key)
+        return None if value is None else json.loads(value)
+
+    def get_serialized(self, key):
+        """Return the stored result for key as JSON text, or None"""
+        connection = self._connection()
+        row = connection.execute('SELECT value, accessed FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        value, accessed = row
+        now = time.time()
+        if now - accessed > TOUCH_INTERVAL:
+            connection.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+        return zlib.decompress(value).decode('utf-8')
+
+    def put(self, key, result):
+        """Store a result, evicting old entries if the store is over its size limit"""
+        self.put_serialized(key, json.dumps(result, separators=(',', ':')))
+
+    def put_serialized(self, key, value):
+        """Store a result that is already JSON text"""
+        value = zlib.compress(value.encode('utf-8'), COMPRESSION_LEVEL)
+        connection = self._connection()
+        # An upsert, so replacing an entry fires the update trigger (INSERT OR REPLACE deletes
+        # without firing the delete trigger, and the tracked total would drift upwards)
+        connection.execute(
+            'INSERT INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, accessed = excluded.accessed',
+            (key, value, len(value), time.time())
+        )
+        if self.size() > self.max_bytes:
+            self.evict()
+
+    def size(self):
+        """Total compressed size of all stored results in bytes"""
+        return self._connection().execute('SELECT size FROM totals WHERE id = 0').fetchone()[0]
+
+    def count(self):
+        """Number of stored results"""
+        return self._connection().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def evict(self):
+        """Delete least recently used entries until the store is back under its target size"""
+        connection = self._connection()
+        target = self.max_bytes * EVICTION_TARGET
+        while self.size() > target:
+            deleted = connection.execute(
+                'DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed LIMIT ?)',
+                (EVICTION_BATCH,)
+            ).rowcount
+            if not deleted:
+                break
+
+    def clear(self):
+        """Delete every stored result"""
+        self._connection().execute('DELETE FROM results')
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the computation
+    and every caller that arrives while it is in flight waits for and shares its result.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        # Callers currently waiting on another caller's computation
+        self.waiting = 0
+
+    def do(self, key, function):
+        """Return function(), or the result of the identical call already in flight for key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = InFlightCall()
+            else:
+                self.waiting += 1
+        
+        if not leader:
+            try:
+                call.done.wait()
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = function()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def __len__(self):
+        return len(self._calls)
+
+class InFlightCall:
+    """A computation in progress, with its result once done"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class HostLocks:
+    """
+    Advisory file locks serializing work on a key across every worker process on this host.
+    Keys are hashed onto a fixed set of lock files, so the directory never grows.
+    """
+
+    def __init__(self, directory, stripes=HOST_LOCK_STRIPES):
+        self.directory = directory
+        self.stripes = stripes
+        os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def hold(self, key):
+        """Hold the lock for key (blocking until other processes release it)"""
+        stripe = zlib.crc32(key.encode('utf-8')) % self.stripes
+        with open(os.path.join(self.directory, f"{stripe}.lock"), 'a') as f:
+            # Closing the file releases the lock, even if the holder crashes
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+def open_result_store():
+    """Open the configured result store, or return None when it is disabled"""
+    if not RESULT_STORE_PATH:
+        return None
+    return ResultStore(RESULT_STORE_PATH)
+
+def open_host_locks():
+    """Open locks for coalescing across workers, kept next to the result store they fill"""
+    if not RESULT_STORE_PATH or fcntl is None:
+        return None
+    return HostLocks(RESULT_STORE_PATH + '.locks')
+
+def read_word_list(path):
+    """Read (word, reverse_symbols) pairs from a word list, one word per line"""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            word = line.strip()
+            if word:
+                yield word, False
+
+def read_access_log(path, top=None):
+    """
+    Read the most requested (word, reverse_symbols) pairs from an access log: router or server
+    logs with request lines, or the app's own JSON access log
+    """
+    counts = Counter()
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if line.startswith('{'):
+                # JSON access log entries have the path and query string in separate fields
+                try:
+                    entry = json.loads(line)
+                    line = entry["path"] + ('?' + entry["query"] if entry.get("query") else '')
+                except (ValueError, KeyError, TypeError):
+                    continue
+            for match in ACCESS_LOG_PATTERN.finditer(line):
+                # Normalize like the API does, so HeRo, hero and he-ro count together
+                word = ''.join(c for c in unquote(match.group(1)) if c.isalpha()).lower()
+                if word:
+                    reverse_symbols = 'allow_reversed_symbols=true' in (match.group(2) or '').lower()
+                    counts[(word, reverse_symbols)] += 1
+    return [pair for pair, _ in counts.most_common(top)]
+
+def main(argv=None):
+    """Command line interface for managing the result store"""
+    parser = argparse.ArgumentParser(description="Manage the Element Words persistent result store")
+    parser.add_argument('--store', default=RESULT_STORE_PATH, help="Path to the SQLite store (default: $ELEMENT_WORDS_RESULT_STORE)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    warm_parser = subparsers.add_parser('warm', help="Precompute results into the store")
+    source = warm_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--words', help="Word list, one word per line")
+    source.add_argument('--access-log', help="Access log to take the most requested words from")
+    warm_parser.add_argument('--top', type=int, default=None, help="Only warm the N most requested words (access logs)")
+    warm_parser.add_argument('--reversed', action='store_true', help="Also warm results with reversed symbols allowed")
+    warm_parser.add_argument('--workers', type=int, default=1, help="Words warmed at a time (default: 1)")
+    warm_parser.add_argument('--budget', type=float, default=None, help="Stop starting new words after this many seconds")
+
+    subparsers.add_parser('stats', help="Show store size and entry count")
+    subparsers.add_parser('clear', help="Delete every stored result")
+
+    args = parser.parse_args(argv)
+    if not args.store:
+        parser.error("no store configured (use --store or ELEMENT_WORDS_RESULT_STORE)")
+
+    store = ResultStore(args.store)
+
+    if args.command == 'stats':
+        print(f"{store.count()} results, {store.size()} bytes (limit {store.max_bytes})")
+    elif args.command == 'clear':
+        store.clear()
+        print("Store cleared")
+    elif args.command == 'warm':
+        # Imported here so the store itself has no web dependencies
+        import cache_warmup
+        import main as element_words
+
+        if args.words:
+            pairs = list(read_word_list(args.words))
+        else:
+            pairs = read_access_log(args.access_log, args.top)
+        if args.reversed:
+            pairs = list(dict.fromkeys(pairs + [(word, True) for word, _ in pairs]))
+
+        progress = cache_warmup.warm_up(
+            pairs,
+            lambda word, reverse_symbols: element_words.warm_word_result(word, reverse_symbols, store),
+            args.workers,
+            args.budget
+        )
+        print(progress.summary())
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,396 @@
+# coding=utf-8
+
+# The element spelling engine, importable without the web app: spellings of a word are paths
+# through its symbol lattice, which are enumerated, counted, ranked, sampled and summarized here.
+# Only the standard library is used, so batch jobs can import it in a few milliseconds.
+# Words are matched case-insensitively; anything but letters makes a word unspellable (see
+# normalize_word). Every function takes the keyword-only options symbol_set (a compiled set) or,
+# when none is given, reverse_symbols to pick the element symbols with or without reversed ones.
+
+import sys
+import time
+import random
+import functools
+
+import packed_solutions
+import symbol_sets
+
+# Lattices and statistics of recently solved words, and token tables of symbol sets, per process
+WORD_CACHE_SIZE = 1024
+SYMBOL_SET_CACHE_SIZE = 256
+
+# List of all element symbols
+ELEMENTS = {"H": "Hydrogen", "He": "Helium", "Li": "Lithium", "Be": "Beryllium", "B": "Boron", "C": "Carbon", "N": "Nitrogen", "O": "Oxygen", "F": "Fluorine", "Ne": "Neon", "Na": "Sodium", "Mg": "Magnesium", "Al": "Aluminium", "Si": "Silicon", "P": "Phosphorus", "S": "Sulfur", "Cl": "Chlorine", "Ar": "Argon", "K": "Potassium", "Ca": "Calcium", "Sc": "Scandium", "Ti": "Titanium", "V": "Vanadium", "Cr": "Chromium", "Mn": "Manganese", "Fe": "Iron", "Co": "Cobalt", "Ni": "Nickel", "Cu": "Copper", "Zn": "Zinc", "Ga": "Gallium", "Ge": "Germanium", "As": "Arsenic", "Se": "Selenium", "Br": "Bromine", "Kr": "Krypton", "Rb": "Rubidium", "Sr": "Strontium", "Y": "Yttrium", "Zr": "Zirconium", "Nb": "Niobium", "Mo": "Molybdenum", "Tc": "Technetium", "Ru": "Ruthenium", "Rh": "Rhodium", "Pd": "Palladium", "Ag": "Silver", "Cd": "Cadmium", "In": "Indium", "Sn": "Tin", "Sb": "Antimony", "Te": "Tellurium", "I": "Iodine", "Xe": "Xenon", "Cs": "Cesium", "Ba": "Barium", "La": "Lanthanum", "Ce": "Cerium", "Pr": "Praseodymium", "Nd": "Neodymium", "Pm": "Promethium", "Sm": "Samarium", "Eu": "Europium", "Gd": "Gadolinium", "Tb": "Terbium", "Dy": "Dysprosium", "Ho": "Holmium", "Er": "Erbium", "Tm": "Thulium", "Yb": "Ytterbium", "Lu": "Lutetium", "Hf": "Hafnium", "Ta": "Tantalum", "W": "Tungsten", "Re": "Rhenium", "Os": "Osmium", "Ir": "Iridium", "Pt": "Platinum", "Au": "Gold", "Hg": "Mercury", "Tl": "Thallium", "Pb": "Lead", "Bi": "Bismuth", "Po": "Polonium", "At": "Astatine", "Rn": "Radon", "Fr": "Francium", "Ra": "Radium", "Ac": "Actinium", "Th": "Thorium", "Pa": "Protactinium", "U": "Uranium", "Np": "Neptunium", "Pu": "Plutonium", "Am": "Americium", "Cm": "Curium", "Bk": "Berkelium", "Cf": "Californium", "Es": "Einsteinium", "Fm": "Fermium", "Md": "Mendelevium", "No": "Nobelium", "Lr": "Lawrencium", "Rf": "Rutherfordium", "Db": "Dubnium", "Sg": "Seaborgium", "Bh": "Bohrium", "Hs": "Hassium", "Mt": "Meitnerium", "Ds": "Darmstadtium", "Rg": "Roentgenium", "Cn": "Copernicium", "Nh": "Nihonium", "Fl": "Flerovium", "Mc": "Moscovium", "Lv": "Livermorium", "Ts": "Tennessine", "Og": "Oganesson"}
+ELEMENT_SYMBOLS = list(ELEMENTS.keys())
+
+def element_entries(max_atomic_number=None):
+    """
+    Symbol set entries (symbol, name, atomic number) for the first max_atomic_number elements.
+    Past the known elements, systematic placeholder symbols are used (119 is Uue, Ununennium).
+    """
+    if max_atomic_number is None:
+        max_atomic_number = len(ELEMENT_SYMBOLS)
+    entries = []
+    for atomic_number in range(1, max_atomic_number + 1):
+        if atomic_number <= len(ELEMENT_SYMBOLS):
+            symbol = ELEMENT_SYMBOLS[atomic_number - 1]
+            entries.append((symbol, ELEMENTS[symbol], atomic_number))
+        else:
+            entries.append((symbol_sets.placeholder_symbol(atomic_number), symbol_sets.placeholder_name(atomic_number), atomic_number))
+    return entries
+
+# Compiled element symbol sets, without and with reversed symbols
+DEFAULT_SYMBOL_SETS = {
+    False: symbol_sets.compile_symbol_set(element_entries(), reverse_symbols=False),
+    True: symbol_sets.compile_symbol_set(element_entries(), reverse_symbols=True)
+}
+
+def resolve_symbol_set(reverse_symbols=False, symbol_set=None):
+    """Get the symbol set to solve with: the given one, or the element set for the reversed option"""
+    return symbol_set if symbol_set is not None else DEFAULT_SYMBOL_SETS[reverse_symbols]
+
+def normalize_word(word):
+    """The lowercase letters of a word, as the solver expects it"""
+    return ''.join(c for c in word if c.isalpha()).lower()
+
+def calculate_solution_score(elements_data):
+    """Calculate the total score for a solution based on atomic numbers"""
+    total_score = 0
+    for element in elements_data:
+        atomic_number = element["atomic_number"]
+        if element["reversed"]:
+            # For reversed symbols, reverse the digits of the atomic number
+            # E.g., 118 becomes 811
+            reversed_atomic_number = int(str(atomic_number)[::-1])
+            total_score += reversed_atomic_number
+        else:
+            total_score += atomic_number
+    return total_score
+
+def format_elements(symbols_tuple, symbol_set):
+    """Element data for the symbols of one solution"""
+    # Map symbols back to original (non-reversed) symbols for element data
+    # and track which symbols were reversed
+    elements_data = []
+    for symbol in symbols_tuple:
+        original_symbol, is_reversed = symbol_set.tokens[symbol]
+        name, atomic_number = symbol_set.info[original_symbol]
+        elements_data.append({
+            "symbol": original_symbol,
+            "name": name,
+            "atomic_number": atomic_number,
+            "reversed": is_reversed
+        })
+    return elements_data
+
+def format_solution(text_repr, symbols_tuple, symbol_set):
+    """Format one solution (representation and symbols) for the API"""
+    elements_data = format_elements(symbols_tuple, symbol_set)
+    
+    # Calculate score for this solution
+    score = calculate_solution_score(elements_data)
+    
+    return {
+        "representation": text_repr,
+        "symbols": list(symbols_tuple),
+        "elements": elements_data,
+        "score": score
+    }
+
+@functools.lru_cache(maxsize=SYMBOL_SET_CACHE_SIZE)
+def get_token_table(symbol_set):
+    """Shared, immutable element data and scores for every token of a symbol set"""
+    return packed_solutions.TokenTable(symbol_set, symbol_score)
+
+def find_combinations(word, path="", symbols=None, *, symbol_set=None, reverse_symbols=False):
+    """
+    Find valid combinations of symbols forming the word.
+    Returns a list of tuples, where each tuple contains:
+      - A string representation of the solution (prefixed by path).
+      - A tuple of element symbols used to form the solution (prefixed by symbols).
+    """
+    symbol_set = resolve_symbol_set(reverse_symbols, symbol_set)
+    prefix = tuple(symbols or ())
+    return [
+        (path + text_repr, prefix + symbols_tuple)
+        for text_repr, symbols_tuple in iter_solutions(word, symbol_set=symbol_set)
+    ]
+
+# Symbol lattice: spellings of a word are the paths from position 0 to its end
+@functools.lru_cache(maxsize=WORD_CACHE_SIZE)
+def build_counted_lattice(word, symbol_set):
+    """
+    Build a lowercase word's symbol lattice on the compiled symbol set, with the number
+    of spellings of each suffix word[i:] (so dead ends can be skipped)
+    """
+    lattice = symbol_set.lattice(word)
+    counts = [0] * (len(word) + 1)
+    counts[len(word)] = 1
+    for i in range(len(word) - 1, -1, -1):
+        counts[i] = sum(counts[end] for end, _, _, _ in lattice[i])
+    return lattice, counts
+
+def count_solutions(word, *, symbol_set=None, reverse_symbols=False):
+    """Number of spellings of a word, without enumerating them"""
+    symbol_set = resolve_symbol_set(reverse_symbols, symbol_set)
+    return build_counted_lattice(word.lower(), symbol_set)[1][0]
+
+def iter_solutions(word, *, symbol_set=None, reverse_symbols=False):
+    """
+    Yield (representation, symbols) for every spelling of a word, depth first
+    in lattice order (shorter symbols first, normal before reversed), never entering dead ends
+    """
+    for path in iter_solution_paths(word, symbol_set=symbol_set, reverse_symbols=reverse_symbols):
+        yield ''.join(path), tuple(path)
+
+def iter_solution_paths(word, *, symbol_set=None, reverse_symbols=False):
+    """
+    Like iter_solutions, but yield the tokens of each spelling as one list that is changed
+    in place as the search goes on (callers copy what they keep)
+    """
+    symbol_set = resolve_symbol_set(reverse_symbols, symbol_set)
+    lattice, counts = build_counted_lattice(word.lower(), symbol_set)
+    return iter_lattice_paths(lattice, counts)
+
+def iter_lattice_paths(lattice, counts, start=0):
+    """
+    Yield the tokens of every path from position start to the end of a lattice, depth first,
+    skipping edges into positions with no paths to the end (counts[i] is the number from i).
+    The same list is yielded each time, changed in place.
+    """
+    length = len(lattice)
+    if not counts[start]:
+        return
+    path = []
+    if start == length:
+        yield path
+        return
+    
+    stack = [iter(lattice[start])]
+    while stack:
+        for end, token, _, _ in stack[-1]:
+            if not counts[end]:
+                continue
+            path.append(token)
+            if end == length:
+                yield path
+                path.pop()
+                continue
+            stack.append(iter(lattice[end]))
+            break
+        else:
+            # This position is exhausted; step back out of the symbol that led here
+            stack.pop()
+            if path:
+                path.pop()
+
+def pack_solutions(word, *, symbol_set=None, reverse_symbols=False):
+    """
+    Every spelling of a word in a packed SolutionList, in lattice order
+    (sort_by_length() puts it in the API's order, fewest elements first)
+    """
+    symbol_set = resolve_symbol_set(reverse_symbols, symbol_set)
+    solutions = packed_solutions.SolutionList(get_token_table(symbol_set))
+    for path in iter_solution_paths(word, symbol_set=symbol_set):
+        solutions.append(path)
+    return solutions
+
+def top_solutions(word, top_size, *, symbol_set=None, reverse_symbols=False):
+    """
+    Find the first top_size solutions of the sorted listing (fewest elements first, ties in
+    lattice order) without enumerating the rest. Keeps the best top_size paths of each suffix,
+    built right to left: extending a suffix by one edge preserves its order.
+    Returns (total solution count, formatted solutions).
+    """
+    symbol_set = resolve_symbol_set(reverse_symbols, symbol_set)
+    word = word.lower()
+    lattice, counts = build_counted_lattice(word, symbol_set)
+    length = len(word)
+    if not counts[0]:
+        return 0, []
+    
+    best = [None] * (length + 1)
+    best[length] = [()]
+    for i in range(length - 1, -1, -1):
+        candidates = []
+        for edge_index, (end, token, _, _) in enumerate(lattice[i]):
+            for rank, suffix in enumerate(best[end] or ()):
+                candidates.append((len(suffix) + 1, edge_index, rank, (token,) + suffix))
+        candidates.sort(key=lambda x: x[:3])
+        best[i] = [candidate[3] for candidate in candidates[:top_size]]
+    
+    return counts[0], [format_solution(''.join(symbols), symbols, symbol_set) for symbols in best[0]]
+
+# Random sampling of solutions
+def sample_solutions(word, sample_size, seed=None, *, symbol_set=None, reverse_symbols=False):
+    """
+    Draw solutions uniformly at random (with replacement) without enumerating them.
+    Each step takes an edge with probability proportional to the spellings of the rest of the word,
+    so every complete spelling is equally likely and each sample costs O(len(word)).
+    Returns (total solution count, formatted samples); the same seed gives the same samples.
+    """
+    symbol_set = resolve_symbol_set(reverse_symbols, symbol_set)
+    word = word.lower()
+    lattice, counts = build_counted_lattice(word, symbol_set)
+    if not counts[0]:
+        return 0, []
+    
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(sample_size):
+        symbols = []
+        i = 0
+        while i < len(word):
+            pick = rng.randrange(counts[i])
+            for end, symbol, _, _ in lattice[i]:
+                pick -= counts[end]
+                if pick < 0:
+                    break
+            symbols.append(symbol)
+            i = end
+        samples.append(format_solution(''.join(symbols), tuple(symbols), symbol_set))
+    return counts[0], samples
+
+# Solution statistics (computed over the symbol lattice, without enumerating spellings)
+def symbol_score(atomic_number, is_reversed):
+    """Score one symbol like calculate_solution_score (reversed symbols reverse the digits)"""
+    return int(str(atomic_number)[::-1]) if is_reversed else atomic_number
+
+def shift_add(target, histogram, offset):
+    """Add a histogram shifted by offset into target (one term of a polynomial product)"""
+    for value, count in histogram.items():
+        key = value + offset
+        target[key] = target.get(key, 0) + count
+
+def histogram_entries(histogram, name):
+    """Format a histogram as a list of {name: value, count} in value order"""
+    return [{name: value, "count": histogram[value]} for value in sorted(histogram)]
+
+def summarize_histogram(histogram, name, total):
+    """Min, max, mean and histogram of a value over all spellings"""
+    if not total:
+        return {"min": None, "max": None, "mean": None, "histogram": []}
+    return {
+        "min": min(histogram),
+        "max": max(histogram),
+        "mean": round(sum(value * count for value, count in histogram.items()) / total, 2),
+        "histogram": histogram_entries(histogram, name)
+    }
+
+@functools.lru_cache(maxsize=WORD_CACHE_SIZE)
+def compute_word_stats(word, *, symbol_set=None, reverse_symbols=False):
+    """
+    Compute statistics over every spelling of a word without enumerating them.
+    Spellings are paths through the word's symbol lattice (an edge per symbol matching word[i:j]).
+    Score and element count histograms of each suffix are polynomials, built right to left by
+    convolving each edge with the histogram at its end. A symbol's usage is the number of paths
+    through its edges: paths reaching the edge's start times paths leaving its end.
+    """
+    symbol_set = resolve_symbol_set(reverse_symbols, symbol_set)
+    word = word.lower()
+    length = len(word)
+    edges = [
+        [(end, element_symbol, is_reversed, symbol_score(symbol_set.info[element_symbol][1], is_reversed))
+         for end, _, element_symbol, is_reversed in position_edges]
+        for position_edges in build_counted_lattice(word, symbol_set)[0]
+    ]
+    
+    # Score and element count histograms over the spellings of word[i:]
+    scores = [{} for _ in range(length + 1)]
+    sizes = [{} for _ in range(length + 1)]
+    scores[length][0] = 1
+    sizes[length][0] = 1
+    for i in range(length - 1, -1, -1):
+        for end, _, _, score in edges[i]:
+            shift_add(scores[i], scores[end], score)
+            shift_add(sizes[i], sizes[end], 1)
+    suffix_counts = [sum(histogram.values()) for histogram in sizes]
+    
+    # Spellings of word[:i], then usage of each element across all spellings
+    prefix_counts = [0] * (length + 1)
+    prefix_counts[0] = 1
+    usage = {}
+    for i in range(length):
+        if not prefix_counts[i]:
+            continue
+        for end, element_symbol, is_reversed, _ in edges[i]:
+            prefix_counts[end] += prefix_counts[i]
+            paths = prefix_counts[i] * suffix_counts[end]
+            if paths:
+                entry = usage.setdefault(element_symbol, [0, 0])
+                entry[0] += paths
+                if is_reversed:
+                    entry[1] += paths
+    
+    total = suffix_counts[0]
+    element_usage = [
+        {
+            "symbol": element_symbol,
+            "name": symbol_set.info[element_symbol][0],
+            "atomic_number": symbol_set.info[element_symbol][1],
+            "count": count,
+            "reversed_count": reversed_count
+        }
+        for element_symbol, (count, reversed_count) in usage.items()
+    ]
+    element_usage.sort(key=lambda x: (-x["count"], x["atomic_number"]))
+    
+    return {
+        "input_word": word,
+        "solution_count": total,
+        "score": summarize_histogram(scores[0], "score", total),
+        "element_count": summarize_histogram(sizes[0], "elements", total),
+        "element_usage": element_usage
+    }
+
+def time_import(module, repeat=5):
+    """Fastest time in seconds to import module in a fresh interpreter (excluding its startup)"""
+    # Imported here to keep them out of the solver's own import time
+    import os
+    import subprocess
+
+    code = f"import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)"
+    # Bytecode is cached (by the first run), as when deployed, so later runs don't time compilation
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    times = []
+    for _ in range(repeat + 1):
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env)
+        times.append(float(result.stdout.split()[-1]))
+    return min(times[1:])
+
+def time_call(function, repeat):
+    """Median time in seconds of a call to function, with the word caches cleared before each"""
+    times = []
+    for _ in range(repeat):
+        build_counted_lattice.cache_clear()
+        compute_word_stats.cache_clear()
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    times.sort()
+    return times[len(times) // 2]
+
+def benchmark(words, repeat=20):
+    """Print the import time of the solver (and of the web app, for comparison) and per-call latencies for words"""
+    for module in ('solver', 'main'):
+        try:
+            print(f"import {module}: {time_import(module) * 1000:.1f} ms")
+        except Exception:
+            print(f"import {module}: failed")
+    
+    calls = [
+        ('count', lambda word: count_solutions(word)),
+        ('top 5', lambda word: top_solutions(word, 5)),
+        ('sample 5', lambda word: sample_solutions(word, 5, 0)),
+        ('stats', lambda word: compute_word_stats(word)),
+        ('iterate', lambda word: sum(1 for _ in iter_solution_paths(word))),
+        ('pack', lambda word: pack_solutions(word))
+    ]
+    for word in words:
+        word = normalize_word(word)
+        timings = ', '.join(f"{name} {time_call(lambda: call(word), repeat) * 1e6:.0f} us" for name, call in calls)
+        print(f"{word} ({count_solutions(word)} spellings): {timings}")
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1:] or ['bacon', 'nonconservationist', 'hypersensitivitieshypersensitivities'])
@@ -0,0 +1,234 @@
+# coding=utf-8
+
+# In-memory static file cache. Each file is read and hashed once; after that its
+# response headers are precomputed and small files are answered straight from memory.
+# Large files are returned as open files, which the WSGI server sends with
+# wsgi.file_wrapper (zero-copy sendfile on servers that support it). Compressible files
+# held in memory are gzipped once too, and that copy is served to clients accepting it.
+
+import os
+import gzip
+import hashlib
+import mimetypes
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+
+# Files up to this size are held in memory, up to a total budget per process
+MAX_MEMORY_FILE_BYTES = 256 * 1024
+MAX_MEMORY_BYTES = 32 * 1024 * 1024
+
+# Read size for byte ranges of files that aren't held in memory
+RANGE_CHUNK_SIZE = 64 * 1024
+
+ETAG_LENGTH = 16
+
+# Files held in memory are also kept gzipped when they are at least this big and of these types
+MIN_GZIP_BYTES = 1024
+GZIP_CONTENT_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+
+class StaticFile:
+    """
+    A static file's metadata, precomputed headers, and content when held in memory (plus
+    its gzipped content, when that is smaller)
+    """
+
+    def __init__(self, path, size, mtime, etag, content_type, data=None, gzip_data=None):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.etag = etag
+        self.data = data
+        self.gzip_data = gzip_data
+        # Each encoding is a different representation, so it needs its own strong ETag
+        self.gzip_etag = etag[:-1] + '-gzip"'
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.headers = {
+            'Content-Type': content_type,
+            'ETag': etag,
+            'Last-Modified': self.last_modified,
+            'Accept-Ranges': 'bytes'
+        }
+
+class StaticFileCache:
+    """
+    Cache of StaticFile entries for the files under root, loaded on first request.
+    Entries live for the life of the process (static files only change on deploy).
+    """
+
+    def __init__(self, root, max_file_bytes=MAX_MEMORY_FILE_BYTES, max_memory_bytes=MAX_MEMORY_BYTES):
+        self.root = os.path.abspath(root)
+        self.max_file_bytes = max_file_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self.memory_used = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, filepath, mimetype=None):
+        """Get the entry for a path under root (optionally served as mimetype), or None if missing"""
+        key = (filepath, mimetype)
+        entry = self._entries.get(key)
+        if entry is None:
+            path = os.path.abspath(os.path.join(self.root, filepath.strip('/\\')))
+            # Never serve anything outside the root
+            if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+                return None
+            entry = self._load(path, mimetype)
+            with self._lock:
+                entry = self._entries.setdefault(key, entry)
+        return entry
+
+    def _load(self, path, mimetype):
+        """Read and hash a file, keeping its content if it fits the memory budget"""
+        digest = hashlib.sha256()
+        data = None
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            if stat.st_size <= self.max_file_bytes:
+                data = f.read()
+                digest.update(data)
+            else:
+                for chunk in iter(lambda: f.read(RANGE_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+
+        content_type = mimetype or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if (content_type.startswith('text/') or content_type == 'application/javascript') and 'charset' not in content_type:
+            content_type += '; charset=UTF-8'
+
+        # Precompressed sidecars (.gz) are served as they are
+        gzip_data = None
+        if (data is not None and len(data) >= MIN_GZIP_BYTES and not path.endswith('.gz')
+                and content_type.startswith(GZIP_CONTENT_TYPES)):
+            gzip_data = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(gzip_data) >= len(data):
+                gzip_data = None
+
+        if data is not None:
+            with self._lock:
+                held = len(data) + (len(gzip_data) if gzip_data is not None else 0)
+                if self.memory_used + held <= self.max_memory_bytes:
+                    self.memory_used += held
+                else:
+                    data = gzip_data = None
+
+        etag = '"' + digest.hexdigest()[:ETAG_LENGTH] + '"'
+        return StaticFile(path, stat.st_size, stat.st_mtime, etag, content_type, data, gzip_data)
+
+    def clear(self):
+        """Forget every entry (e.g. after static files change on disk)"""
+        with self._lock:
+            self._entries.clear()
+            self.memory_used = 0
+
+def add_vary(headers, header):
+    """Add a request header to the Vary header in a headers dict"""
+    vary = headers.get('Vary')
+    if not vary:
+        headers['Vary'] = header
+    elif header.lower() not in (name.strip().lower() for name in vary.split(',')):
+        headers['Vary'] = vary + ', ' + header
+
+def etag_matches(header, etag):
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    return any(tag.strip() in (etag, 'W/' + etag, '*') for tag in header.split(','))
+
+def not_modified_since(header, mtime):
+    """Check whether a file is unmodified since an If-Modified-Since date"""
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+def parse_range(header, size):
+    """
+    Parse a single byte range (bytes=a-b, bytes=a- or bytes=-n) against a file size.
+    Returns (start, end) inclusive, False if it can't be satisfied, or None to ignore the
+    header (malformed or multiple ranges, which are answered with the whole file).
+    """
+    unit, _, ranges = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in ranges:
+        return None
+    first, _, last = ranges.strip().partition('-')
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                return False
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return False
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+def iter_file_range(path, start, length):
+    """Yield length bytes of a file starting at start"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+def respond(entry, environ, headers=None):
+    """
+    Build the response for a static file request, handling If-None-Match, If-Modified-Since,
+    Range and If-Range. Returns (status, headers, body); the body is bytes, an open file
+    (for wsgi.file_wrapper) or an iterator over a byte range.
+    Whole files with a gzipped copy are sent gzipped to clients accepting it (ranges are always
+    of the unencoded file).
+    """
+    response_headers = dict(entry.headers)
+    if headers:
+        response_headers.update(headers)
+
+    gzip_data = None
+    if entry.gzip_data is not None and 'Content-Encoding' not in response_headers:
+        add_vary(response_headers, 'Accept-Encoding')
+        if 'gzip' in environ.get('HTTP_ACCEPT_ENCODING', '') and not environ.get('HTTP_RANGE'):
+            gzip_data = entry.gzip_data
+            response_headers['Content-Encoding'] = 'gzip'
+            response_headers['ETag'] = entry.gzip_etag
+
+    if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, response_headers['ETag'])
+    else:
+        not_modified = not_modified_since(environ.get('HTTP_IF_MODIFIED_SINCE'), entry.mtime)
+    if not_modified:
+        del response_headers['Content-Type']
+        return 304, response_headers, b''
+
+    byte_range = None
+    range_header = environ.get('HTTP_RANGE')
+    if_range = environ.get('HTTP_IF_RANGE')
+    if range_header and (if_range is None or if_range in (entry.etag, entry.last_modified)):
+        byte_range = parse_range(range_header, entry.size)
+
+    if byte_range is False:
+        response_headers['Content-Range'] = f"bytes */{entry.size}"
+        response_headers['Content-Length'] = '0'
+        return 416, response_headers, b''
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response_headers['Content-Range'] = f"bytes {start}-{end}/{entry.size}"
+        response_headers['Content-Length'] = str(length)
+        if entry.data is not None:
+            return 206, response_headers, entry.data[start:end + 1]
+        return 206, response_headers, iter_file_range(entry.path, start, length)
+
+    if gzip_data is not None:
+        response_headers['Content-Length'] = str(len(gzip_data))
+        return 200, response_headers, gzip_data
+
+    response_headers['Content-Length'] = str(entry.size)
+    if entry.data is not None:
+        return 200, response_headers, entry.data
+    return 200, response_headers, open(entry.path, 'rb')
@@ -0,0 +1,119 @@
+# coding=utf-8
+
+# Symbol sets: the tokens words are spelled with (the element symbols by default).
+# Each set is compiled once into a letter trie, so tokens of any length are matched
+# in a single walk from each position, and compiled sets are shared by content hash.
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Compiled sets kept per process (the default element sets are also held by the app)
+MAX_COMPILED_SETS = 256
+
+DIGEST_LENGTH = 16
+
+# Roots of IUPAC systematic element names, by digit (119 -> un-un-enn -> Ununennium, Uue)
+PLACEHOLDER_ROOTS = ['nil', 'un', 'bi', 'tri', 'quad', 'pent', 'hex', 'sept', 'oct', 'enn']
+
+def placeholder_symbol(atomic_number):
+    """Systematic symbol for an element without a name, e.g. 119 -> Uue"""
+    return ''.join(PLACEHOLDER_ROOTS[int(digit)][0] for digit in str(atomic_number)).capitalize()
+
+def placeholder_name(atomic_number):
+    """Systematic name for an element without a name, e.g. 119 -> Ununennium"""
+    name = ''.join(PLACEHOLDER_ROOTS[int(digit)] for digit in str(atomic_number)) + 'ium'
+    # IUPAC elisions: "bi"/"tri" drop their i before "ium", and "enn" drops an n before "nil"
+    return name.replace('iium', 'ium').replace('nnn', 'nn').capitalize()
+
+def symbol_set_digest(entries, reverse_symbols=False):
+    """Content hash identifying a symbol set"""
+    data = json.dumps([list(entries), bool(reverse_symbols)], separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:DIGEST_LENGTH]
+
+class SymbolSet:
+    """
+    An ordered set of spelling tokens compiled into a letter trie.
+    entries are (symbol, name, number) tuples; the number is what solutions are scored by.
+    With reverse_symbols, multi-letter symbols can also be used reversed (e.g. He as eH).
+    """
+
+    def __init__(self, entries, reverse_symbols=False):
+        self.entries = tuple(entries)
+        self.reverse_symbols = bool(reverse_symbols)
+        self.digest = symbol_set_digest(self.entries, self.reverse_symbols)
+        self.info = {symbol: (name, number) for symbol, name, number in self.entries}
+
+        # Tokens in match order: normal symbols first, then reversed ones
+        tokens = OrderedDict((symbol, (symbol, False)) for symbol, _, _ in self.entries)
+        if self.reverse_symbols:
+            for symbol, _, _ in self.entries:
+                if len(symbol) > 1 and symbol[::-1] not in tokens:
+                    tokens[symbol[::-1]] = (symbol, True)
+        self.tokens = tokens
+
+        # Lowercase letter sequence -> (token, symbol, reversed) matches
+        self.lookup = {}
+        for token, (symbol, is_reversed) in tokens.items():
+            self.lookup.setdefault(token.lower(), []).append((token, symbol, is_reversed))
+        self.max_length = max(map(len, self.lookup), default=0)
+
+        # Letter trie; the '' key of a node holds the matches for the letters leading to it
+        self.trie = {}
+        for letters, matches in self.lookup.items():
+            node = self.trie
+            for letter in letters:
+                node = node.setdefault(letter, {})
+            node[''] = matches
+
+    def lattice(self, word):
+        """
+        Build the symbol lattice of a lowercase word: for each position, the
+        (end, token, symbol, reversed) edges of the tokens matching there, shortest first.
+        Spellings of the word are the paths from position 0 to len(word).
+        """
+        trie = self.trie
+        length = len(word)
+        lattice = []
+        for i in range(length):
+            edges = []
+            node = trie
+            for j in range(i, min(length, i + self.max_length)):
+                node = node.get(word[j])
+                if node is None:
+                    break
+                for token, symbol, is_reversed in node.get('', ()):
+                    edges.append((j + 1, token, symbol, is_reversed))
+            lattice.append(edges)
+        return lattice
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __eq__(self, other):
+        return isinstance(other, SymbolSet) and other.digest == self.digest
+
+    def __hash__(self):
+        return hash(self.digest)
+
+_compiled_sets = OrderedDict()
+_compiled_lock = threading.Lock()
+
+def compile_symbol_set(entries, reverse_symbols=False):
+    """Get the compiled symbol set for entries, compiling it only if it isn't cached"""
+    entries = tuple(entries)
+    digest = symbol_set_digest(entries, reverse_symbols)
+    with _compiled_lock:
+        symbol_set = _compiled_sets.get(digest)
+        if symbol_set is not None:
+            _compiled_sets.move_to_end(digest)
+            return symbol_set
+
+    symbol_set = SymbolSet(entries, reverse_symbols)
+    with _compiled_lock:
+        symbol_set = _compiled_sets.setdefault(digest, symbol_set)
+        _compiled_sets.move_to_end(digest)
+        while len(_compiled_sets) > MAX_COMPILED_SETS:
+            _compiled_sets.popitem(last=False)
+    return symbol_set
@@ -0,0 +1,194 @@
+# coding=utf-8
+
+import os
+import sys
+import asyncio
+import inspect
+import threading
+import unittest
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, make_server
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+import solver
+import element_words_client
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class KeepAliveServerHandler(ServerHandler):
+    """Answers in HTTP/1.1, closing the connection after bodies sent without a length"""
+    http_version = '1.1'
+
+    def cleanup_headers(self):
+        super().cleanup_headers()
+        # Without a length, the body ends when the connection does
+        if 'Content-Length' not in self.headers:
+            self.request_handler.close_connection = True
+
+class KeepAliveHandler(WSGIRequestHandler):
+    """wsgiref's handler serves one request per connection; this one keeps HTTP/1.1 connections open"""
+    protocol_version = 'HTTP/1.1'
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def handle_one_request(self):
+        self.raw_requestline = self.rfile.readline(65537)
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if not self.parse_request():
+            return
+        handler = KeepAliveServerHandler(self.rfile, self.wfile, self.get_stderr(), self.get_environ(), multithread=True)
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+
+    def log_message(self, *args):
+        pass
+
+class RecordingApp:
+    """The app, recording the method, path and status of every request"""
+
+    def __init__(self, app):
+        self.app = app
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        def recording_start_response(status, headers, exc_info=None):
+            with self._lock:
+                self.requests.append((environ['REQUEST_METHOD'], environ['PATH_INFO'], int(status[:3])))
+            return start_response(status, headers, exc_info)
+        return self.app(environ, recording_start_response)
+
+class ClientTest(unittest.TestCase):
+    """The client against the app served in this process"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = RecordingApp(main.application)
+        cls.server = make_server('127.0.0.1', 0, cls.app, server_class=main.ThreadingWSGIServer, handler_class=KeepAliveHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = element_words_client.ElementWordsClient(self.base_url)
+        self.app.requests.clear()
+        # Each test starts with a full rate limit budget
+        if main.RATE_LIMITER is not None:
+            main.RATE_LIMITER._buckets.clear()
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_connections_are_pooled(self):
+        self.client.elements()
+        self.client.word('hero')
+        self.client.stats('hero')
+        self.client.live('her')
+        self.assertEqual(len(self.app.requests), 4)
+        self.assertEqual(self.client._pool.opened, 1)
+
+    def test_words_are_looked_up_once_each(self):
+        results = self.client.words(['hero', 'HeRo', 'he-ro', 'bacon'])
+        self.assertEqual(list(results), ['hero', 'HeRo', 'he-ro', 'bacon'])
+        self.assertIs(results['HeRo'], results['hero'])
+        self.assertEqual(len(results['bacon']['solutions']), solver.count_solutions('bacon'))
+        paths = sorted(path for _, path, _ in self.app.requests)
+        self.assertEqual(paths, ['/api/v1/words/bacon', '/api/v1/words/hero'])
+
+    def test_summaries_are_batched(self):
+        words = ['hero', 'bacon', 'xyz', 'Carbon', 'hero'] * 50
+        summaries = self.client.summarize(words)
+        self.assertEqual(len(self.app.requests), 1)
+        for word in ('hero', 'bacon', 'xyz', 'Carbon'):
+            count = solver.count_solutions(word)
+            self.assertEqual(summaries[word]['count'], count)
+            self.assertEqual(summaries[word]['spellable'], count > 0)
+
+    def test_word_results_are_revalidated(self):
+        first = self.client.word('nonconfrontational')
+        second = self.client.word('nonconfrontational')
+        self.assertEqual(first, second)
+        self.assertEqual([status for _, _, status in self.app.requests], [200, 304])
+
+    def test_errors_are_raised(self):
+        with self.assertRaises(element_words_client.ElementWordsError) as raised:
+            self.client.word('x' * (main.MAX_WORD_LENGTH + 1))
+        self.assertEqual(raised.exception.status, 400)
+        self.assertEqual(raised.exception.code, 'WORD_TOO_LONG')
+
+    def test_async_client_matches_blocking_client(self):
+        async def lookup():
+            async with element_words_client.AsyncElementWordsClient(self.base_url, max_concurrency=2) as client:
+                return await client.words(['hero', 'HERO', 'bacon']), await client.stats('bacon')
+
+        results, stats = asyncio.run(lookup())
+        self.assertEqual(results['HERO'], self.client.word('hero'))
+        self.assertEqual(results['bacon'], self.client.word('bacon'))
+        self.assertEqual(stats, self.client.stats('bacon'))
+
+class ClientSpecTest(unittest.TestCase):
+    """The hand-written client against openapi.yaml"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(ROOT, 'openapi.yaml')) as f:
+            cls.spec = yaml.safe_load(f)
+        cls.operations = {}
+        for path, methods in cls.spec['paths'].items():
+            for method, operation in methods.items():
+                cls.operations[operation['operationId']] = (method.upper(), path, operation)
+
+    def query_parameters(self, operation_id):
+        """Names of an operation's query parameters, with references resolved"""
+        names = set()
+        for parameter in self.operations[operation_id][2].get('parameters', []):
+            if '$ref' in parameter:
+                parameter = self.spec['components']['parameters'][parameter['$ref'].rsplit('/', 1)[-1]]
+            if parameter['in'] == 'query':
+                names.add(parameter['name'])
+        return names
+
+    def keyword_parameters(self, method_name):
+        signature = inspect.signature(getattr(element_words_client.ElementWordsClient, method_name))
+        return {name for name, parameter in signature.parameters.items() if parameter.default is not inspect.Parameter.empty}
+
+    def test_operations_exist(self):
+        for operation_id in element_words_client.OPERATIONS.values():
+            self.assertIn(operation_id, self.operations)
+
+    def test_methods_take_the_operations_query_parameters(self):
+        for method_name in ('word', 'stats', 'live', 'filter_words'):
+            with self.subTest(method=method_name):
+                operation_id = element_words_client.OPERATIONS[method_name]
+                self.assertEqual(self.keyword_parameters(method_name), self.query_parameters(operation_id))
+
+    def test_summaries_use_spell_text_options(self):
+        self.assertLessEqual(self.keyword_parameters('summarize'), self.query_parameters('spellText'))
+
+    def test_word_paths_match_the_spec(self):
+        paths = {
+            'word': element_words_client.word_path('HeRo'),
+            'stats': element_words_client.word_path('HeRo', 'stats'),
+            'live': element_words_client.word_path('HeRo', 'live')
+        }
+        for method_name, path in paths.items():
+            with self.subTest(method=method_name):
+                _, template, _ = self.operations[element_words_client.OPERATIONS[method_name]]
+                self.assertEqual(path, template.replace('{word}', 'hero'))
+
+if __name__ == '__main__':
+    unittest.main()
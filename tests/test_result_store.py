@@ -0,0 +1,46 @@
+# coding=utf-8
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import result_store
+
+class ResultStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = result_store.ResultStore(os.path.join(self.directory.name, 'results.db'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def stored_size(self):
+        connection = self.store._connection()
+        return connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    def test_reput_keeps_total_size(self):
+        for _ in range(5):
+            self.store.put_serialized('hero|reversed=0', '{"input_word": "hero"}')
+        self.assertEqual(self.store.count(), 1)
+        self.assertEqual(self.store.size(), self.stored_size())
+
+    def test_replacing_with_different_size_updates_total(self):
+        self.store.put_serialized('hero|reversed=0', '{"input_word": "hero"}')
+        self.store.put_serialized('hero|reversed=0', '{"input_word": "hero", "solutions": ' + '[1, 2, 3]' * 50 + '}')
+        self.store.put_serialized('bacon|reversed=0', '{"input_word": "bacon"}')
+        self.assertEqual(self.store.size(), self.stored_size())
+        self.store.clear()
+        self.assertEqual(self.store.size(), 0)
+
+    def test_open_resynchronizes_drifted_total(self):
+        self.store.put_serialized('hero|reversed=0', '{"input_word": "hero"}')
+        self.store._connection().execute('UPDATE totals SET size = size + 1000 WHERE id = 0')
+        reopened = result_store.ResultStore(self.store.path)
+        self.assertEqual(reopened.size(), self.stored_size())
+
+if __name__ == '__main__':
+    unittest.main()
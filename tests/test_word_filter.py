@@ -0,0 +1,67 @@
+# coding=utf-8
+
+import os
+import sys
+import json
+import unittest
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import solver
+import word_filter
+
+@unittest.skipIf(word_filter.np is None, "NumPy is not installed")
+class FilterEndpointTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Imported here so the skip applies without NumPy
+        import main
+        cls.main = main
+
+    def post(self, body, content_type='text/plain'):
+        environ = {
+            'REQUEST_METHOD': 'POST',
+            'PATH_INFO': '/api/v1/words/filter',
+            'CONTENT_TYPE': content_type,
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body),
+            'wsgi.url_scheme': 'http',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'REMOTE_ADDR': '127.0.0.1'
+        }
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = status
+
+        body = b''.join(self.main.app(environ, start_response))
+        return started['status'], json.loads(body)
+
+    def test_counts_match_the_solver_for_normalized_words(self):
+        words = ['hero', 'He-Ro', 'HERO!', 'bacon', 'b a c o n', 'xyz', 'carbon']
+        status, result = self.post(json.dumps({"words": words}).encode(), 'application/json')
+        self.assertTrue(status.startswith('200'))
+        self.assertEqual(result["data"]["words"], words)
+        expected = [solver.count_solutions(solver.normalize_word(word)) for word in words]
+        self.assertEqual(result["data"]["counts"], expected)
+        self.assertEqual(result["data"]["spellable"], [count > 0 for count in expected])
+
+    def test_words_without_letters_are_unspellable(self):
+        status, result = self.post(json.dumps({"words": ['', '123', '--']}).encode(), 'application/json')
+        self.assertTrue(status.startswith('200'))
+        self.assertEqual(result["data"]["spellable"], [False, False, False])
+        self.assertEqual(result["data"]["counts"], [0, 0, 0])
+
+    def test_length_limit_counts_letters(self):
+        word = '-'.join('hero' * 12)
+        status, _ = self.post(word.encode())
+        self.assertTrue(status.startswith('200'))
+        status, result = self.post((word + 'con').encode())
+        self.assertTrue(status.startswith('400'))
+        self.assertEqual(result["error"]["code"], "WORD_TOO_LONG")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,732 @@
+const wordInput = document.getElementById('wordInput');
+const allowReversedCheckbox = document.getElementById('allowReversed');
+const shareBtn = document.getElementById('shareBtn');
+const loadingDiv = document.getElementById('loading');
+const errorDiv = document.getElementById('error');
+const noResultsDiv = document.getElementById('noResults');
+const solutionsCountDiv = document.getElementById('solutionsCount');
+const sortingControlsDiv = document.getElementById('sortingControls');
+const sortBySelect = document.getElementById('sortBy');
+const sortOrderSelect = document.getElementById('sortOrder');
+const countTextSpan = document.getElementById('countText');
+const resultsDiv = document.getElementById('results');
+const livePreviewDiv = document.getElementById('livePreview');
+
+// Store current solutions for re-sorting
+let currentSolutions = [];
+
+// Solution lists are virtualized: only rows in or near the viewport are in the DOM, between
+// spacers standing in for the rest, and rows are built as they are first scrolled to.
+// Re-sorting reorders solution indexes and re-renders the visible rows, reusing built ones.
+const LIST_OVERSCAN = 800;
+const ROW_NODE_CACHE_SIZE = 500;
+const DEFAULT_ROW_HEIGHT = 160;
+const rowTemplate = document.createElement('template');
+const solutionList = {
+    solutions: [],
+    // Solution indexes in display order
+    order: [],
+    elementCounts: null,
+    scores: null,
+    // Measured row heights by solution index (0 until shown), and per element count averages
+    heights: null,
+    estimates: new Map(),
+    measuredTotal: 0,
+    measuredRows: 0,
+    rowMargin: 0,
+    // Top of each row in display order, then the list height
+    offsets: null,
+    offsetsValid: false,
+    // Built rows by solution index, kept for reuse
+    nodes: new Map(),
+    width: 0,
+    frame: 0,
+    topSpacer: document.createElement('div'),
+    rows: document.createElement('div'),
+    bottomSpacer: document.createElement('div')
+};
+
+// Live preview while typing: requests wait for a pause in typing, and stale ones are cancelled
+const LIVE_PREVIEW_DELAY = 150;
+let livePreviewTimer = null;
+let livePreviewController = null;
+
+// Update page title and meta tags for sharing
+function updatePageMetadata(word) {
+    const baseTitle = "Element Words";
+    const cleanWord = word ? word.trim().toUpperCase() : null;
+    const newTitle = cleanWord ? `${baseTitle} - ${cleanWord}` : `${baseTitle} - Spell with Chemical Elements`;
+    const newDescription = cleanWord ? 
+        `Check out "${cleanWord}" spelled using chemical element symbols from the periodic table!` : 
+        "Create words using chemical element symbols from the periodic table.";
+
+    // Update page title
+    document.title = newTitle;
+
+    // Update Open Graph meta tags
+    const ogTitle = document.getElementById('og-title');
+    const ogDescription = document.getElementById('og-description');
+    const ogImage = document.getElementById('og-image');
+    const ogImageAlt = document.getElementById('og-image-alt');
+    const ogImageWidth = document.getElementById('og-image-width');
+    const ogImageHeight = document.getElementById('og-image-height');
+    const ogUrl = document.getElementById('og-url');
+
+    if (ogTitle) ogTitle.setAttribute('content', newTitle);
+    if (ogDescription) ogDescription.setAttribute('content', newDescription);
+    if (ogImageAlt) ogImageAlt.setAttribute('content', newTitle);
+    if (ogUrl) ogUrl.setAttribute('content', window.location.href);
+
+    // Words get their own social card showing their best spelling
+    if (ogImage) {
+        if (cleanWord) {
+            const reversedQuery = allowReversedCheckbox.checked ? '?allow_reversed_symbols=true' : '';
+            ogImage.setAttribute('content', `${window.location.origin}/api/v1/words/${encodeURIComponent(cleanWord.toLowerCase())}/image.png${reversedQuery}`);
+        } else {
+            ogImage.setAttribute('content', `${window.location.origin}/static/android-chrome-512x512.png`);
+        }
+    }
+    if (ogImageWidth) ogImageWidth.setAttribute('content', cleanWord ? '1200' : '512');
+    if (ogImageHeight) ogImageHeight.setAttribute('content', cleanWord ? '630' : '512');
+
+    // Update general description meta tag
+    const descriptionMeta = document.querySelector('meta[name="description"]');
+    if (descriptionMeta) {
+        descriptionMeta.setAttribute('content', newDescription);
+    }
+
+    // Force a DOM update to ensure changes are applied
+    document.head.offsetHeight; // Trigger reflow
+}
+
+// Initialize app based on URL parameters on page load
+function initializeFromURL() {
+    const urlParams = new URLSearchParams(window.location.search);
+
+    // Set word if provided
+    const word = urlParams.get('word');
+    if (word) {
+        wordInput.value = word;
+    }
+
+    // Set allow_reversed_symbols if provided
+    const allowReversed = urlParams.get('allow_reversed_symbols');
+    if (allowReversed === 'true') {
+        allowReversedCheckbox.checked = true;
+    }
+
+    // Set sorting options if provided
+    const sortBy = urlParams.get('sort_by');
+    if (sortBy && (sortBy === 'elements' || sortBy === 'score')) {
+        sortBySelect.value = sortBy;
+    }
+
+    const sortOrder = urlParams.get('sort_order');
+    if (sortOrder && (sortOrder === 'asc' || sortOrder === 'desc')) {
+        sortOrderSelect.value = sortOrder;
+    }
+
+    // Update metadata immediately with the word from URL if present
+    if (word) {
+        updatePageMetadata(word);
+        searchWord();
+    } else {
+        // Set initial metadata
+        updatePageMetadata();
+    }
+}
+
+// Update URL with current state
+function updateURL() {
+    const urlParams = new URLSearchParams();
+
+    const word = wordInput.value.trim().toLowerCase();
+    if (word) {
+        urlParams.set('word', word);
+    }
+
+    if (allowReversedCheckbox.checked) {
+        urlParams.set('allow_reversed_symbols', 'true');
+    }
+
+    if (currentSolutions.length > 1) {
+        urlParams.set('sort_by', sortBySelect.value);
+        urlParams.set('sort_order', sortOrderSelect.value);
+    }
+
+    // Update URL without reloading the page
+    const newURL = window.location.pathname + (urlParams.toString() ? '?' + urlParams.toString() : '');
+    window.history.replaceState({}, '', newURL);
+}
+
+// Allow Enter key to trigger search
+wordInput.addEventListener('keypress', function(e) {
+    if (e.key === 'Enter') {
+        searchWord();
+    }
+});
+
+// Clear results when input changes, and preview the word being typed
+wordInput.addEventListener('input', function() {
+    clearResults();
+    scheduleLivePreview();
+});
+
+allowReversedCheckbox.addEventListener('change', function() {
+    hideLivePreview();
+    if (wordInput.value.trim()) {
+        searchWord();
+    } else {
+        updateURL();
+    }
+});
+
+// Add event listeners for sorting controls
+sortBySelect.addEventListener('change', function() {
+    if (currentSolutions.length > 0) {
+        displaySolutions(currentSolutions);
+    }
+    updateURL();
+});
+
+sortOrderSelect.addEventListener('change', function() {
+    if (currentSolutions.length > 0) {
+        displaySolutions(currentSolutions);
+    }
+    updateURL();
+});
+
+function clearResults() {
+    loadingDiv.style.display = 'none';
+    errorDiv.style.display = 'none';
+    noResultsDiv.style.display = 'none';
+    solutionsCountDiv.style.display = 'none';
+    sortingControlsDiv.style.display = 'none';
+    shareBtn.style.display = 'none';
+    clearSolutionList();
+    currentSolutions = [];
+    // Reset metadata to default
+    updatePageMetadata();
+}
+
+function cancelLivePreview() {
+    clearTimeout(livePreviewTimer);
+    if (livePreviewController) {
+        livePreviewController.abort();
+        livePreviewController = null;
+    }
+}
+
+function hideLivePreview() {
+    cancelLivePreview();
+    livePreviewDiv.style.display = 'none';
+    livePreviewDiv.textContent = '';
+}
+
+function scheduleLivePreview() {
+    cancelLivePreview();
+    const word = wordInput.value.trim().toLowerCase().replace(/[^\p{L}]/gu, '');
+    if (!word) {
+        hideLivePreview();
+        return;
+    }
+    livePreviewTimer = setTimeout(() => fetchLivePreview(word), LIVE_PREVIEW_DELAY);
+}
+
+// Show the solution count and best spelling of the word being typed.
+// The server resumes from the previous keystroke's prefix, so each request is cheap.
+async function fetchLivePreview(word) {
+    const controller = new AbortController();
+    livePreviewController = controller;
+
+    try {
+        // Parameters in name order, matching the canonical URL shared caches key on
+        const params = new URLSearchParams();
+        if (allowReversedCheckbox.checked) {
+            params.set('allow_reversed_symbols', 'true');
+        }
+        params.set('top', '1');
+        const response = await fetch(`/api/v1/words/${encodeURIComponent(word)}/live?${params}`, {
+            signal: controller.signal
+        });
+        const data = await response.json();
+        if (controller.signal.aborted || !response.ok) {
+            return;
+        }
+
+        const count = data.data.solution_count;
+        livePreviewDiv.textContent = '';
+        if (count === 0) {
+            livePreviewDiv.textContent = 'No element spellings yet';
+        } else {
+            const countText = document.createElement('strong');
+            countText.textContent = `${count.toLocaleString()} spelling${count === 1 ? '' : 's'}`;
+            livePreviewDiv.append(countText, ` · best: ${data.data.solutions[0].representation}`);
+        }
+        livePreviewDiv.style.display = 'block';
+    } catch (error) {
+        // Aborted by a newer keystroke, or offline: the full search still works
+    } finally {
+        if (livePreviewController === controller) {
+            livePreviewController = null;
+        }
+    }
+}
+
+async function searchWord() {
+    const word = wordInput.value.trim().toLowerCase();
+    if (!word) {
+        showError('Please enter a word');
+        return;
+    }
+
+    hideLivePreview();
+
+    clearResults();
+    loadingDiv.style.display = 'block';
+
+    try {
+        const allowReversed = allowReversedCheckbox.checked;
+        // Request the canonical URL (letters only) so the server doesn't redirect to it
+        const wordPath = word.replace(/[^\p{L}]/gu, '') || word;
+        const url = `/api/v1/words/${encodeURIComponent(wordPath)}${allowReversed ? '?allow_reversed_symbols=true' : ''}`;
+
+        const response = await fetch(url);
+        const data = await response.json();
+
+        loadingDiv.style.display = 'none';
+
+        if (!response.ok) {
+            showError(data.error?.message || 'An error occurred');
+            return;
+        }
+
+        displayResults(data.data);
+        updateURL();
+    } catch (error) {
+        loadingDiv.style.display = 'none';
+        showError('Network error. Please try again.');
+    }
+}
+
+function showError(message) {
+    errorDiv.textContent = message;
+    errorDiv.style.display = 'block';
+}
+
+function displayResults(data) {
+    if (!data.solutions || data.solutions.length === 0) {
+        noResultsDiv.style.display = 'block';
+        // Update metadata for no results case
+        updatePageMetadata(data.input_word);
+        return;
+    }
+
+    // Store solutions for re-sorting
+    currentSolutions = data.solutions;
+
+    // Update page metadata with the current word for sharing
+    updatePageMetadata(data.input_word);
+
+    // Show share button when there are results
+    shareBtn.style.display = 'inline-block';
+
+    // Display solutions with current sorting
+    displaySolutions(currentSolutions);
+}
+
+// Share current state
+function shareCurrentState() {
+    const currentURL = window.location.href;
+    const word = wordInput.value.trim();
+
+    // Construct the title dynamically to ensure it matches the current state
+    const baseTitle = "Element Words";
+    const shareTitle = word ? `${baseTitle} - ${word.toUpperCase()}` : baseTitle;
+
+    const shareText = word ? 
+        `Check out "${word.toUpperCase()}" spelled using chemical element symbols!` : 
+        'Check out this word made from chemical element symbols!';
+
+    // Ensure meta tags are updated before sharing (for share sheet preview)
+    updatePageMetadata(word);
+
+    // Force meta tag updates to be processed immediately
+    // This is critical for share sheet previews
+    const ogTitle = document.getElementById('og-title');
+    const ogDescription = document.getElementById('og-description');
+    if (ogTitle && word) {
+        ogTitle.setAttribute('content', `Element Words - ${word.toUpperCase()}`);
+    }
+    if (ogDescription && word) {
+        ogDescription.setAttribute('content', `Check out "${word.toUpperCase()}" spelled using element symbols from the periodic table!`);
+    }
+
+    // Add a small delay to ensure meta tags are processed before sharing
+    // This helps with share sheet previews that read the meta tags
+    setTimeout(() => {
+        // Try to use the Web Share API if available (modern browsers, especially mobile)
+        if (navigator.share) {
+            navigator.share({
+                title: shareTitle,
+                text: shareText,
+                url: currentURL
+            }).catch(err => {
+                // Fallback to copying URL if share fails
+                copyToClipboard(currentURL);
+            });
+        } else {
+            // Fallback: copy URL to clipboard
+            copyToClipboard(currentURL);
+        }
+    }, 100); // Small delay to allow meta tag updates to be processed
+}
+
+// Copy text to clipboard
+function copyToClipboard(text) {
+    // Try the modern clipboard API first
+    if (navigator.clipboard && navigator.clipboard.writeText) {
+        navigator.clipboard.writeText(text).then(() => {
+            showToast('URL copied to clipboard!');
+        }).catch(() => {
+            // Fallback to older method
+            fallbackCopyToClipboard(text);
+        });
+    } else {
+        // Fallback to older method
+        fallbackCopyToClipboard(text);
+    }
+}
+
+// Fallback clipboard method for older browsers
+function fallbackCopyToClipboard(text) {
+    const textArea = document.createElement('textarea');
+    textArea.value = text;
+    textArea.style.position = 'fixed';
+    textArea.style.left = '-999999px';
+    textArea.style.top = '-999999px';
+    document.body.appendChild(textArea);
+    textArea.focus();
+    textArea.select();
+
+    try {
+        document.execCommand('copy');
+        showToast('URL copied to clipboard!');
+    } catch (err) {
+        showToast('Unable to copy URL. Please copy manually: ' + text);
+    }
+
+    document.body.removeChild(textArea);
+}
+
+// Show toast notification
+function showToast(message) {
+    // Create toast element
+    const toast = document.createElement('div');
+    toast.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: #48bb78;
+        color: white;
+        padding: 12px 20px;
+        border-radius: 8px;
+        font-weight: 500;
+        z-index: 1000;
+        transform: translateX(100%);
+        transition: transform 0.3s ease;
+        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
+    `;
+    toast.textContent = message;
+
+    document.body.appendChild(toast);
+
+    // Animate in
+    setTimeout(() => {
+        toast.style.transform = 'translateX(0)';
+    }, 100);
+
+    // Remove after 3 seconds
+    setTimeout(() => {
+        toast.style.transform = 'translateX(100%)';
+        setTimeout(() => {
+            if (document.body.contains(toast)) {
+                document.body.removeChild(toast);
+            }
+        }, 300);
+    }, 3000);
+}
+
+function displaySolutions(solutions) {
+    const solutionCount = solutions.length;
+
+    // Display solutions count
+    const countText = solutionCount === 1 ? '1 solution found' : `${solutionCount} solutions found`;
+    countTextSpan.textContent = countText;
+    solutionsCountDiv.style.display = 'block';
+
+    // Show sorting controls if there are multiple solutions
+    if (solutionCount > 1) {
+        sortingControlsDiv.style.display = 'flex';
+    }
+
+    // Only re-sort when the solutions are unchanged; rows already built are reused
+    if (solutionList.solutions !== solutions) {
+        setSolutionList(solutions);
+    }
+    sortSolutionList(sortBySelect.value, sortOrderSelect.value);
+    renderSolutionList();
+}
+
+function solutionHTML(solution) {
+    const elementCount = solution.elements.length;
+    const elementCountText = elementCount === 1 ? '1 element' : `${elementCount} elements`;
+    const score = solution.score || 0;
+
+    let html = `
+        <div class="solution">
+            <div class="solution-header">
+                <div class="solution-title">${solution.representation}</div>
+                <div class="solution-stats">
+                    <div class="element-count">${elementCountText}</div>
+                    <div class="score">Score: ${score}</div>
+                </div>
+            </div>
+            <div class="elements-container">
+    `;
+
+    solution.elements.forEach(element => {
+        const reversedClass = element.reversed ? ' reversed' : '';
+
+        // Transform display for reversed symbols (UI only)
+        let displaySymbol = element.symbol;
+        let displayAtomicNumber = element.atomic_number;
+
+        if (element.reversed) {
+            // Reverse the symbol letter order (e.g., "He" -> "eH")
+            displaySymbol = element.symbol.split('').reverse().join('');
+            // Reverse the atomic number digits (e.g., 107 -> 701)
+            displayAtomicNumber = element.atomic_number.toString().split('').reverse().join('');
+        }
+
+        html += `
+            <div class="element-tile${reversedClass}" title="${element.name} (${displaySymbol})${element.reversed ? ' - Reversed symbol' : ''}">
+                ${element.reversed ? '<div class="element-reverse-icon">⟲</div>' : ''}
+                <div class="element-number">${displayAtomicNumber}</div>
+                <div class="element-symbol">${displaySymbol}</div>
+                <div class="element-name">${element.name}</div>
+            </div>
+        `;
+    });
+
+    html += `
+            </div>
+        </div>
+    `;
+    return html;
+}
+
+// Start a new list: sort keys are read once, and rows are built only when first shown
+function setSolutionList(solutions) {
+    const list = solutionList;
+    const count = solutions.length;
+    list.solutions = solutions;
+    list.order = [];
+    list.elementCounts = new Uint16Array(count);
+    list.scores = new Float64Array(count);
+    solutions.forEach((solution, index) => {
+        list.elementCounts[index] = solution.elements.length;
+        list.scores[index] = solution.score || 0;
+    });
+    list.heights = new Float64Array(count);
+    list.offsets = new Float64Array(count + 1);
+    list.offsetsValid = false;
+    list.estimates.clear();
+    list.measuredTotal = 0;
+    list.measuredRows = 0;
+    list.nodes.clear();
+    list.width = resultsDiv.clientWidth;
+
+    resultsDiv.replaceChildren(list.topSpacer, list.rows, list.bottomSpacer);
+    list.rows.replaceChildren();
+}
+
+// Display order is an array of solution indexes, sorted stably so ties keep the server's order
+function sortSolutionList(sortBy, sortOrder) {
+    const list = solutionList;
+    const keys = sortBy === 'score' ? list.scores : list.elementCounts;
+    const direction = sortOrder === 'asc' ? 1 : -1;
+    const order = Array.from({ length: list.solutions.length }, (_, index) => index);
+    order.sort((a, b) => direction * (keys[a] - keys[b]));
+    list.order = order;
+    list.offsetsValid = false;
+}
+
+function clearSolutionList() {
+    const list = solutionList;
+    cancelAnimationFrame(list.frame);
+    list.frame = 0;
+    list.solutions = [];
+    list.order = [];
+    list.nodes.clear();
+    resultsDiv.replaceChildren();
+}
+
+// Height of a row: measured once it has been shown, estimated from similar rows until then
+function rowHeight(index) {
+    const list = solutionList;
+    if (list.heights[index]) {
+        return list.heights[index];
+    }
+    const similar = list.estimates.get(list.elementCounts[index]);
+    if (similar) {
+        return similar[0] / similar[1];
+    }
+    return list.measuredRows ? list.measuredTotal / list.measuredRows : DEFAULT_ROW_HEIGHT;
+}
+
+// Top of each row in display order, followed by the height of the whole list
+function rowOffsets() {
+    const list = solutionList;
+    if (!list.offsetsValid) {
+        const offsets = list.offsets;
+        for (let position = 0; position < list.order.length; position++) {
+            offsets[position + 1] = offsets[position] + rowHeight(list.order[position]);
+        }
+        list.offsetsValid = true;
+    }
+    return list.offsets;
+}
+
+// Display position of the row at a height within the list (clamped to the list)
+function rowAt(offsets, count, y) {
+    let low = 0;
+    let high = count;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (offsets[middle + 1] <= y) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+    return Math.min(low, count - 1);
+}
+
+function solutionRow(index) {
+    const list = solutionList;
+    let node = list.nodes.get(index);
+    if (!node) {
+        rowTemplate.innerHTML = solutionHTML(list.solutions[index]);
+        node = rowTemplate.content.firstElementChild;
+        list.nodes.set(index, node);
+        // Forget the rows built longest ago
+        if (list.nodes.size > ROW_NODE_CACHE_SIZE) {
+            list.nodes.delete(list.nodes.keys().next().value);
+        }
+    }
+    return node;
+}
+
+// Record the heights of rendered rows; returns whether any differed from the height assumed
+function measureRows(start, nodes) {
+    const list = solutionList;
+    if (!list.rowMargin && nodes.length) {
+        const style = getComputedStyle(nodes[0]);
+        list.rowMargin = parseFloat(style.marginTop) + parseFloat(style.marginBottom);
+    }
+    let changed = false;
+    nodes.forEach((node, i) => {
+        const index = list.order[start + i];
+        const height = node.offsetHeight + list.rowMargin;
+        if (Math.abs(height - rowHeight(index)) >= 1) {
+            changed = true;
+        }
+        if (!list.heights[index]) {
+            const count = list.elementCounts[index];
+            const similar = list.estimates.get(count) || [0, 0];
+            list.estimates.set(count, [similar[0] + height, similar[1] + 1]);
+            list.measuredTotal += height;
+            list.measuredRows++;
+        }
+        list.heights[index] = height;
+    });
+    if (changed) {
+        list.offsetsValid = false;
+    }
+    return changed;
+}
+
+// Render the rows in and near the viewport between spacers standing in for the others
+function renderSolutionList() {
+    const list = solutionList;
+    list.frame = 0;
+    const count = list.order.length;
+    if (!count) {
+        return;
+    }
+
+    // Rows wrap differently at another width, so their heights are measured again
+    if (resultsDiv.clientWidth !== list.width) {
+        list.width = resultsDiv.clientWidth;
+        list.heights.fill(0);
+        list.estimates.clear();
+        list.measuredTotal = 0;
+        list.measuredRows = 0;
+        list.offsetsValid = false;
+    }
+
+    // Measuring may move rows, so the window is worked out again (a few times at most)
+    let start = 0;
+    let end = 0;
+    for (let pass = 0; pass < 3; pass++) {
+        const offsets = rowOffsets();
+        const listTop = resultsDiv.getBoundingClientRect().top;
+        start = rowAt(offsets, count, -listTop - LIST_OVERSCAN);
+        end = rowAt(offsets, count, window.innerHeight - listTop + LIST_OVERSCAN) + 1;
+
+        const nodes = [];
+        for (let position = start; position < end; position++) {
+            nodes.push(solutionRow(list.order[position]));
+        }
+        list.topSpacer.style.height = `${offsets[start]}px`;
+        list.bottomSpacer.style.height = `${offsets[count] - offsets[end]}px`;
+        list.rows.replaceChildren(...nodes);
+
+        if (!measureRows(start, nodes)) {
+            break;
+        }
+    }
+
+    // Spacers match the final measurements
+    const offsets = rowOffsets();
+    list.topSpacer.style.height = `${offsets[start]}px`;
+    list.bottomSpacer.style.height = `${offsets[count] - offsets[end]}px`;
+}
+
+function scheduleSolutionListRender() {
+    if (solutionList.order.length && !solutionList.frame) {
+        solutionList.frame = requestAnimationFrame(renderSolutionList);
+    }
+}
+
+window.addEventListener('scroll', scheduleSolutionListRender, { passive: true });
+window.addEventListener('resize', scheduleSolutionListRender);
+
+// Initialize app on page load
+window.addEventListener('load', function() {
+    initializeFromURL();
+    // Only focus input if no word was provided in URL
+    if (!wordInput.value.trim()) {
+        wordInput.focus();
+    }
+});
+
+// Register the service worker for offline use and instant repeat lookups
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', function() {
+        navigator.serviceWorker.register('/sw.js').catch(() => {
+            // The app works without it, just without offline support
+        });
+    });
+}
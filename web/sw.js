@@ -0,0 +1,128 @@
+// Element Words service worker
+// Generated by build_assets.py - the precache list and version are filled in at build time.
+const VERSION = '{{version}}';
+const SHELL_CACHE = `element-words-shell-${VERSION}`;
+const WORDS_CACHE = 'element-words-words-v1';
+const PRECACHE_URLS = {{precache}};
+
+// Maximum number of word lookups kept for offline/instant repeat use
+const MAX_WORD_ENTRIES = 200;
+
+const WORDS_PATH_PREFIX = '/api/v1/words/';
+
+// The app shell's cache key: the bare page, without a shared word's query
+const SHELL_URL = '/';
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(PRECACHE_URLS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    // Drop app shell caches from previous builds (word results survive deploys)
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys
+                .filter(key => key.startsWith('element-words-shell-') && key !== SHELL_CACHE)
+                .map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) {
+        return;
+    }
+
+    if (url.pathname.startsWith(WORDS_PATH_PREFIX)) {
+        if (isCacheableWordLookup(url)) {
+            event.respondWith(staleWhileRevalidate(event, request));
+        }
+    } else if (request.mode === 'navigate') {
+        // Only the app itself is the offline shell; other pages (API docs, images) go to the network
+        if (url.pathname === '/') {
+            event.respondWith(networkFirst(request));
+        }
+    } else if (PRECACHE_URLS.includes(url.pathname)) {
+        event.respondWith(cacheFirst(request));
+    }
+});
+
+// Live previews change with every keystroke, unseeded samples are random on every request,
+// and card images are cached by the browser itself
+function isCacheableWordLookup(url) {
+    if (url.pathname.endsWith('/live') || url.pathname.endsWith('/image.png')) {
+        return false;
+    }
+    return !(url.searchParams.has('sample') && !url.searchParams.has('seed'));
+}
+
+// Responses the server marks as not to be stored
+function isStorable(response) {
+    return response.ok && !/no-store/i.test(response.headers.get('Cache-Control') || '');
+}
+
+// Word lookups: answer from cache immediately, refresh in the background
+async function staleWhileRevalidate(event, request) {
+    const cache = await caches.open(WORDS_CACHE);
+    const cached = await cache.match(request);
+
+    const refresh = fetch(request).then(async response => {
+        if (isStorable(response)) {
+            await cache.put(request, response.clone());
+            await trimCache(cache, MAX_WORD_ENTRIES);
+        }
+        return response;
+    });
+
+    if (cached) {
+        event.waitUntil(refresh.catch(() => undefined));
+        return cached;
+    }
+    return refresh;
+}
+
+// App shell: prefer the network so deploys show up, fall back to the precached shell offline.
+// Shared word links (/?word=...) are pages with their own Open Graph tags, so only the bare
+// shell is stored; offline, they get the bare shell, which reads the word from the URL itself.
+async function networkFirst(request) {
+    const cache = await caches.open(SHELL_CACHE);
+    const isShell = new URL(request.url).search === '';
+    try {
+        const response = await fetch(request);
+        if (isShell && isStorable(response) && !response.redirected) {
+            await cache.put(SHELL_URL, response.clone());
+        }
+        return response;
+    } catch (error) {
+        const cached = await cache.match(SHELL_URL);
+        if (cached) {
+            return cached;
+        }
+        throw error;
+    }
+}
+
+// Fingerprinted assets and icons never change under the same URL
+async function cacheFirst(request) {
+    const cache = await caches.open(SHELL_CACHE);
+    const cached = await cache.match(request);
+    return cached || fetch(request);
+}
+
+// Cache keys are returned in insertion order, so evict from the front
+async function trimCache(cache, maxEntries) {
+    const keys = await cache.keys();
+    for (let i = 0; i < keys.length - maxEntries; i++) {
+        await cache.delete(keys[i]);
+    }
+}
@@ -0,0 +1,140 @@
+# coding=utf-8
+
+# Vectorized spellability filter for large word lists.
+# Words are encoded into a padded uint8 matrix and the spelling-count DP runs
+# one column (letter position) at a time across every word at once.
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, only needed for batch filtering
+    np = None
+
+# Letter codes: 0 is padding, 1-26 are a-z, 27 is any other character
+OTHER_CODE = 27
+CODE_COUNT = 28
+
+def build_lookup_tables(sequence_counts):
+    """
+    Build the 1-letter (28) and 2-letter (28x28, flattened) lookup tables.
+    sequence_counts maps lowercase letter sequences to the number of symbols spelling them.
+    """
+    one_letter = np.zeros(CODE_COUNT, dtype=np.int64)
+    two_letter = np.zeros(CODE_COUNT * CODE_COUNT, dtype=np.int64)
+    for letters, count in sequence_counts.items():
+        codes = [ord(c) - 96 for c in letters]
+        if len(codes) == 1:
+            one_letter[codes[0]] = count
+        elif len(codes) == 2:
+            two_letter[codes[0] * CODE_COUNT + codes[1]] = count
+    return one_letter, two_letter
+
+def build_byte_codes():
+    """Map every byte to its letter code (case-insensitive)"""
+    codes = np.full(256, OTHER_CODE, dtype=np.uint8)
+    for i in range(26):
+        codes[ord('a') + i] = i + 1
+        codes[ord('A') + i] = i + 1
+    return codes
+
+BYTE_CODES = build_byte_codes() if np is not None else None
+
+def encode_words(words):
+    """
+    Encode words as a padded uint8 matrix of letter codes, one row per word.
+    Returns (matrix, lengths). Non-ASCII characters become OTHER_CODE, keeping lengths intact.
+    """
+    count = len(words)
+    lengths = np.fromiter((len(word) for word in words), dtype=np.int64, count=count)
+    width = int(lengths.max()) if count else 0
+    matrix = np.zeros((count, width), dtype=np.uint8)
+    if not count or not width:
+        return matrix, lengths
+
+    # Encode everything in one buffer, then scatter the letters into their rows
+    buffer = np.frombuffer('\n'.join(words).encode('ascii', 'replace'), dtype=np.uint8)
+    buffer_starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+    letters = np.delete(buffer, buffer_starts[1:] - 1)
+    letter_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    rows = np.repeat(np.arange(count), lengths)
+    columns = np.arange(len(letters)) - np.repeat(letter_starts, lengths)
+    matrix[rows, columns] = BYTE_CODES[letters]
+    return matrix, lengths
+
+# Counts at or above this (estimated in floating point) may not fit in an int64
+EXACT_COUNT_THRESHOLD = 2.0 ** 62
+
+def count_spellings(matrix, lengths, tables):
+    """
+    Count the spellings of every encoded word at once.
+    Rows are processed longest first, so each column only touches words that are still active.
+    Returns an int64 array of counts in the original word order (0 means not spellable), or an
+    object array of Python ints if some count doesn't fit in an int64.
+    """
+    one_letter, two_letter = tables
+    count = len(lengths)
+    counts = np.zeros(count, dtype=np.int64)
+    if not count or not matrix.shape[1]:
+        return counts
+
+    order = np.argsort(-lengths, kind='stable')
+    sorted_lengths = lengths[order]
+    # One contiguous row per letter position, widened so pair codes fit
+    columns = np.ascontiguousarray(matrix[order].T, dtype=np.int16)
+    # active[i] is the number of words with more than i letters
+    active = np.searchsorted(-sorted_lengths, -np.arange(columns.shape[0] + 1), side='left')
+
+    # Spellings of the prefixes ending one and two letters back (the empty prefix has one).
+    # int64 arithmetic wraps, so the same DP runs in floating point to find the counts too big
+    # for it; a wrapped count is still exact if the final count fits
+    previous_1 = np.ones(count, dtype=np.int64)
+    previous_2 = np.zeros(count, dtype=np.int64)
+    estimate_1 = np.ones(count, dtype=np.float64)
+    estimate_2 = np.zeros(count, dtype=np.float64)
+    sorted_counts = np.zeros(count, dtype=np.int64)
+    sorted_estimates = np.zeros(count, dtype=np.float64)
+    with np.errstate(over='ignore', invalid='ignore'):
+        for i in range(columns.shape[0]):
+            size = active[i]
+            column = columns[i, :size]
+            current = one_letter[column] * previous_1[:size]
+            estimate = one_letter[column] * estimate_1[:size]
+            if i:
+                pair = two_letter[columns[i - 1, :size] * CODE_COUNT + column]
+                current += pair * previous_2[:size]
+                estimate += pair * estimate_2[:size]
+            # Words ending at this column are done
+            sorted_counts[active[i + 1]:size] = current[active[i + 1]:size]
+            sorted_estimates[active[i + 1]:size] = estimate[active[i + 1]:size]
+            previous_2, previous_1 = previous_1[:size], current
+            estimate_2, estimate_1 = estimate_1[:size], estimate
+
+    counts[order] = sorted_counts
+    estimates = np.zeros(count, dtype=np.float64)
+    estimates[order] = sorted_estimates
+    # Estimates that became infinite (or NaN, from an infinite count times zero) are too big too
+    overflowed = np.flatnonzero(~(estimates < EXACT_COUNT_THRESHOLD))
+    if len(overflowed):
+        counts = counts.astype(object)
+        for row in overflowed.tolist():
+            counts[row] = count_spellings_exact(matrix[row, :lengths[row]], tables)
+    return counts
+
+def count_spellings_exact(codes, tables):
+    """Count the spellings of one encoded word with Python integers (no size limit)"""
+    one_letter, two_letter = tables
+    codes = codes.tolist()
+    previous_2, previous_1 = 0, 1
+    for i, code in enumerate(codes):
+        current = int(one_letter[code]) * previous_1
+        if i:
+            current += int(two_letter[codes[i - 1] * CODE_COUNT + code]) * previous_2
+        previous_2, previous_1 = previous_1, current
+    return previous_1
+
+def filter_words(words, tables):
+    """Count spellings for a list of words; returns (spellable mask, counts)"""
+    matrix, lengths = encode_words(words)
+    counts = count_spellings(matrix, lengths, tables)
+    # An empty word isn't spelled by anything (the DP counts its one empty spelling)
+    counts[lengths == 0] = 0
+    return (counts > 0).astype(bool), counts